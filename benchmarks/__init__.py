@@ -0,0 +1 @@
+# benchmarks do app de finanças: rodar com `python -m benchmarks.<nome>` na raiz do repositório
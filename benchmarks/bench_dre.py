@@ -0,0 +1,155 @@
+"""Compara o DRE vetorizado (financas.dre) com a montagem antiga (apply por linha + iterrows)
+e com a matriz de todos os meses (matriz_dre + dre_dos_meses).
+
+Uso: python -m benchmarks.bench_dre --linhas 100000
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from financas.dre import dre_dos_meses, matriz_dre, montar_dre
+
+
+def gerar_agrupados(linhas, seed=0):
+    # muitas combinações mês x classificação para o merge real x orçado ter `linhas` linhas
+    rng = np.random.default_rng(seed)
+    classes_receita = [f'Receita {i}' for i in range(50)]
+    classes_fixo = [f'Fixo {i}' for i in range(50)]
+    n_meses = max(1, linhas // (len(classes_receita) + len(classes_fixo)))
+    meses = [f'{(m % 12) + 1:02d}_{2000 + m // 12}' for m in range(n_meses)]
+
+    def agrupado(classes):
+        df = pd.DataFrame(
+            [(mes, classe) for mes in meses for classe in classes], columns=['id_mes', 'classificacao']
+        )
+        df['valor'] = rng.uniform(10, 5000, len(df)).round(2)
+        return df
+
+    receitas = agrupado(classes_receita)
+    fixos = agrupado(classes_fixo)
+    debito = pd.DataFrame({'id_mes': meses, 'valor': rng.uniform(100, 3000, n_meses).round(2)})
+    credito = pd.DataFrame({'id_mes': meses, 'valor': rng.uniform(100, 3000, n_meses).round(2)})
+
+    orcamento = pd.concat([
+        receitas.rename(columns={'classificacao': 'classificacao_orcamento', 'valor': 'valor_orcamento'}),
+        fixos.rename(columns={'classificacao': 'classificacao_orcamento', 'valor': 'valor_orcamento'}),
+        pd.DataFrame({'id_mes': meses, 'classificacao_orcamento': 'Débito', 'valor_orcamento': 2000.0}),
+        pd.DataFrame({'id_mes': meses, 'classificacao_orcamento': 'Crédito', 'valor_orcamento': 1500.0}),
+        pd.DataFrame({'id_mes': meses, 'classificacao_orcamento': 'Sobra', 'valor_orcamento': 1000.0}),
+    ], ignore_index=True)
+    orcamento['ano'] = orcamento['id_mes'].str[-4:].astype(int)
+    orcamento['id_class'] = orcamento['id_mes'] + orcamento['classificacao_orcamento']
+    return receitas, fixos, debito, credito, orcamento, meses
+
+
+def dre_legado(receita_agrupado, fixo_agrupado, debito_agrupado, credito_agrupado, orcamento_mensal, selecione_mes):
+    # mesma lógica que ficava no "Status Mês atual" do Finanças.py
+    tipo_receita = receita_agrupado['classificacao'].unique().tolist()
+    receitas_orcado = orcamento_mensal[orcamento_mensal['classificacao_orcamento'].isin(tipo_receita)]
+    receitas_orcado = receitas_orcado.rename(columns={'classificacao_orcamento': 'classificacao'})
+    receitas_real = receita_agrupado.copy()
+    receitas_real['id_class'] = receitas_real['id_mes'] + receitas_real['classificacao']
+
+    tipo_fixo = fixo_agrupado['classificacao'].unique().tolist()
+    gastos_fixos_orcado = orcamento_mensal[orcamento_mensal['classificacao_orcamento'].isin(tipo_fixo)]
+    gastos_fixos_orcado = gastos_fixos_orcado.rename(columns={'classificacao_orcamento': 'classificacao'})
+    gastos_fixos_real = fixo_agrupado.copy()
+    gastos_fixos_real['id_class'] = gastos_fixos_real['id_mes'] + gastos_fixos_real['classificacao']
+
+    def calcular_diferencas(real_df, orcado_df):
+        df = pd.merge(real_df, orcado_df, on="id_class", how="outer", suffixes=("_real", "_orcado"))
+        df.fillna(0, inplace=True)
+        df["Diferença"] = df["valor"] - df["valor_orcamento"]
+        return df
+
+    def construir_dre_classificacao(df, classificacao_nome):
+        df = df.groupby("classificacao_consolidado").agg({"valor": "sum", "valor_orcamento": "sum"}).reset_index()
+        df["diferenca"] = df["valor"] - df["valor_orcamento"]
+        dre_classificacao = {}
+        for _, row in df.iterrows():
+            dre_classificacao[f"    - {row['classificacao_consolidado']}"] = {
+                "real": row["valor"], "orcado": row["valor_orcamento"]}
+        dre_classificacao[f"= Total {classificacao_nome}"] = {
+            "real": df["valor"].sum(), "orcado": df["valor_orcamento"].sum()}
+        return dre_classificacao
+
+    receitas = calcular_diferencas(receitas_real, receitas_orcado)
+    gastos_fixos = calcular_diferencas(gastos_fixos_real, gastos_fixos_orcado)
+    for df in (receitas, gastos_fixos):
+        df['id_mes_consolidado'] = df.apply(
+            lambda row: row['id_mes_orcado'] if row['id_mes_real'] == 0 else row['id_mes_real'], axis=1)
+        df['classificacao_consolidado'] = df.apply(
+            lambda row: row['classificacao_orcado'] if row['classificacao_real'] == 0 else row['classificacao_real'],
+            axis=1)
+
+    receitas = receitas[receitas['id_mes_consolidado'].isin(selecione_mes)]
+    gastos_fixos = gastos_fixos[gastos_fixos['id_mes_consolidado'].isin(selecione_mes)].copy()
+
+    orcamento_mensal_filtrado = orcamento_mensal[orcamento_mensal['id_mes'].isin(selecione_mes)]
+    debito_total = debito_agrupado[debito_agrupado['id_mes'].isin(selecione_mes)]['valor'].sum()
+    debito_orcado = orcamento_mensal_filtrado[
+        orcamento_mensal_filtrado['classificacao_orcamento'] == "Débito"]['valor_orcamento'].sum()
+    credito_total = credito_agrupado[credito_agrupado['id_mes'].isin(selecione_mes)]['valor'].sum()
+    credito_orcado = orcamento_mensal_filtrado[
+        orcamento_mensal_filtrado['classificacao_orcamento'] == "Crédito"]['valor_orcamento'].sum()
+    sobra_orcado = orcamento_mensal_filtrado[
+        orcamento_mensal_filtrado['classificacao_orcamento'] == "Sobra"]['valor_orcamento'].sum()
+    sobra_real = receitas["valor"].sum() - (gastos_fixos["valor"].sum() + credito_total + debito_total)
+
+    gastos_fixos['valor'] = gastos_fixos['valor'] * -1
+    gastos_fixos['valor_orcamento'] = gastos_fixos['valor_orcamento'] * -1
+
+    return {
+        **construir_dre_classificacao(receitas, "de receitas"),
+        **construir_dre_classificacao(gastos_fixos, "de gastos fixos"),
+        "= Total gastos com crédito": {"real": -credito_total, "orcado": -credito_orcado},
+        "= Total gastos com débito": {"real": -debito_total, "orcado": -debito_orcado},
+        "= Sobra Final": {"real": sobra_real, "orcado": sobra_orcado},
+    }
+
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--linhas', type=int, default=100_000, help='linhas do merge real x orçado')
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    receitas, fixos, debito, credito, orcamento, meses = gerar_agrupados(args.linhas)
+    # todos os meses selecionados: é o pior caso para a montagem antiga
+    selecao = meses
+
+    tempo_legado, legado = cronometrar(
+        lambda: dre_legado(receitas, fixos, debito, credito, orcamento, selecao), args.repeticoes)
+    tempo_novo, novo = cronometrar(
+        lambda: montar_dre(receitas, fixos, debito, credito, orcamento, selecao), args.repeticoes)
+
+    esperado = pd.DataFrame(
+        [(descricao, v['real'], v['orcado']) for descricao, v in legado.items()],
+        columns=['descricao', 'real', 'orcado'],
+    )
+    pd.testing.assert_frame_equal(novo[['descricao', 'real', 'orcado']], esperado, check_dtype=False)
+
+    tempo_matriz, matriz = cronometrar(
+        lambda: matriz_dre(receitas, fixos, debito, credito, orcamento), args.repeticoes)
+    tempo_selecao, da_matriz = cronometrar(lambda: dre_dos_meses(matriz, selecao), args.repeticoes)
+    pd.testing.assert_frame_equal(da_matriz, novo, check_dtype=False)
+
+    print(f'linhas real x orçado: {len(receitas) + len(fixos)}')
+    print(f'legado (apply + iterrows): {tempo_legado:.3f}s')
+    print(f'vetorizado (financas.dre):  {tempo_novo:.3f}s  ({tempo_legado / tempo_novo:.1f}x)')
+    print(f'matriz de todos os meses:   {tempo_matriz:.3f}s (uma vez), depois {tempo_selecao:.4f}s por seleção')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Partida a frio de cada página: um processo python novo por medida, abrindo a página direto no AppTest
+com o armazenamento sqlite (dados de financas.sintetico) e FINANCAS_PERFIL_INICIO=1.
+
+Mostra o tempo até a primeira renderização e os imports mais caros; com --ansiosos, os módulos que o
+app importa tarde (plotly, duckdb, gspread) são importados antes, como o script fazia, para comparar.
+
+Uso: python -m benchmarks.bench_inicio --linhas 20000 --repeticoes 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PAGINAS = ['lancamentos', 'mes_atual', 'debito', 'credito', 'patrimonio', 'emprestimos_investimentos']
+
+# o que o Finanças.py importava no topo antes dos imports tardios
+ANSIOSOS = ['gspread', 'google.oauth2.service_account', 'plotly.express', 'plotly.graph_objects', 'plotly.subplots', 'duckdb']
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def filho(pagina, caminho, ansiosos):
+    # roda no processo novo: mede do começo do processo até a página renderizada
+    inicio = time.perf_counter()
+    for modulo in ansiosos:
+        __import__(modulo)
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(RAIZ, 'Finanças.py'), default_timeout=120)
+    app.secrets['armazenamento'] = {'tipo': 'sqlite', 'caminho': caminho}
+    if pagina != 'lancamentos':
+        app.switch_page(f'paginas/{pagina}.py')
+    app.run()
+    total = time.perf_counter() - inicio
+    if app.exception:
+        raise SystemExit(f'{pagina}: {app.exception[0].value}')
+    perfil = sys.modules['financas.inicio'].primeira_renderizacao()
+    print(json.dumps({'total': total, **perfil}))
+
+
+def gerar_dados(linhas, pasta):
+    from financas.armazenamento import ArmazenamentoSQLite
+    from financas.sintetico import gerar_ledgers, para_valores
+
+    caminho = os.path.join(pasta, 'financas.sqlite')
+    armazenamento = ArmazenamentoSQLite(caminho)
+    for nome, df in gerar_ledgers(linhas).items():
+        valores = para_valores(df)
+        armazenamento.espelho.substituir(nome, valores[0], valores[1:])
+    return caminho
+
+
+def medir(pagina, caminho, ansiosos):
+    comando = [sys.executable, '-m', 'benchmarks.bench_inicio', '--filho', pagina, '--caminho', caminho]
+    if ansiosos:
+        comando.append('--ansiosos')
+    saida = subprocess.run(comando, cwd=RAIZ, capture_output=True, text=True, check=True,
+                           env={**os.environ, 'FINANCAS_PERFIL_INICIO': '1'})
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=20_000)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--paginas', nargs='+', default=PAGINAS, choices=PAGINAS)
+    parser.add_argument('--ansiosos', action='store_true', help='importa plotly, duckdb e gspread antes do app')
+    parser.add_argument('--filho', help=argparse.SUPPRESS)
+    parser.add_argument('--caminho', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.filho:
+        filho(args.filho, args.caminho, ANSIOSOS if args.ansiosos else [])
+        return
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = gerar_dados(args.linhas, pasta)
+        print(f'{"página":<28}{"total (s)":>10}{"1ª render (s)":>15}{"imports (s)":>13}  mais caros')
+        for pagina in args.paginas:
+            # o melhor de N processos novos (o cache de disco do SO já quente depois do primeiro)
+            melhor = min((medir(pagina, caminho, args.ansiosos) for _ in range(args.repeticoes)), key=lambda m: m['total'])
+            caros = ', '.join(f'{modulo} {segundos:.2f}' for modulo, segundos in list(melhor['imports'].items())[:3])
+            print(f'{pagina:<28}{melhor["total"]:>10.2f}{melhor["primeira_renderizacao"]:>15.2f}'
+                  f'{melhor["tempo_imports"]:>13.2f}  {caros}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Compara as parcelas geradas uma a uma (laço com relativedelta, como o formulário de crédito fazia)
+com as compras compactas de financas.parcelas: `expandir` e `parcelas_a_vencer` por cartão.
+
+Uso: python -m benchmarks.bench_parcelas --compras 10000
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from dateutil.relativedelta import relativedelta
+
+from financas.parcelas import expandir, parcelas_a_vencer
+from financas.sintetico import CARTOES
+
+
+def gerar_compras(compras, seed=0):
+    rng = np.random.default_rng(seed)
+    mes = rng.integers(1, 13, compras)
+    ano = rng.integers(2022, 2027, compras)
+    return pd.DataFrame({
+        'id_mes': [f'{m:02d}_{a}' for m, a in zip(mes, ano)],
+        'credito_cartao': rng.choice(CARTOES, compras),
+        'descricao': 'Compra',
+        'classificacao': 'Compras Minhas',
+        'valor': rng.uniform(10, 500, compras).round(2),
+        'ano': ano,
+        'parcelas': rng.choice([1, 1, 1, 2, 3, 6, 10, 12], compras),
+    })
+
+
+def expandir_legado(compras):
+    # mesmo laço do formulário de crédito antigo, uma linha por parcela
+    linhas = []
+    for compra in compras.itertuples(index=False):
+        mes = datetime.strptime(compra.id_mes, '%m_%Y')
+        for _ in range(int(compra.parcelas)):
+            linhas.append([mes.strftime('%m_%Y'), compra.credito_cartao, compra.descricao, compra.classificacao,
+                           compra.valor, mes.year])
+            mes += relativedelta(months=1)
+    return pd.DataFrame(linhas, columns=['id_mes', 'credito_cartao', 'descricao', 'classificacao', 'valor', 'ano'])
+
+
+def a_vencer_expandindo(compras, desde, meses):
+    # o jeito direto: gera todas as parcelas e agrupa por cartão e mês
+    janela = parcelas_a_vencer(compras.iloc[:0], desde, meses).columns
+    parcelas = expandir(compras)
+    parcelas = parcelas[parcelas['id_mes'].isin(janela)]
+    return parcelas.pivot_table(index='credito_cartao', columns='id_mes', values='valor', aggfunc='sum', fill_value=0)
+
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--compras', type=int, default=10_000)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    args = parser.parse_args()
+
+    compras = gerar_compras(args.compras)
+    desde, meses = 202601, 12
+
+    tempo_legado, legado = cronometrar(lambda: expandir_legado(compras), args.repeticoes)
+    tempo_novo, novo = cronometrar(lambda: expandir(compras), args.repeticoes)
+    pd.testing.assert_frame_equal(novo, legado, check_dtype=False)
+
+    tempo_expandindo, expandindo = cronometrar(lambda: a_vencer_expandindo(compras, desde, meses), args.repeticoes)
+    tempo_a_vencer, a_vencer = cronometrar(lambda: parcelas_a_vencer(compras, desde, meses), args.repeticoes)
+    pd.testing.assert_frame_equal(
+        a_vencer, expandindo.reindex(columns=a_vencer.columns, fill_value=0).rename_axis(columns=None),
+        check_dtype=False, check_names=False)
+
+    print(f'compras: {len(compras)}  parcelas: {len(novo)}')
+    print(f'expandir (laço relativedelta): {tempo_legado * 1000:9.1f} ms')
+    print(f'expandir (vetorizado):         {tempo_novo * 1000:9.1f} ms  ({tempo_legado / tempo_novo:.0f}x)')
+    print(f'a vencer (expandindo):         {tempo_expandindo * 1000:9.1f} ms')
+    print(f'a vencer (compacto):           {tempo_a_vencer * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
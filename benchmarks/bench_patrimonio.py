@@ -0,0 +1,106 @@
+"""Compara o "Status Patrimônio" somando a planilha a cada rerun (sum, groupby e cumsum, como a seção
+fazia) com as consultas nas somas acumuladas de financas.acumulados, e o custo de uma linha nova.
+
+Uso: python -m benchmarks.bench_patrimonio --linhas 200000
+"""
+import argparse
+import contextlib
+import time
+
+import numpy as np
+import pandas as pd
+
+from financas.acumulados import SomasAcumuladas
+from financas.esquema import aplicar_esquema
+from financas.sintetico import DIRECIONAMENTOS
+
+
+class EspelhoVazio:
+    # o suficiente da interface do Espelho para o índice começar vazio e receber as linhas pelo ouvinte
+    ouvintes = []
+
+    @contextlib.contextmanager
+    def conectar(self):
+        yield None
+
+    def linhas(self, nome, con=None, anos=None):
+        return [], []
+
+
+def gerar_patrimonio(linhas, seed=0):
+    rng = np.random.default_rng(seed)
+    ano = rng.integers(2016, 2026, linhas)
+    mes = rng.integers(1, 13, linhas)
+    return pd.DataFrame({
+        'id_mes': [f'{m:02d}_{a}' for m, a in zip(mes, ano)],
+        'valor': rng.uniform(-500, 2000, linhas).round(2).astype(str),
+        'direcionamento': rng.choice(DIRECIONAMENTOS + ['Reserva Carro'], linhas),
+        'ano': ano.astype(str),
+    })
+
+
+def status_legado(patrimonio, anos):
+    sem_reservas = patrimonio[patrimonio['direcionamento'] == 'Patrimônio']
+    total = patrimonio['valor'].sum()
+    por_direcionamento = patrimonio.groupby('direcionamento', observed=True)['valor'].sum()
+    mensal = sem_reservas.groupby(['id_mes', 'ano'])['valor'].sum().reset_index()
+    mensal = mensal[mensal['ano'].isin(anos)]
+    return total, por_direcionamento, mensal['valor'].cumsum().tolist()
+
+
+def status_somas(somas, anos):
+    total = somas.saldo('patrimonio')
+    por_direcionamento = {d: somas.saldo('patrimonio', d) for d in somas.chaves('patrimonio')}
+    return total, por_direcionamento, somas.mensal('patrimonio', 'Patrimônio', anos=anos)['acumulado'].tolist()
+
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--linhas', type=int, default=200_000)
+    parser.add_argument('--repeticoes', type=int, default=5)
+    args = parser.parse_args()
+
+    bruto = gerar_patrimonio(args.linhas)
+    cabecalho, linhas = list(bruto.columns), bruto.to_numpy().tolist()
+    patrimonio = aplicar_esquema('patrimonio', bruto)
+    anos = [2024, 2025]
+
+    inicio = time.perf_counter()
+    somas = SomasAcumuladas(EspelhoVazio(), {'patrimonio': 'direcionamento'})
+    somas._ao_gravar(None, 'patrimonio', cabecalho, linhas, completa=True)
+    tempo_montagem = time.perf_counter() - inicio
+
+    tempo_legado, legado = cronometrar(lambda: status_legado(patrimonio, anos), args.repeticoes)
+    tempo_somas, novo = cronometrar(lambda: status_somas(somas, anos), args.repeticoes)
+    assert legado[0] == novo[0] and legado[2] == novo[2]
+    assert legado[1].to_dict() == novo[1]
+
+    # uma linha nova soma só no mês dela; a consulta seguinte refaz o acumulado dali em diante
+    def gravar(id_mes):
+        somas._ao_gravar(None, 'patrimonio', cabecalho, [[id_mes, '150.00', 'Patrimônio', id_mes[3:]]], completa=False)
+        return somas.saldo('patrimonio', 'Patrimônio')
+
+    tempo_linha, _ = cronometrar(lambda: gravar('12_2025'), args.repeticoes)
+    tempo_passado, _ = cronometrar(lambda: gravar('01_2016'), args.repeticoes)
+    # uma linha custa muito menos que montar as somas de novo a partir da planilha
+    assert max(tempo_linha, tempo_passado) * 10 < tempo_montagem
+
+    print(f'linhas: {len(patrimonio)}')
+    print(f'somas acumuladas (montagem):   {tempo_montagem * 1000:9.1f} ms')
+    print(f'status (somando a planilha):   {tempo_legado * 1000:9.3f} ms')
+    print(f'status (somas acumuladas):     {tempo_somas * 1000:9.3f} ms  ({tempo_legado / tempo_somas:.0f}x)')
+    print(f'linha nova no último mês:      {tempo_linha * 1000:9.3f} ms  ({tempo_montagem / tempo_linha:.0f}x menos que a montagem)')
+    print(f'linha nova no primeiro mês:    {tempo_passado * 1000:9.3f} ms  ({tempo_montagem / tempo_passado:.0f}x menos que a montagem)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+"""Mede como o painel escala com o tamanho das planilhas, com dados sintéticos (financas.sintetico).
+
+Etapas cronometradas em cada tamanho (melhor de N repetições):
+  carga          valores crus -> DataFrame tipado (montar_dataframe + aplicar_esquema)
+  espelho        sincronização completa para o sqlite, já com os agregados mensais
+  leitura        leitura das planilhas a partir do espelho
+  agregacao      agrupamento mensal das planilhas (financas.agregados.agrupar)
+  visao_mensal   agrupados + merge do `orcamento_unificado` (financas.visao)
+  dre            DRE de todos os meses (financas.dre)
+  figuras        gráficos de barras como os das seções de débito
+
+Uso:
+  python -m benchmarks.suite --tamanhos 10000 100000 1000000 --saida resultado.json
+  python -m benchmarks.suite --saida novo.json --comparar resultado.json --tolerancia 0.2
+
+Com --comparar, sai com código 1 se alguma etapa ficou mais lenta que a tolerância.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import plotly
+
+from financas.agregados import AGREGADOS, AgregadosMensais, agrupar
+from financas.dre import montar_dre
+from financas.espelho import Espelho, montar_dataframe
+from financas.esquema import aplicar_esquema
+from financas.graficos import grafico_barras
+from financas.sintetico import PlanilhaFalsa, gerar_ledgers, para_valores
+from financas.visao import montar_visao_mensal
+
+
+ETAPAS = ['carga', 'espelho', 'leitura', 'agregacao', 'visao_mensal', 'dre', 'figuras']
+
+
+def cronometrar(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos), resultado
+
+
+def _versao_codigo():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _espelho_sincronizado(pasta, valores):
+    espelho = Espelho(os.path.join(pasta, 'financas.sqlite'), lambda nome: PlanilhaFalsa(valores[nome]))
+    agregados = AgregadosMensais(espelho)
+    for nome in valores:
+        espelho.sincronizar(nome, completa=True)
+    return espelho, agregados
+
+
+def _figuras(visao, agregado_mensal):
+    # mesmas figuras das seções de débito, sem o cache de figuras (mede a construção)
+    debito_orcamento = visao['orcamento_unificado']
+    debito_orcamento = debito_orcamento[debito_orcamento['classificacao'] == 'Débito']
+    graf_mes = grafico_barras(debito_orcamento, 'mes', 'Saldo', '# GASTO MENSAL DÉBITO Saldo',
+                              showlegend=False, xaxis_title='Mês', yaxis_title='Saldo')
+    debito_class = agregado_mensal[agregado_mensal['ledger'] == 'debito']
+    graf_class = grafico_barras(debito_class, 'id_mes', 'valor', '# GASTO DÉBITO POR TIPO - valor',
+                                color='classificacao', xaxis_title='Mês', yaxis_title='valor')
+    return graf_mes, graf_class
+
+
+def medir(linhas, repeticoes, etapas=ETAPAS):
+    """Cronometra as `etapas` com planilhas sintéticas de `linhas` transações; devolve etapa -> segundos."""
+    planilhas = gerar_ledgers(linhas)
+    valores = {nome: para_valores(df) for nome, df in planilhas.items()}
+    tempos = {}
+
+    def carga():
+        return {nome: aplicar_esquema(nome, montar_dataframe(v[0], v[1:])) for nome, v in valores.items()}
+
+    tempos['carga'], tipadas = cronometrar(carga, repeticoes)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        def espelho():
+            with tempfile.TemporaryDirectory(dir=pasta) as subpasta:
+                _espelho_sincronizado(subpasta, valores)
+
+        if 'espelho' in etapas:
+            tempos['espelho'], _ = cronometrar(espelho, repeticoes)
+
+        espelho_base, agregados = _espelho_sincronizado(pasta, valores)
+        if 'leitura' in etapas:
+            tempos['leitura'], _ = cronometrar(lambda: [espelho_base.ler(nome) for nome in valores], repeticoes)
+        agregado_mensal = agregados.ler()
+
+    def agregacao():
+        return [agrupar(planilhas[origem], ledger, coluna) for ledger, (origem, coluna) in AGREGADOS.items()]
+
+    if 'agregacao' in etapas:
+        tempos['agregacao'], _ = cronometrar(agregacao, repeticoes)
+
+    tempos['visao_mensal'], visao = cronometrar(
+        lambda: montar_visao_mensal(agregado_mensal, tipadas['orcamento']), repeticoes)
+
+    meses = sorted(agregado_mensal['id_mes'].unique())
+    if 'dre' in etapas:
+        tempos['dre'], _ = cronometrar(
+            lambda: montar_dre(visao['receita_agrupado'], visao['fixo_agrupado'], visao['debito_agrupado'],
+                               visao['credito_agrupado'], visao['orcamento_mensal'], meses),
+            repeticoes,
+        )
+
+    if 'figuras' in etapas:
+        tempos['figuras'], _ = cronometrar(lambda: _figuras(visao, agregado_mensal), repeticoes)
+
+    return {etapa: tempos[etapa] for etapa in etapas if etapa in tempos}
+
+
+def comparar(atual, anterior, tolerancia):
+    """Lista (tamanho, etapa, antes, agora) das etapas mais lentas que `anterior` além da `tolerancia`."""
+    regressoes = []
+    for tamanho, etapas in atual['resultados'].items():
+        for etapa, tempo in etapas.items():
+            antes = anterior.get('resultados', {}).get(tamanho, {}).get(etapa)
+            if antes and tempo > antes * (1 + tolerancia):
+                regressoes.append((tamanho, etapa, antes, tempo))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--etapas', nargs='+', choices=ETAPAS, default=ETAPAS)
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--saida', help='arquivo json com os resultados')
+    parser.add_argument('--comparar', help='json de uma execução anterior para comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='aumento aceito antes de acusar regressão')
+    args = parser.parse_args()
+
+    atual = {
+        'versao': _versao_codigo(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'repeticoes': args.repeticoes,
+        'resultados': {},
+    }
+    for tamanho in args.tamanhos:
+        tempos = medir(tamanho, args.repeticoes, args.etapas)
+        atual['resultados'][str(tamanho)] = tempos
+        print(f'{tamanho} linhas: ' + '  '.join(f'{etapa} {tempo:.3f}s' for etapa, tempo in tempos.items()))
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as arquivo:
+            json.dump(atual, arquivo, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            anterior = json.load(arquivo)
+        regressoes = comparar(atual, anterior, args.tolerancia)
+        for tamanho, etapa, antes, agora in regressoes:
+            print(f'REGRESSÃO {tamanho} linhas, {etapa}: {antes:.3f}s -> {agora:.3f}s ({agora / antes - 1:+.0%})')
+        if regressoes:
+            sys.exit(1)
+        print(f'sem regressões (tolerância {args.tolerancia:.0%}, comparado com {anterior.get("versao")})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# funções de apoio do app de finanças (carregamento, escrita e tratamentos das planilhas)
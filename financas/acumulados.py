@@ -0,0 +1,170 @@
+import copy
+import threading
+
+import pandas as pd
+
+from financas.espelho import montar_dataframe
+from financas.esquema import id_mes_para_periodo, mes_corrido, periodo_do_mes_corrido, reais_para_centavos
+
+
+# planilha -> coluna que separa as somas (além do total da planilha)
+SOMAS = {
+    'patrimonio': 'direcionamento',
+    'emprestimo': 'emprestimo_destinatario',
+    'investimento': 'investimento_tipo',
+}
+
+# lotes com mais linhas que isso são somados por (mês, chave) antes de entrar nas séries
+AGRUPAR_ACIMA = 100
+
+
+class _Serie:
+    # soma de cada mês (mes_corrido -> centavos, inclusive os meses cujas linhas somam zero) e a soma
+    # acumulada sem buracos, acumulado[i] = total até o mês `primeiro + i`; uma linha nova só soma no
+    # mês dela e marca a partir de onde o acumulado está velho (`sujo`), refeito na próxima leitura
+    __slots__ = ('primeiro', 'ultimo', 'valores', 'acumulado', 'sujo')
+
+    def __init__(self):
+        self.primeiro = self.ultimo = self.sujo = None
+        self.valores = {}
+        self.acumulado = []
+
+    def adicionar(self, periodo, valor):
+        mes = mes_corrido(periodo)
+        self.valores[mes] = self.valores.get(mes, 0) + valor
+        if self.primeiro is None or mes < self.primeiro:
+            # mês antes do primeiro: todas as posições mudam
+            self.primeiro, self.acumulado = mes, []
+        if self.ultimo is None or mes > self.ultimo:
+            self.ultimo = mes
+        self.sujo = mes if self.sujo is None else min(self.sujo, mes)
+
+    def _refazer(self):
+        # só do mês mais antigo que mudou em diante (linha no mês atual: uma posição)
+        if self.sujo is None:
+            return
+        del self.acumulado[self.sujo - self.primeiro:]
+        total = self.acumulado[-1] if self.acumulado else 0
+        for mes in range(self.primeiro + len(self.acumulado), self.ultimo + 1):
+            total += self.valores.get(mes, 0)
+            self.acumulado.append(total)
+        self.sujo = None
+
+    def ate(self, periodo=None):
+        if self.primeiro is None:
+            return 0
+        self._refazer()
+        if periodo is None:
+            return self.acumulado[-1]
+        posicao = mes_corrido(periodo) - self.primeiro
+        if posicao < 0:
+            return 0
+        return self.acumulado[min(posicao, len(self.acumulado) - 1)]
+
+
+class SomasAcumuladas:
+    """Somas acumuladas por mês de patrimônio (por direcionamento), empréstimos e investimentos.
+
+    Cada (planilha, chave) guarda a soma acumulada de todos os meses desde o primeiro, em centavos;
+    "saldo até o mês X" e "guardado entre A e B" são uma ou duas consultas na lista, sem somar as
+    linhas. As linhas novas chegam pelo ouvinte do espelho e somam só no mês delas (o acumulado dos
+    meses seguintes é refeito na próxima consulta); uma sincronização completa refaz a planilha.
+    A chave None é o total da planilha.
+    """
+
+    def __init__(self, espelho, somas=SOMAS):
+        self.somas = dict(somas)
+        self._series = {}
+        self._trava = threading.Lock()
+        with espelho.conectar() as con:
+            for nome in self.somas:
+                cabecalho, linhas = espelho.linhas(nome, con)
+                self._ao_gravar(con, nome, cabecalho, linhas, completa=True)
+        espelho.ouvintes.append(self._ao_gravar)
+
+    def _ao_gravar(self, con, nome, cabecalho, linhas, completa):
+        if nome not in self.somas:
+            return
+        with self._trava:
+            if completa:
+                for chave in [c for c in self._series if c[0] == nome]:
+                    del self._series[chave]
+            if linhas:
+                self._adicionar(nome, montar_dataframe(cabecalho, linhas))
+
+    def _adicionar(self, nome, df):
+        coluna = self.somas[nome]
+        if df.empty or 'id_mes' not in df.columns:
+            return
+        if coluna not in df.columns:
+            df = df.assign(**{coluna: ''})
+        base = pd.DataFrame({
+            'id_mes': id_mes_para_periodo(df['id_mes']),
+            # linha sem chave ainda entra no total da planilha
+            'chave': df[coluna].fillna('').astype(str),
+            'valor': reais_para_centavos(df['valor']).fillna(0),
+        }).dropna(subset=['id_mes'])
+        if len(base) > AGRUPAR_ACIMA:
+            # carga da planilha inteira: um groupby em vez de uma soma por linha
+            base = base.groupby(['id_mes', 'chave'])['valor'].sum().reset_index()
+        for periodo, classe, valor in zip(base['id_mes'].tolist(), base['chave'].tolist(), base['valor'].tolist()):
+            for chave in (classe, None):
+                self._series.setdefault((nome, chave), _Serie()).adicionar(periodo, valor)
+
+    def com_pendentes(self, pendentes):
+        """Cópia com as linhas cruas ainda fora do espelho (planilha -> DataFrame) somadas."""
+        pendentes = {nome: df for nome, df in pendentes.items() if nome in self.somas and not df.empty}
+        if not pendentes:
+            return self
+        with self._trava:
+            copia = copy.copy(self)
+            copia._series = {chave: copy.deepcopy(serie) for chave, serie in self._series.items()}
+        copia._trava = threading.Lock()
+        for nome, df in pendentes.items():
+            copia._adicionar(nome, df)
+        return copia
+
+    def chaves(self, nome):
+        """Chaves de `nome` com alguma linha (sem o total)."""
+        with self._trava:
+            return sorted(chave for planilha, chave in self._series if planilha == nome and chave not in (None, ''))
+
+    def saldo(self, nome, chave=None, ate=None):
+        """Soma de `nome` (só da `chave`, se informada) até o mês `ate` (aaaamm; todos sem `ate`), em centavos."""
+        with self._trava:
+            serie = self._series.get((nome, chave))
+            return serie.ate(ate) if serie is not None else 0
+
+    def entre(self, nome, de, ate, chave=None):
+        """Quanto entrou em `nome` de `de` a `ate` (aaaamm, inclusive), em centavos."""
+        return self.saldo(nome, chave, ate) - self.saldo(nome, chave, periodo_do_mes_corrido(mes_corrido(de) - 1))
+
+    def meses(self, nome, chave=None):
+        """Todos os meses (aaaamm) da série, do primeiro ao último, inclusive os sem lançamento."""
+        with self._trava:
+            serie = self._series.get((nome, chave))
+            if serie is None or serie.primeiro is None:
+                return []
+            return [periodo_do_mes_corrido(mes) for mes in range(serie.primeiro, serie.ultimo + 1)]
+
+    def mensal(self, nome, chave=None, anos=None):
+        """DataFrame (id_mes, ano, valor, acumulado) só com os meses que tiveram lançamento (inclusive os que somam zero).
+
+        `acumulado` é o saldo desde o primeiro mês mostrado (com `anos`, o primeiro deles), em centavos.
+        """
+        with self._trava:
+            serie = self._series.get((nome, chave))
+            lancados = set(serie.valores) if serie is not None else set()
+        meses = [mes for mes in self.meses(nome, chave) if anos is None or mes // 100 in anos]
+        if not meses:
+            return pd.DataFrame(columns=['id_mes', 'ano', 'valor', 'acumulado'])
+        base = self.saldo(nome, chave, periodo_do_mes_corrido(mes_corrido(meses[0]) - 1))
+        mensal = pd.DataFrame({
+            'id_mes': meses,
+            'ano': [mes // 100 for mes in meses],
+            'valor': [self.entre(nome, mes, mes, chave) for mes in meses],
+            'acumulado': [self.saldo(nome, chave, mes) - base for mes in meses],
+        })
+        # meses sem lançamento não aparecem (como no groupby das linhas); os que somam zero, sim
+        com_linhas = [mes_corrido(mes) in lancados for mes in meses]
+        return mensal[com_linhas].reset_index(drop=True)
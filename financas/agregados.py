@@ -0,0 +1,159 @@
+import pandas as pd
+
+from financas.espelho import montar_dataframe
+from financas.esquema import id_mes_para_periodo, reais_para_centavos
+from financas.parcelas import expandir
+
+
+# nome do agregado -> (planilha de origem, coluna usada como classificação)
+AGREGADOS = {
+    'fixo': ('fixo', 'classificacao'),
+    'debito': ('debito', 'classificacao'),
+    'credito': ('credito', 'classificacao'),
+    'credito_cartao': ('credito', 'credito_cartao'),
+    'receita': ('receita', 'classificacao'),
+    'patrimonio': ('patrimonio', 'classificacao'),
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS agregados (
+    ledger TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    id_mes INTEGER NOT NULL,
+    classificacao TEXT NOT NULL,
+    valor INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL,
+    PRIMARY KEY (ledger, ano, id_mes, classificacao)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS agregados_estado (
+    nome TEXT PRIMARY KEY,
+    linhas INTEGER NOT NULL
+);
+"""
+
+COLUNAS = ['ledger', 'ano', 'id_mes', 'classificacao', 'valor', 'quantidade']
+
+
+def agrupar(df, ledger, coluna):
+    """Soma `valor` por (ano, id_mes, classificacao) no formato da tabela de agregados.
+
+    `id_mes` sai como período inteiro (aaaamm) e `valor` em centavos, como em `financas.esquema`.
+    Compras parceladas (coluna `parcelas`) entram em cada mês das parcelas.
+    """
+    if df.empty or coluna not in df.columns or 'id_mes' not in df.columns:
+        return pd.DataFrame(columns=COLUNAS)
+    df = expandir(df)
+    base = pd.DataFrame({
+        'ano': pd.to_numeric(df['ano'], errors='coerce') if 'ano' in df.columns else 0,
+        'id_mes': id_mes_para_periodo(df['id_mes']),
+        'classificacao': df[coluna],
+        'valor': reais_para_centavos(df['valor']).fillna(0),
+    })
+    base['ano'] = base['ano'].fillna(0).astype(int)
+    base = base.dropna(subset=['id_mes', 'classificacao'])
+    base['id_mes'] = base['id_mes'].astype(int)
+    base['classificacao'] = base['classificacao'].astype(str)
+    agrupado = base.groupby(['ano', 'id_mes', 'classificacao'])['valor'].agg(['sum', 'count']).reset_index()
+    agrupado = agrupado.rename(columns={'sum': 'valor', 'count': 'quantidade'})
+    agrupado.insert(0, 'ledger', ledger)
+    return agrupado[COLUNAS]
+
+
+class AgregadosMensais:
+    """Totais mensais materializados no sqlite do espelho, chave (ledger, ano, id_mes, classificacao).
+
+    As linhas novas que chegam na sincronização (inclusive as dos formulários) são somadas no
+    lugar, na mesma transação em que entram no espelho; uma sincronização completa reconstrói
+    os agregados da planilha. Assim o painel lê uma linha por mês e classificação, e não
+    reagrupa as transações a cada rerun.
+    """
+
+    def __init__(self, espelho):
+        self.espelho = espelho
+        with espelho.conectar() as con:
+            tipos = {coluna: tipo for _, coluna, tipo, *_ in con.execute('PRAGMA table_info(agregados)')}
+            if tipos.get('id_mes') == 'TEXT':
+                # agregados de antes do esquema tipado (id_mes texto, valor em reais): refaz do espelho
+                con.execute('DROP TABLE agregados')
+                con.execute('DROP TABLE agregados_estado')
+            con.executescript(ESQUEMA)
+            # espelho que já existia antes dos agregados (ou que ficou fora de sincronia)
+            desatualizadas = con.execute(
+                'SELECT s.nome FROM sincronizacao s LEFT JOIN agregados_estado a ON a.nome = s.nome '
+                'WHERE a.linhas IS NULL OR a.linhas != s.linhas'
+            ).fetchall()
+            for (nome,) in desatualizadas:
+                cabecalho, linhas = espelho.linhas(nome, con)
+                self._ao_gravar(con, nome, cabecalho, linhas, completa=True)
+        espelho.ouvintes.append(self._ao_gravar)
+
+    def _ao_gravar(self, con, nome, cabecalho, linhas, completa):
+        ledgers = self._agregados_de(nome)
+        if ledgers and completa:
+            con.execute('DELETE FROM agregados WHERE ledger IN ({})'.format(','.join('?' * len(ledgers))), ledgers)
+
+        if ledgers and linhas:
+            df = montar_dataframe(cabecalho, linhas)
+            for ledger in ledgers:
+                novos = agrupar(df, ledger, AGREGADOS[ledger][1])
+                con.executemany(
+                    'INSERT INTO agregados (ledger, ano, id_mes, classificacao, valor, quantidade) '
+                    'VALUES (?, ?, ?, ?, ?, ?) '
+                    'ON CONFLICT (ledger, ano, id_mes, classificacao) DO UPDATE SET '
+                    'valor = valor + excluded.valor, quantidade = quantidade + excluded.quantidade',
+                    [
+                        (r.ledger, int(r.ano), int(r.id_mes), r.classificacao, int(r.valor), int(r.quantidade))
+                        for r in novos.itertuples(index=False)
+                    ],
+                )
+
+        total = con.execute('SELECT linhas FROM sincronizacao WHERE nome = ?', (nome,)).fetchone()[0]
+        con.execute('INSERT OR REPLACE INTO agregados_estado (nome, linhas) VALUES (?, ?)', (nome, total))
+
+    @staticmethod
+    def _agregados_de(nome):
+        return [ledger for ledger, (origem, _) in AGREGADOS.items() if origem == nome]
+
+    def ler(self, ledgers=None, anos=None):
+        """Devolve os agregados (colunas de `COLUNAS`), opcionalmente filtrados por ledger e ano.
+
+        `classificacao` volta como categoria e `valor` em centavos.
+        """
+        filtros, parametros = [], []
+        if ledgers is not None:
+            filtros.append('ledger IN ({})'.format(','.join('?' * len(ledgers))))
+            parametros += list(ledgers)
+        if anos is not None:
+            filtros.append('ano IN ({})'.format(','.join('?' * len(anos))))
+            parametros += [int(ano) for ano in anos]
+        sql = 'SELECT {} FROM agregados'.format(', '.join(COLUNAS))
+        if filtros:
+            sql += ' WHERE ' + ' AND '.join(filtros)
+        with self.espelho.conectar() as con:
+            agregado = pd.read_sql_query(sql + ' ORDER BY ledger, ano, id_mes, classificacao', con, params=parametros)
+        return agregado.astype({'ledger': 'category', 'classificacao': 'category', 'valor': 'int64'})
+
+
+def agrupado(agregado, ledger, colunas=('id_mes', 'classificacao')):
+    """Recorte de um ledger dos agregados, somado por `colunas` (como o groupby das planilhas cruas)."""
+    recorte = agregado[agregado['ledger'] == ledger]
+    return recorte.groupby(list(colunas), observed=True)['valor'].sum().reset_index()
+
+
+def com_pendentes(agregado, pendentes):
+    """Soma em `agregado` (de `AgregadosMensais.ler`) as linhas cruas que ainda não estão no espelho.
+
+    `pendentes` é planilha -> DataFrame cru, como `Armazenamento.pendentes`.
+    """
+    novos = [
+        agrupar(pendentes[origem], ledger, coluna)
+        for ledger, (origem, coluna) in AGREGADOS.items()
+        if origem in pendentes and not pendentes[origem].empty
+    ]
+    novos = [df for df in novos if not df.empty]
+    if not novos:
+        return agregado
+    chave = ['ledger', 'ano', 'id_mes', 'classificacao']
+    somado = pd.concat([agregado.astype({'ledger': str, 'classificacao': str})] + novos, ignore_index=True)
+    somado = somado.groupby(chave)[['valor', 'quantidade']].sum().reset_index()
+    return somado[COLUNAS].astype({'ledger': 'category', 'classificacao': 'category', 'valor': 'int64'})
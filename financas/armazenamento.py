@@ -0,0 +1,221 @@
+import math
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from financas.carregamento import PLANILHAS
+from financas.escrita import acrescentar_valores, linhas_para_valores
+from financas.espelho import Espelho
+from financas.fila import FilaEscrita
+from financas.inicio import importar
+from financas.instrumentacao import contar_chamada
+
+
+class Armazenamento(ABC):
+    """Onde as planilhas (ledgers) ficam guardadas.
+
+    As leituras sempre passam pela cópia local em sqlite (`self.espelho`), que também mantém os
+    agregados mensais. As linhas são numeradas a partir de 1 (a linha 1 é a primeira depois do
+    cabeçalho), como no espelho.
+    """
+
+    espelho = None
+    # fila de escrita (financas.fila) quando as linhas novas são enviadas em segundo plano
+    fila = None
+
+    def versao(self, nome):
+        """Muda sempre que o conteúdo de `nome` muda, inclusive as linhas ainda na fila; serve de chave de cache."""
+        return self.versao_gravada(nome) + self.versao_pendente(nome)
+
+    def versao_gravada(self, nome):
+        """Versão só do que já está no espelho (muda quando entram linhas nele)."""
+        return self.espelho.conferir(nome)
+
+    def versao_pendente(self, nome):
+        """Versão das linhas de `nome` que ainda não chegaram no espelho (vazia sem fila)."""
+        return self.fila.versao(nome) if self.fila is not None else ()
+
+    def cabecalho(self, nome):
+        return self.espelho.cabecalho(nome)
+
+    def anos(self, nome):
+        """Anos que têm linhas em `nome` (as partições que dá para ler separadas)."""
+        return self.espelho.anos(nome)
+
+    def ler(self, nome, anos=None):
+        """DataFrame cru da planilha `nome` (sem o esquema de `financas.esquema`), só de `anos` se informado."""
+        return self.espelho.ler(nome, anos)
+
+    def pendentes(self, nome, anos=None):
+        """DataFrame cru das linhas de `nome` já aceitas mas ainda fora do espelho (na fila de escrita)."""
+        return self.fila.pendentes(nome, anos) if self.fila is not None else pd.DataFrame()
+
+    @abstractmethod
+    def anexar(self, nome, novas_linhas):
+        """Acrescenta as linhas do DataFrame `novas_linhas` ao fim de `nome` e devolve as linhas."""
+
+    @abstractmethod
+    def atualizar(self, nome, linha, valores):
+        """Troca a linha `linha` de `nome` por `valores` (dicionário coluna -> valor)."""
+
+    @abstractmethod
+    def remover(self, nome, linhas):
+        """Apaga de `nome` as linhas de número em `linhas`."""
+
+    def _linha_completa(self, nome, linha, valores):
+        cabecalho, linhas = self.espelho.linhas(nome)
+        if not 1 <= linha <= len(linhas):
+            raise IndexError(f'{nome} não tem a linha {linha}')
+        atual = dict(zip(cabecalho, linhas[linha - 1]))
+        desconhecidas = set(valores) - set(cabecalho)
+        if desconhecidas:
+            raise KeyError(f'colunas que não existem em {nome}: {sorted(desconhecidas)}')
+        atual.update(valores)
+        (nova,) = linhas_para_valores(pd.DataFrame([atual], columns=cabecalho))
+        return cabecalho, linhas, nova
+
+
+class ArmazenamentoSheets(Armazenamento):
+    """Planilhas no Google Sheets (uma url por ledger), lidas pelo espelho incremental.
+
+    As linhas novas entram na fila de escrita e são enviadas em lotes por uma thread; o
+    espelho é sincronizado depois de cada lote enviado.
+    """
+
+    def __init__(self, abrir_cliente, urls, caminho, intervalo=300, escritas_por_minuto=50):
+        # gspread.Client do processo (financas.cliente), compartilhado por todas as sessões; criado na
+        # primeira chamada ao Sheets (em geral a sincronização em segundo plano), não na abertura do app
+        self._abrir_cliente = abrir_cliente
+        self._cliente = None
+        self._trava_cliente = threading.Lock()
+        self.urls = {nome: urls[chave] for nome, chave in PLANILHAS.items()}
+        self.espelho = Espelho(caminho, self._abrir_planilha, intervalo=intervalo)
+        self.fila = FilaEscrita(self.espelho, self._enviar, self.espelho.sincronizar, por_minuto=escritas_por_minuto)
+
+    @property
+    def cliente(self):
+        if self._cliente is None:
+            with self._trava_cliente:
+                if self._cliente is None:
+                    self._cliente = self._abrir_cliente()
+        return self._cliente
+
+    def _abrir_planilha(self, nome):
+        # primeira aba da planilha, como o conn.read
+        worksheet = self.cliente.open_by_url(self.urls[nome]).get_worksheet(0)
+        contar_chamada('abrir_planilha')
+        return worksheet
+
+    def anexar(self, nome, novas_linhas):
+        """Coloca as linhas na fila de escrita e volta sem esperar o Sheets."""
+        if novas_linhas.empty:
+            return novas_linhas
+        # a página de lançamentos não lê nenhuma planilha: num processo novo a cópia de `nome` pode não
+        # existir ainda, e as colunas têm de sair na ordem da planilha, não na do formulário
+        self.espelho.conferir(nome)
+        cabecalho = self.cabecalho(nome)
+        colunas = list(cabecalho) + [c for c in novas_linhas.columns if c not in cabecalho]
+        self.fila.enfileirar(nome, colunas, linhas_para_valores(novas_linhas, colunas))
+        return novas_linhas
+
+    def _enviar(self, nome, colunas, valores):
+        worksheet = self._abrir_planilha(nome)
+        # o cabeçalho vem da linha 1 da própria planilha, não do espelho: a fila é durável e o lote pode
+        # ter sido montado com a cópia local vazia ou velha (colunas na ordem do formulário)
+        cabecalho = worksheet.row_values(1)
+        contar_chamada('row_values', cabecalho)
+        if not cabecalho:
+            # planilha vazia de verdade: manda o cabeçalho junto
+            acrescentar_valores(worksheet, [colunas] + valores)
+            return
+        novas = [c for c in colunas if c not in cabecalho]
+        if novas:
+            # colunas novas (como `parcelas` no crédito) entram no fim do cabeçalho antes das linhas
+            cabecalho = cabecalho + novas
+            worksheet.update('A1', [cabecalho], value_input_option='RAW')
+            contar_chamada('update', cabecalho)
+        if colunas != cabecalho:
+            posicoes = [colunas.index(c) if c in colunas else None for c in cabecalho]
+            valores = [[linha[p] if p is not None else '' for p in posicoes] for linha in valores]
+        acrescentar_valores(worksheet, valores)
+
+    def atualizar(self, nome, linha, valores):
+        _, _, nova = self._linha_completa(nome, linha, valores)
+        worksheet = self._abrir_planilha(nome)
+        # +1 por causa do cabeçalho
+        worksheet.update(f'A{linha + 1}', [nova], value_input_option='USER_ENTERED')
+        contar_chamada('update', nova)
+        # edição fora da janela do incremental: só a sincronização completa enxerga
+        self.espelho.sincronizar(nome, completa=True)
+
+    def remover(self, nome, linhas):
+        worksheet = self._abrir_planilha(nome)
+        # de baixo para cima, para a numeração das próximas não mudar
+        for linha in sorted(set(linhas), reverse=True):
+            worksheet.delete_rows(linha + 1)
+            contar_chamada('delete_rows')
+        self.espelho.sincronizar(nome, completa=True)
+
+
+class ArmazenamentoSQLite(Armazenamento):
+    """Ledgers guardados só no sqlite local, sem Google Sheets.
+
+    Usa as mesmas tabelas do espelho, então aponta também para uma cópia já sincronizada
+    (por exemplo `.espelho/financas.sqlite`) para rodar o app offline com os dados reais.
+    """
+
+    def __init__(self, caminho):
+        self.espelho = Espelho(caminho, None, intervalo=math.inf, intervalo_completa=math.inf)
+
+    def anexar(self, nome, novas_linhas):
+        if novas_linhas.empty:
+            return novas_linhas
+        cabecalho = self.cabecalho(nome)
+        valores = linhas_para_valores(novas_linhas, cabecalho)
+        if len(valores[0]) > len(cabecalho):
+            # colunas novas (ou ledger ainda vazio) entram no cabeçalho, como no Sheets
+            cabecalho = list(cabecalho) + [c for c in novas_linhas.columns if c not in cabecalho]
+            _, antigas = self.espelho.linhas(nome)
+            self.espelho.substituir(nome, cabecalho, antigas + valores)
+        else:
+            self.espelho.acrescentar(nome, cabecalho, valores)
+        return novas_linhas
+
+    def atualizar(self, nome, linha, valores):
+        cabecalho, linhas, nova = self._linha_completa(nome, linha, valores)
+        linhas[linha - 1] = nova
+        self.espelho.substituir(nome, cabecalho, linhas)
+
+    def remover(self, nome, linhas):
+        cabecalho, atuais = self.espelho.linhas(nome)
+        removidas = set(linhas)
+        self.espelho.substituir(nome, cabecalho, [v for i, v in enumerate(atuais, start=1) if i not in removidas])
+
+
+def abrir_cliente(credenciais, conexoes=10, simultaneas=8):
+    """`financas.cliente.abrir_cliente`, com o gspread e o google-auth importados só quando ele é chamado."""
+    return importar('financas.cliente').abrir_cliente(credenciais, conexoes=conexoes, simultaneas=simultaneas)
+
+
+def abrir_armazenamento(config, credenciais_sheets):
+    """Cria o armazenamento pela seção `[armazenamento]` dos secrets.
+
+    `tipo = "sheets"` (padrão) usa a conta de serviço e as urls de `[connections.gsheets]` e o
+    espelho em `caminho`; `tipo = "sqlite"` usa só o arquivo `caminho`. `escritas_por_minuto`
+    limita os envios da fila de escrita (a cota de escrita do Sheets é de 60 por minuto por
+    usuário); `conexoes` e `requisicoes_simultaneas` dimensionam o cliente compartilhado.
+    `credenciais_sheets` devolve a seção `[connections.gsheets]` e só é chamada no modo Sheets,
+    para o app rodar offline sem credenciais.
+    """
+    tipo = config.get('tipo', 'sheets')
+    caminho = config.get('caminho', '.espelho/financas.sqlite')
+    if tipo == 'sqlite':
+        return ArmazenamentoSQLite(caminho)
+    if tipo == 'sheets':
+        credenciais = credenciais_sheets()
+        cliente = lambda: abrir_cliente(credenciais, conexoes=config.get('conexoes', 10),
+                                        simultaneas=config.get('requisicoes_simultaneas', 8))
+        return ArmazenamentoSheets(cliente, credenciais, caminho, intervalo=config.get('intervalo', 300),
+                                   escritas_por_minuto=config.get('escritas_por_minuto', 50))
+    raise ValueError(f'armazenamento desconhecido: {tipo!r} (use "sheets" ou "sqlite")')
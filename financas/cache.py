@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+from financas.instrumentacao import consulta_cache, falta_cache
+
+
+class CacheCompartilhado:
+    """Valores do processo por chave, guardados só na versão mais recente de cada chave.
+
+    Várias sessões pedindo a mesma chave e versão ao mesmo tempo fazem uma carga só (as demais
+    esperam por ela); uma versão nova substitui a anterior em vez de se somar a ela. O valor é
+    compartilhado, não copiado como no `st.cache_data`: quem recebe não deve alterá-lo.
+    """
+
+    def __init__(self, nome, maximo=64):
+        # nome usado nas contagens de acertos/faltas da instrumentação
+        self.nome = nome
+        self.maximo = maximo
+        self._valores = OrderedDict()
+        self._carregando = {}
+        self._trava = threading.Lock()
+
+    def _guardado(self, chave, versao):
+        entrada = self._valores.get(chave)
+        if entrada is not None and entrada[0] == versao:
+            self._valores.move_to_end(chave)
+            return entrada
+        return None
+
+    def obter(self, chave, versao, carregar):
+        """Valor de `chave` na `versao`, chamando `carregar()` só se ele não estiver guardado."""
+        consulta_cache(self.nome)
+        with self._trava:
+            entrada = self._guardado(chave, versao)
+            if entrada is not None:
+                return entrada[1]
+            trava = self._carregando.setdefault((chave, versao), threading.Lock())
+
+        with trava:
+            with self._trava:
+                # outra thread pode ter carregado enquanto esta esperava
+                entrada = self._guardado(chave, versao)
+            if entrada is not None:
+                return entrada[1]
+            falta_cache(self.nome)
+            try:
+                valor = carregar()
+                with self._trava:
+                    self._valores[chave] = (versao, valor)
+                    self._valores.move_to_end(chave)
+                    while len(self._valores) > self.maximo:
+                        self._valores.popitem(last=False)
+            finally:
+                with self._trava:
+                    self._carregando.pop((chave, versao), None)
+        return valor
+
+    def invalidar(self, condicao=None):
+        """Descarta as chaves em que `condicao(chave)` é verdadeira (todas, sem `condicao`)."""
+        with self._trava:
+            for chave in [c for c in self._valores if condicao is None or condicao(c)]:
+                del self._valores[chave]
+
+    def __len__(self):
+        return len(self._valores)
@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+
+logger = logging.getLogger(__name__)
+
+
+# nome da planilha -> chave da url em st.secrets["connections"]["gsheets"]
+PLANILHAS = {
+    'debito': 'url_extrato_debito',
+    'credito': 'url_extrato_credito',
+    'receita': 'url_extrato_receitas',
+    'fixo': 'url_extrato_fixos',
+    'investimento': 'url_investimento',
+    'emprestimo': 'url_emprestimos',
+    'vr': 'url_extrato_vr',
+    'patrimonio': 'url_patrimonio',
+    'orcamento': 'url_orcamento',
+}
+
+
+@dataclass
+class Ledgers:
+    """Planilhas lidas no início de uma página (None nas que ela não pediu)."""
+
+    debito: pd.DataFrame = None
+    credito: pd.DataFrame = None
+    receita: pd.DataFrame = None
+    fixo: pd.DataFrame = None
+    investimento: pd.DataFrame = None
+    emprestimo: pd.DataFrame = None
+    vr: pd.DataFrame = None
+    patrimonio: pd.DataFrame = None
+    orcamento: pd.DataFrame = None
+    # segundos gastos na leitura de cada planilha
+    tempos: dict = field(default_factory=dict)
+    # tempo de parede da carga completa (com as leituras em paralelo)
+    tempo_total: float = 0.0
+
+    def planilhas(self):
+        return {f.name: getattr(self, f.name) for f in fields(self)
+                if f.name in PLANILHAS and getattr(self, f.name) is not None}
+
+
+def carregar_ledgers(ler, nomes=None, max_workers=None):
+    """Lê as planilhas `nomes` (todas as nove, sem `nomes`) em paralelo e devolve um `Ledgers`.
+
+    `ler` é a função nome -> DataFrame (por exemplo `Espelho.ler` ou um `conn.read` com a url).
+    Com o cache frio a carga demora o tempo da planilha mais lenta, e não a soma delas.
+    """
+    nomes = list(PLANILHAS if nomes is None else nomes)
+    desconhecidas = set(nomes) - set(PLANILHAS)
+    if desconhecidas:
+        raise ValueError(f'planilhas desconhecidas: {sorted(desconhecidas)}')
+    if not nomes:
+        return Ledgers()
+    # as threads precisam do contexto do script para usar o cache do streamlit
+    ctx = get_script_run_ctx()
+
+    def _inicializar_thread():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+
+    def _ler(nome):
+        inicio = time.perf_counter()
+        df = ler(nome)
+        return df, time.perf_counter() - inicio
+
+    inicio_total = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or len(nomes), initializer=_inicializar_thread) as executor:
+        futuros = {nome: executor.submit(_ler, nome) for nome in nomes}
+        resultados = {nome: futuro.result() for nome, futuro in futuros.items()}
+    tempo_total = time.perf_counter() - inicio_total
+
+    tempos = {nome: tempo for nome, (_, tempo) in resultados.items()}
+    for nome, tempo in tempos.items():
+        logger.info('leitura %s: %.3fs', nome, tempo)
+    logger.info('leitura das planilhas: %.3fs (soma sequencial seria %.3fs)', tempo_total, sum(tempos.values()))
+
+    return Ledgers(
+        **{nome: df for nome, (df, _) in resultados.items()},
+        tempos=tempos,
+        tempo_total=tempo_total,
+    )
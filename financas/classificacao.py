@@ -0,0 +1,149 @@
+import threading
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+from financas.espelho import montar_dataframe
+
+
+# planilhas com descrição escolhida à mão e classificação aprendida do histórico
+PLANILHAS = ['debito', 'credito', 'vr']
+
+# 'Outros' é o que fica quando ninguém escolheu (e o padrão da importação): não ensina nada
+SEM_CLASSE = 'Outros'
+
+# palavras que aparecem em qualquer lançamento e não dizem nada do comerciante
+PALAVRAS_VAZIAS = {
+    'de', 'da', 'do', 'das', 'dos', 'em', 'no', 'na', 'com', 'para', 'por', 'e',
+    'compra', 'pagamento', 'pag', 'pgto', 'pix', 'ted', 'doc', 'debito', 'credito', 'cartao',
+    'parcela', 'parc', 'ltda', 'me', 'sa', 'eireli', 'br', 'brasil', 'www',
+}
+
+# uma palavra só vota se ao menos `MINIMO_PALAVRA` lançamentos a tiveram e `CONFIANCA_PALAVRA` deles na classe
+MINIMO_PALAVRA = 2
+CONFIANCA_PALAVRA = 0.6
+
+
+def _contar(contagem, melhores, chave, classe, quantidade):
+    # soma `quantidade` à `classe` de `chave` e troca a melhor classe só se a nova passou dela (as contagens
+    # só crescem); no empate fica a que chegou lá primeiro
+    contagem[classe] += quantidade
+    atual = melhores.get(chave)
+    if atual is None or atual == classe or contagem[classe] > contagem[atual]:
+        melhores[chave] = classe
+
+
+def normalizar(descricoes):
+    """Descrições sem acento, minúsculas, sem números e pontuação, sem palavras vazias ('IFOOD *Pizza 123' -> 'ifood pizza')."""
+    texto = pd.Series(descricoes, dtype='object').fillna('').astype(str)
+    texto = texto.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii').str.lower()
+    texto = texto.str.replace(r'[^a-z ]+', ' ', regex=True)
+    palavras = texto.str.split()
+    return palavras.map(lambda lista: ' '.join(p for p in lista if len(p) > 1 and p not in PALAVRAS_VAZIAS))
+
+
+class IndiceClassificacao:
+    """Índice em memória descrição -> classificação, montado com os lançamentos já classificados.
+
+    Por planilha guarda, para cada comerciante (a descrição normalizada inteira) e para cada
+    palavra da descrição, quantos lançamentos tiveram cada classificação. A sugestão é a
+    classificação mais comum do comerciante; sem ele, vota a palavra mais confiável da descrição.
+    As linhas novas entram no índice na mesma gravação em que entram no espelho (ouvinte), e uma
+    sincronização completa refaz o índice da planilha. As melhores classes são mantidas junto com
+    as contagens: uma linha nova só revê as do comerciante e das palavras que ela tem.
+    """
+
+    def __init__(self, espelho, planilhas=PLANILHAS):
+        self.espelho = espelho
+        self.planilhas = list(planilhas)
+        self._comerciantes = {nome: defaultdict(Counter) for nome in self.planilhas}
+        self._palavras = {nome: defaultdict(Counter) for nome in self.planilhas}
+        # por planilha: (comerciante -> classe, palavra -> classe, palavra -> confiança das que votam)
+        self._melhores = {nome: ({}, {}, {}) for nome in self.planilhas}
+        self._trava = threading.Lock()
+        with espelho.conectar() as con:
+            for nome in self.planilhas:
+                cabecalho, linhas = espelho.linhas(nome, con)
+                self._ao_gravar(con, nome, cabecalho, linhas, completa=True)
+        espelho.ouvintes.append(self._ao_gravar)
+
+    def _ao_gravar(self, con, nome, cabecalho, linhas, completa):
+        if nome not in self.planilhas:
+            return
+        df = montar_dataframe(cabecalho, linhas) if linhas else pd.DataFrame()
+        with self._trava:
+            if completa:
+                self._comerciantes[nome].clear()
+                self._palavras[nome].clear()
+                for melhores in self._melhores[nome]:
+                    melhores.clear()
+            if {'descricao', 'classificacao'} <= set(df.columns):
+                self._adicionar(nome, df['descricao'], df['classificacao'])
+
+    def adicionar(self, nome, descricoes, classificacoes):
+        """Ensina ao índice de `nome` lançamentos já classificados."""
+        with self._trava:
+            self._adicionar(nome, descricoes, classificacoes)
+
+    def _adicionar(self, nome, descricoes, classificacoes):
+        base = pd.DataFrame({'chave': normalizar(descricoes).to_numpy(),
+                             'classe': pd.Series(classificacoes, dtype='object').to_numpy()})
+        base = base[(base['chave'] != '') & base['classe'].notna() & (base['classe'] != SEM_CLASSE)]
+        comerciantes, palavras = self._comerciantes[nome], self._palavras[nome]
+        melhor_comerciante, melhor_palavra, confiancas = self._melhores[nome]
+        for (chave, classe), quantidade in base.groupby(['chave', 'classe']).size().items():
+            _contar(comerciantes[chave], melhor_comerciante, chave, classe, quantidade)
+        base = base.assign(palavra=base['chave'].str.split()).explode('palavra')
+        tocadas = set()
+        for (palavra, classe), quantidade in base.groupby(['palavra', 'classe']).size().items():
+            _contar(palavras[palavra], melhor_palavra, palavra, classe, quantidade)
+            tocadas.add(palavra)
+        # a confiança muda com o total da palavra mesmo quando a classe dela não muda
+        for palavra in tocadas:
+            contagem = palavras[palavra]
+            total = sum(contagem.values())
+            quantidade = contagem[melhor_palavra[palavra]]
+            if total >= MINIMO_PALAVRA and quantidade / total >= CONFIANCA_PALAVRA:
+                # empate na confiança: ganha a palavra vista mais vezes
+                confiancas[palavra] = quantidade / total + total * 1e-9
+            else:
+                confiancas.pop(palavra, None)
+
+    def classificar(self, nome, descricoes):
+        """Classificação sugerida para cada descrição (NaN quando o histórico não diz nada), de uma vez.
+
+        Cada descrição distinta é normalizada e procurada uma vez só; as buscas são em dicionário.
+        """
+        descricoes = pd.Series(descricoes, dtype='object')
+        if nome not in self.planilhas:
+            return pd.Series(float('nan'), index=descricoes.index, dtype='object')
+        # sem cópia local de `nome` (processo novo, página que não lê a planilha) o índice estaria vazio:
+        # a sincronização entra nele pelo ouvinte
+        self.espelho.conferir(nome)
+        codigos, distintas = pd.factorize(descricoes.fillna(''))
+        chaves = normalizar(distintas)
+        faltam = chaves != ''
+        por_palavra = chaves[faltam].str.split().explode().rename('palavra').reset_index()
+        with self._trava:
+            # busca chave a chave: os dicionários mudam a cada gravação e não são copiados
+            comerciantes, palavras, confiancas = self._melhores[nome]
+            sugestoes = chaves.map(comerciantes.get)
+            por_palavra['confianca'] = por_palavra['palavra'].map(confiancas.get)
+            por_palavra['classe'] = por_palavra['palavra'].map(palavras.get)
+
+        faltam = sugestoes.isna() & faltam
+        if faltam.any():
+            por_palavra = por_palavra[faltam.to_numpy()[por_palavra['index'].to_numpy()]]
+            # em cada descrição, a palavra mais confiável decide
+            melhor = (por_palavra.dropna(subset=['confianca'])
+                      .sort_values('confianca', ascending=False, kind='stable')
+                      .drop_duplicates('index'))
+            sugestoes.loc[melhor['index'].to_numpy()] = melhor['classe'].to_numpy()
+        return pd.Series(sugestoes.to_numpy()[codigos] if len(distintas) else [], index=descricoes.index, dtype='object')
+
+    def sugerir(self, nome, descricao):
+        """Classificação sugerida para uma descrição (None sem sugestão)."""
+        if not descricao or not str(descricao).strip():
+            return None
+        sugestao = self.classificar(nome, [descricao]).iloc[0]
+        return None if pd.isna(sugestao) else sugestao
@@ -0,0 +1,44 @@
+import threading
+
+import gspread
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from gspread.auth import DEFAULT_SCOPES
+from requests.adapters import HTTPAdapter
+
+
+class SessaoCompartilhada(AuthorizedSession):
+    """Sessão HTTP única do processo para as APIs do Google, usada por todas as sessões do app.
+
+    Mantém até `conexoes` conexões keep-alive abertas com o Sheets, deixa no máximo `simultaneas`
+    requisições em andamento (as outras esperam a vez, em vez de abrir conexões novas) e guarda
+    um token só: quando ele vence, uma thread renova e as demais esperam o token novo.
+    """
+
+    def __init__(self, credenciais, conexoes=10, simultaneas=8):
+        super().__init__(credenciais)
+        self.mount('https://', HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, pool_block=True))
+        self._vagas = threading.BoundedSemaphore(simultaneas)
+        self._trava_token = threading.Lock()
+
+    def _garantir_token(self):
+        if self.credentials.valid:
+            return
+        with self._trava_token:
+            if not self.credentials.valid:
+                self.credentials.refresh(self._auth_request)
+
+    def request(self, method, url, *args, **kwargs):
+        if kwargs.get('_credential_refresh_attempt', 0) > 0:
+            # nova tentativa depois de um 401 (o AuthorizedSession renova o token e chama request de
+            # novo): já está dentro da vaga da chamada de fora, pegar outra travaria com simultaneas=1
+            return super().request(method, url, *args, **kwargs)
+        with self._vagas:
+            self._garantir_token()
+            return super().request(method, url, *args, **kwargs)
+
+
+def abrir_cliente(credenciais, conexoes=10, simultaneas=8):
+    """Cliente gspread da conta de serviço em `credenciais` (a seção `[connections.gsheets]` dos secrets)."""
+    auth = Credentials.from_service_account_info(dict(credenciais), scopes=DEFAULT_SCOPES)
+    return gspread.Client(auth=auth, session=SessaoCompartilhada(auth, conexoes=conexoes, simultaneas=simultaneas))
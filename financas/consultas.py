@@ -0,0 +1,152 @@
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from financas.inicio import importar
+
+
+# ordenações oferecidas nas tabelas "Base"; rowid é a ordem em que as linhas estão na planilha
+ORDENS = {
+    'Ordem da planilha': [('rowid', 'ASC')],
+    'Mais recentes': [('id_mes', 'DESC'), ('rowid', 'DESC')],
+    'Mais antigos': [('id_mes', 'ASC'), ('rowid', 'ASC')],
+    'Maior valor': [('valor', 'DESC')],
+    'Menor valor': [('valor', 'ASC')],
+}
+
+
+@dataclass
+class ResultadoConsulta:
+    """Recorte visível de uma consulta e os totais de todas as linhas que passaram nos filtros."""
+
+    linhas: pd.DataFrame
+    total: int
+    soma: int
+
+
+def _identificador(coluna):
+    return '"' + str(coluna).replace('"', '""') + '"'
+
+
+def _python(valor):
+    # o duckdb não aceita escalares do numpy como parâmetro
+    if pd.isna(valor):
+        return None
+    return valor.item() if hasattr(valor, 'item') else valor
+
+
+def _condicoes(filtros, busca, colunas_busca):
+    partes, parametros = [], []
+    for coluna, valores in (filtros or {}).items():
+        if valores is None:
+            continue
+        valores = [_python(v) for v in valores]
+        preenchidos = [v for v in valores if v is not None]
+        condicao = []
+        if preenchidos:
+            condicao.append(f'{_identificador(coluna)} IN ({", ".join("?" * len(preenchidos))})')
+            parametros += preenchidos
+        if len(preenchidos) < len(valores):
+            condicao.append(f'{_identificador(coluna)} IS NULL')
+        partes.append('(' + ' OR '.join(condicao) + ')' if condicao else 'FALSE')
+    if busca:
+        partes.append('(' + ' OR '.join(f'{_identificador(c)}::VARCHAR ILIKE ?' for c in colunas_busca) + ')')
+        parametros += [f'%{busca}%'] * len(colunas_busca)
+    return (' WHERE ' + ' AND '.join(partes) if partes else ''), parametros
+
+
+class MotorConsultas:
+    """Ledgers tipados copiados para um DuckDB em memória, uma tabela por planilha.
+
+    A cópia é refeita só quando a versão da planilha muda. Filtros, busca, ordenação, totais e o
+    recorte (LIMIT/OFFSET) viram uma única consulta, e só as linhas visíveis voltam para o pandas.
+    """
+
+    def __init__(self):
+        # o duckdb só é importado quando a primeira tabela "Base" é aberta
+        self._con = importar('duckdb').connect()
+        self._versoes = {}
+        self._colunas = {}
+        self._trava = threading.Lock()
+
+    def carregar(self, nome, versao, df):
+        """Garante a tabela `nome` com o conteúdo de `df`, copiando só se `versao` mudou.
+
+        A tabela é a planilha inteira: o motor é do processo, e o recorte de anos de cada sessão é um
+        filtro das consultas (`ano` em `filtros`), não uma tabela à parte.
+        """
+        with self._trava:
+            if self._versoes.get(nome) == versao:
+                return
+            self._con.register('_carga', df)
+            try:
+                self._con.execute(f'CREATE OR REPLACE TABLE {_identificador(nome)} AS SELECT * FROM _carga')
+            finally:
+                self._con.unregister('_carga')
+            self._versoes[nome] = versao
+            self._colunas[nome] = [str(c) for c in df.columns]
+
+    def _cursor(self):
+        # cada consulta em um cursor próprio: as seções (fragments) rodam em threads diferentes
+        with self._trava:
+            return self._con.cursor()
+
+    def colunas(self, nome):
+        return self._colunas.get(nome, [])
+
+    def distintos(self, nome, coluna, filtros=None):
+        """Valores distintos de `coluna` entre as linhas que passam em `filtros` (para as opções dos filtros)."""
+        where, parametros = _condicoes(filtros, None, ())
+        sql = f'SELECT DISTINCT {_identificador(coluna)} FROM {_identificador(nome)}{where} ORDER BY 1 NULLS LAST'
+        cursor = self._cursor()
+        try:
+            return [linha[0] for linha in cursor.execute(sql, parametros).fetchall()]
+        finally:
+            cursor.close()
+
+    def consultar(self, nome, filtros=None, busca=None, colunas_busca=('descricao',), ordem=None,
+                  limite=1000, deslocamento=0, colunas_visiveis=None):
+        """Linhas de `nome` que passam em `filtros` (coluna -> valores aceitos) e na `busca` de texto.
+
+        `ordem` é uma lista de (coluna, 'ASC' | 'DESC'); devolve no máximo `limite` linhas a partir
+        de `deslocamento` (uma página), só com as `colunas_visiveis`, junto com o total de linhas e a
+        soma de `valor` de todo o resultado filtrado.
+        """
+        colunas = self.colunas(nome)
+        if colunas_visiveis is None:
+            selecao = '*'
+        else:
+            selecao = ', '.join(_identificador(c) for c in colunas_visiveis if c in colunas) or 'NULL AS _vazio'
+        colunas_busca = [c for c in colunas_busca if c in colunas]
+        where, parametros = _condicoes(filtros, busca, colunas_busca)
+        ordem = [(c, 'DESC' if d.upper() == 'DESC' else 'ASC') for c, d in (ordem or []) if c in colunas or c == 'rowid']
+        order_by = ' ORDER BY ' + ', '.join(f'{_identificador(c) if c != "rowid" else c} {d}' for c, d in ordem) if ordem else ''
+        soma = f'SUM({_identificador("valor")}) OVER ()' if 'valor' in colunas else '0'
+        sql = (
+            f'SELECT {selecao}, COUNT(*) OVER () AS _total, {soma} AS _soma FROM {_identificador(nome)}{where}'
+            f'{order_by} LIMIT {int(limite)} OFFSET {int(deslocamento)}'
+        )
+        cursor = self._cursor()
+        try:
+            resultado = cursor.execute(sql, parametros).df()
+        finally:
+            cursor.close()
+
+        if resultado.empty:
+            total, soma_total = self._totais(nome, where, parametros, 'valor' in colunas)
+        else:
+            total, soma_total = int(resultado['_total'].iloc[0]), resultado['_soma'].iloc[0]
+            soma_total = 0 if pd.isna(soma_total) else int(soma_total)
+        return ResultadoConsulta(resultado.drop(columns=['_total', '_soma', '_vazio'], errors='ignore'), total, soma_total)
+
+    def _totais(self, nome, where, parametros, tem_valor):
+        # página vazia (deslocamento além do fim): os totais vêm de uma consulta só de agregação
+        soma = f'COALESCE(SUM({_identificador("valor")}), 0)' if tem_valor else '0'
+        cursor = self._cursor()
+        try:
+            total, soma_total = cursor.execute(
+                f'SELECT COUNT(*), {soma} FROM {_identificador(nome)}{where}', parametros).fetchone()
+        finally:
+            cursor.close()
+        return int(total), int(soma_total)
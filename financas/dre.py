@@ -0,0 +1,187 @@
+import numpy as np
+import pandas as pd
+
+
+def real_vs_orcado(real, orcamento, classes, meses=None):
+    """Junta o realizado (id_mes, classificacao, valor) com o orçado das classificações `classes`.
+
+    Equivale ao merge por `id_class` (id_mes + classificacao) feito antes, mas com a chave
+    em duas colunas: a consolidação de mês e classificação sai direto do merge.
+    """
+    orcado = orcamento.loc[
+        orcamento['classificacao_orcamento'].isin(classes), ['id_mes', 'classificacao_orcamento', 'valor_orcamento']
+    ].rename(columns={'classificacao_orcamento': 'classificacao'})
+    real = real[['id_mes', 'classificacao', 'valor']]
+    if meses is not None:
+        real = real[real['id_mes'].isin(meses)]
+        orcado = orcado[orcado['id_mes'].isin(meses)]
+
+    df = real.merge(orcado, on=['id_mes', 'classificacao'], how='outer')
+    df['valor'] = pd.to_numeric(df['valor'], errors='coerce').fillna(0)
+    df['valor_orcamento'] = pd.to_numeric(df['valor_orcamento'], errors='coerce').fillna(0)
+    return df
+
+
+def _secao(df, nome, sinal=1):
+    # linhas por classificação + linha de total, sem iterar linha a linha
+    agrupado = df.groupby('classificacao', observed=True)[['valor', 'valor_orcamento']].sum() * sinal
+    linhas = pd.DataFrame({
+        'descricao': '    - ' + agrupado.index.astype(str),
+        'real': agrupado['valor'].to_numpy(dtype=float),
+        'orcado': agrupado['valor_orcamento'].to_numpy(dtype=float),
+    })
+    total = pd.DataFrame({
+        'descricao': [f'= Total {nome}'],
+        'real': [linhas['real'].sum()],
+        'orcado': [linhas['orcado'].sum()],
+    })
+    return pd.concat([linhas, total], ignore_index=True)
+
+
+def _total(df, meses, coluna='valor'):
+    return float(pd.to_numeric(df.loc[df['id_mes'].isin(meses), coluna], errors='coerce').sum())
+
+
+def montar_dre(receitas, fixos, debito, credito, orcamento, meses, classes_receita=None):
+    """Monta o DRE (real, orçado e diferença) dos meses `meses` em uma passada vetorizada.
+
+    `receitas` e `fixos` são os agrupados (id_mes, classificacao, valor), `debito` e `credito`
+    os totais mensais (id_mes, valor) e `orcamento` a planilha de orçamento. `classes_receita`
+    restringe as receitas (real e orçado) a essas classificações, como no "Apenas salário".
+    Não depende do streamlit; devolve um DataFrame com descricao, real, orcado e diferenca.
+    """
+    meses = list(meses)
+
+    # o orçado de receitas/fixos considera as classificações que já apareceram no realizado
+    receitas_df = real_vs_orcado(receitas, orcamento, receitas['classificacao'].unique(), meses)
+    if classes_receita is not None:
+        receitas_df = receitas_df[receitas_df['classificacao'].isin(classes_receita)]
+    fixos_df = real_vs_orcado(fixos, orcamento, fixos['classificacao'].unique(), meses)
+
+    orcamento_meses = orcamento[orcamento['id_mes'].isin(meses)]
+    orcado_por_classe = pd.to_numeric(orcamento_meses['valor_orcamento'], errors='coerce').groupby(
+        orcamento_meses['classificacao_orcamento'], observed=True
+    ).sum()
+
+    debito_total = _total(debito, meses)
+    credito_total = _total(credito, meses)
+    debito_orcado = float(orcado_por_classe.get('Débito', 0))
+    credito_orcado = float(orcado_por_classe.get('Crédito', 0))
+
+    sobra_real = receitas_df['valor'].sum() - (fixos_df['valor'].sum() + credito_total + debito_total)
+    sobra_orcado = float(orcado_por_classe.get('Sobra', 0))
+
+    totais = pd.DataFrame({
+        'descricao': ['= Total gastos com crédito', '= Total gastos com débito', '= Sobra Final'],
+        'real': [-credito_total, -debito_total, sobra_real],
+        'orcado': [-credito_orcado, -debito_orcado, sobra_orcado],
+    })
+
+    dre = pd.concat(
+        [_secao(receitas_df, 'de receitas'), _secao(fixos_df, 'de gastos fixos', sinal=-1), totais],
+        ignore_index=True,
+    )
+    dre['diferenca'] = dre['real'].to_numpy() - dre['orcado'].to_numpy()
+    dre['destaque'] = np.char.startswith(dre['descricao'].to_numpy(dtype=str), '=')
+    return dre
+
+
+def _celulas(df, secao, nome, sinal=1):
+    # uma linha por (classificação, mês) + o total da seção por mês
+    agrupado = df.groupby(['classificacao', 'id_mes'], observed=True).agg(
+        real=('valor', 'sum'), orcado=('valor_orcamento', 'sum'), presenca=('valor', 'size')).reset_index()
+    agrupado[['real', 'orcado']] = agrupado[['real', 'orcado']] * sinal
+    posicao, _ = pd.factorize(agrupado['classificacao'], sort=True)
+    linhas = pd.DataFrame({
+        'secao': secao,
+        'posicao': posicao,
+        'descricao': '    - ' + agrupado['classificacao'].astype(str),
+        'id_mes': agrupado['id_mes'].to_numpy(),
+        'real': agrupado['real'].to_numpy(),
+        'orcado': agrupado['orcado'].to_numpy(),
+        'presenca': agrupado['presenca'].to_numpy(),
+    })
+    total = linhas.groupby('id_mes')[['real', 'orcado']].sum().reset_index()
+    total = total.assign(secao=secao, posicao=len(posicao) and posicao.max() + 1, descricao=f'= Total {nome}', presenca=1)
+    return pd.concat([linhas, total], ignore_index=True)
+
+
+def _por_mes(df, coluna='valor'):
+    return pd.to_numeric(df[coluna], errors='coerce').groupby(df['id_mes']).sum()
+
+
+def matriz_dre(receitas, fixos, debito, credito, orcamento, classes_receita=None):
+    """DRE de todos os meses de uma vez: linha do DRE x (medida, mês), com um único pivot.
+
+    As medidas são `real`, `orcado` e `presenca` (quantas linhas do real x orçado caíram na célula;
+    diz se a linha de uma classificação aparece no DRE de um conjunto de meses). Todas as linhas
+    do DRE são somas por mês, então o DRE de qualquer conjunto de meses é a soma das colunas
+    (`dre_dos_meses`), sem recalcular nada.
+    """
+    receitas_df = real_vs_orcado(receitas, orcamento, receitas['classificacao'].unique())
+    if classes_receita is not None:
+        receitas_df = receitas_df[receitas_df['classificacao'].isin(classes_receita)]
+    fixos_df = real_vs_orcado(fixos, orcamento, fixos['classificacao'].unique())
+
+    orcado = orcamento.assign(valor_orcamento=pd.to_numeric(orcamento['valor_orcamento'], errors='coerce'))
+    orcado = orcado.pivot_table(index='id_mes', columns='classificacao_orcamento', values='valor_orcamento',
+                                aggfunc='sum', observed=True)
+    debito_mes, credito_mes = _por_mes(debito), _por_mes(credito)
+    meses = debito_mes.index.union(credito_mes.index).union(orcado.index) \
+        .union(pd.Index(receitas_df['id_mes'].unique())).union(pd.Index(fixos_df['id_mes'].unique()))
+
+    def orcado_de(classe):
+        return orcado[classe].reindex(meses, fill_value=0).fillna(0) if classe in orcado.columns else pd.Series(0, index=meses)
+
+    debito_mes, credito_mes = debito_mes.reindex(meses, fill_value=0), credito_mes.reindex(meses, fill_value=0)
+    sobra = _por_mes(receitas_df).reindex(meses, fill_value=0) - (
+        _por_mes(fixos_df).reindex(meses, fill_value=0) + credito_mes + debito_mes)
+    totais = pd.concat([
+        pd.DataFrame({'secao': 2, 'posicao': 0, 'descricao': '= Total gastos com crédito', 'id_mes': meses,
+                      'real': -credito_mes.to_numpy(), 'orcado': -orcado_de('Crédito').to_numpy()}),
+        pd.DataFrame({'secao': 2, 'posicao': 1, 'descricao': '= Total gastos com débito', 'id_mes': meses,
+                      'real': -debito_mes.to_numpy(), 'orcado': -orcado_de('Débito').to_numpy()}),
+        pd.DataFrame({'secao': 2, 'posicao': 2, 'descricao': '= Sobra Final', 'id_mes': meses,
+                      'real': sobra.to_numpy(), 'orcado': orcado_de('Sobra').to_numpy()}),
+    ]).assign(presenca=1)
+
+    celulas = pd.concat([
+        _celulas(receitas_df, 0, 'de receitas'),
+        _celulas(fixos_df, 1, 'de gastos fixos', sinal=-1),
+        totais,
+    ], ignore_index=True)
+    matriz = celulas.pivot_table(index=['secao', 'posicao', 'descricao'], columns='id_mes',
+                                 values=['real', 'orcado', 'presenca'], aggfunc='sum', fill_value=0)
+    return matriz.droplevel(['secao', 'posicao'])
+
+
+def dre_dos_meses(matriz, meses):
+    """DRE (como o `montar_dre`) dos `meses`, somando as colunas da `matriz_dre`."""
+    meses = list(meses)
+
+    def soma(medida):
+        return matriz[medida].reindex(columns=meses, fill_value=0).sum(axis=1)
+
+    destaque = matriz.index.str.startswith('=')
+    visiveis = destaque | (soma('presenca').to_numpy() > 0)
+    dre = pd.DataFrame({
+        'descricao': matriz.index[visiveis],
+        'real': soma('real').to_numpy(dtype=float)[visiveis],
+        'orcado': soma('orcado').to_numpy(dtype=float)[visiveis],
+    })
+    dre['diferenca'] = dre['real'].to_numpy() - dre['orcado'].to_numpy()
+    dre['destaque'] = destaque[visiveis]
+    return dre
+
+
+def comparativo_mensal(matriz, meses, medida='real'):
+    """Linhas do DRE x `meses` lado a lado (mais a coluna Total) para `medida`: real, orcado ou diferenca."""
+    meses = list(meses)
+    if medida == 'diferenca':
+        tabela = matriz['real'].reindex(columns=meses, fill_value=0) - matriz['orcado'].reindex(columns=meses, fill_value=0)
+    else:
+        tabela = matriz[medida].reindex(columns=meses, fill_value=0)
+    presentes = matriz.index.str.startswith('=') | (matriz['presenca'].reindex(columns=meses, fill_value=0).sum(axis=1) > 0)
+    tabela = tabela[presentes].astype(float)
+    tabela['Total'] = tabela.sum(axis=1)
+    return tabela
@@ -0,0 +1,112 @@
+import threading
+from collections import Counter
+
+import pandas as pd
+
+from financas.espelho import montar_dataframe
+from financas.esquema import reais_para_centavos
+
+
+# planilhas que recebem lançamentos pelos formulários ou pela importação
+PLANILHAS = ['debito', 'credito', 'vr', 'receita', 'fixo', 'patrimonio', 'investimento', 'emprestimo']
+
+
+def _texto(df, coluna):
+    if coluna not in df.columns:
+        return pd.Series('', index=df.index)
+    # cada valor distinto é normalizado uma vez só (id_mes e data se repetem muito)
+    codigos, distintos = pd.factorize(df[coluna].astype('string').fillna(''))
+    texto = pd.Series(distintos, dtype='object').str.strip().str.lower()
+    texto = texto.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii').str.replace(r'\s+', ' ', regex=True)
+    return pd.Series(texto.to_numpy()[codigos] if len(distintos) else [], index=df.index, dtype='object')
+
+
+def chaves(nome, df):
+    """Hash (uint64) de (planilha, id_mes, data, descricao, valor) normalizados, um por linha.
+
+    É o que faz dois lançamentos serem o mesmo; coluna que a planilha não tem conta como vazia.
+
+    Serve tanto para as linhas cruas do espelho quanto para os DataFrames dos formulários:
+    texto sem acento, minúsculo e com espaços únicos, valor em centavos.
+    """
+    if df.empty:
+        return pd.Series([], index=df.index, dtype='uint64')
+    normalizado = pd.DataFrame({
+        'planilha': nome,
+        'id_mes': _texto(df, 'id_mes'),
+        'data': _texto(df, 'data'),
+        'descricao': _texto(df, 'descricao'),
+        'valor': (reais_para_centavos(df['valor']).astype('string').fillna('') if 'valor' in df.columns
+                  else pd.Series('', index=df.index)),
+    }, index=df.index)
+    return pd.util.hash_pandas_object(normalizado, index=False)
+
+
+def _contar(contagem, hashes):
+    for chave, quantidade in hashes.value_counts().items():
+        contagem[chave] += quantidade
+
+
+class IndiceDuplicatas:
+    """Contagem, por planilha, de quantos lançamentos existem com cada chave (`chaves`).
+
+    Entram as linhas gravadas no espelho (atualizadas pelo ouvinte a cada gravação, refeitas numa
+    sincronização completa) e as que ainda estão na fila de escrita (contadas de novo só quando a
+    fila daquela planilha muda). Conferir um lote custa um hash e uma busca em dicionário por linha.
+    """
+
+    def __init__(self, armazenamento, planilhas=PLANILHAS):
+        self.armazenamento = armazenamento
+        self.planilhas = list(planilhas)
+        self._gravadas = {nome: Counter() for nome in self.planilhas}
+        # planilha -> (versão da fila, contagem das linhas pendentes)
+        self._pendentes = {}
+        self._trava = threading.Lock()
+        espelho = armazenamento.espelho
+        with espelho.conectar() as con:
+            for nome in self.planilhas:
+                cabecalho, linhas = espelho.linhas(nome, con)
+                self._ao_gravar(con, nome, cabecalho, linhas, completa=True)
+        espelho.ouvintes.append(self._ao_gravar)
+
+    def _ao_gravar(self, con, nome, cabecalho, linhas, completa):
+        if nome not in self.planilhas:
+            return
+        hashes = chaves(nome, montar_dataframe(cabecalho, linhas)) if linhas else None
+        with self._trava:
+            if completa:
+                self._gravadas[nome].clear()
+            if hashes is not None:
+                _contar(self._gravadas[nome], hashes)
+
+    def _contagem_pendentes(self, nome):
+        versao = self.armazenamento.versao_pendente(nome)
+        if not versao or not versao[0]:
+            return Counter()
+        guardada = self._pendentes.get(nome)
+        if guardada is None or guardada[0] != versao:
+            contagem = Counter()
+            _contar(contagem, chaves(nome, self.armazenamento.pendentes(nome)))
+            guardada = self._pendentes[nome] = (versao, contagem)
+        return guardada[1]
+
+    def duplicadas(self, nome, df):
+        """Série booleana: True nas linhas de `df` que já existem em `nome` (gravadas ou na fila).
+
+        Lançamentos iguais de verdade (dois cafés no mesmo dia) não somem: no lote, a n-ésima
+        ocorrência de uma chave só é duplicada se a planilha já tem ao menos n linhas com ela.
+        """
+        if nome not in self.planilhas or df.empty:
+            return pd.Series(False, index=df.index)
+        # sem cópia local de `nome` o índice estaria vazio e nada seria repetido: a sincronização entra
+        # nele pelo ouvinte
+        self.armazenamento.versao_gravada(nome)
+        hashes = chaves(nome, df)
+        with self._trava:
+            # busca direta no Counter: uma gravação só soma as chaves das linhas novas, sem refazer nada
+            existentes = hashes.map(self._gravadas[nome].get).fillna(0).to_numpy(dtype='int64')
+            pendentes = self._contagem_pendentes(nome)
+        if pendentes:
+            existentes = existentes + hashes.map(pendentes.get).fillna(0).to_numpy(dtype='int64')
+        ocorrencia = hashes.groupby(hashes).cumcount() + 1
+        return ocorrencia <= existentes
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from financas.instrumentacao import contar_chamada
+
+
+def _para_celula(valor):
+    # o gspread serializa a requisição em json, então tipos do numpy/pandas viram tipos do python
+    if pd.isna(valor):
+        return ''
+    if hasattr(valor, 'item'):
+        return valor.item()
+    return valor
+
+
+def linhas_para_valores(novas_linhas, colunas=None):
+    """Converte o DataFrame de linhas novas em lista de listas na ordem das colunas da planilha."""
+    if colunas is not None and len(colunas):
+        colunas = list(colunas)
+        # colunas que só existem nas linhas novas vão para o fim, como faria o pd.concat
+        colunas += [c for c in novas_linhas.columns if c not in colunas]
+        novas_linhas = novas_linhas.reindex(columns=colunas)
+    return [[_para_celula(v) for v in linha] for linha in novas_linhas.itertuples(index=False)]
+
+
+def acrescentar_valores(worksheet, valores):
+    """Uma chamada de append com as linhas `valores` (listas já na ordem das colunas)."""
+    worksheet.append_rows(
+        valores,
+        value_input_option='USER_ENTERED',
+        insert_data_option='INSERT_ROWS',
+        table_range='A1',
+    )
+    contar_chamada('append_rows', valores)
@@ -0,0 +1,376 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from financas.inicio import importar
+from financas.instrumentacao import contar_chamada
+
+
+logger = logging.getLogger(__name__)
+
+
+# mesmas opções de leitura usadas pelo conn.read (gspread_dataframe.get_as_dataframe)
+PARAMETROS_LEITURA = {
+    'valueRenderOption': 'UNFORMATTED_VALUE',
+    'dateTimeRenderOption': 'FORMATTED_STRING',
+}
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sincronizacao (
+    nome TEXT PRIMARY KEY,
+    cabecalho TEXT NOT NULL,
+    linhas INTEGER NOT NULL,
+    sincronizado_em REAL NOT NULL,
+    completa_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS linhas (
+    nome TEXT NOT NULL,
+    linha INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    valores TEXT NOT NULL,
+    ano INTEGER,
+    ano_final INTEGER,
+    PRIMARY KEY (nome, linha)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS linhas_por_ano ON linhas (nome, ano);
+"""
+
+
+def _hash_linha(linha):
+    return hashlib.sha1(json.dumps(linha, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _inteiro(valor):
+    try:
+        return int(float(valor))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def anos_das_linhas(cabecalho, linhas):
+    """Partição (ano) de cada linha: a coluna `ano` ou, sem ela, o ano do `id_mes` ('01_2025')."""
+    posicao_ano = cabecalho.index('ano') if 'ano' in cabecalho else None
+    posicao_mes = cabecalho.index('id_mes') if 'id_mes' in cabecalho else None
+    anos = []
+    for linha in linhas:
+        ano = _inteiro(linha[posicao_ano]) if posicao_ano is not None else None
+        if ano is None and posicao_mes is not None:
+            ano = _inteiro(str(linha[posicao_mes]).strip()[3:7])
+        anos.append(ano)
+    return anos
+
+
+def anos_finais_das_linhas(cabecalho, linhas, anos):
+    """Último ano das linhas que valem por vários meses (coluna `parcelas`) e passam de `anos`.
+
+    Uma compra parcelada é uma linha só, na partição do ano da primeira parcela; o ano da última
+    parcela (None quando é o mesmo) deixa a leitura de um ano achar as compras começadas antes.
+    """
+    if 'parcelas' not in cabecalho or 'id_mes' not in cabecalho:
+        return [None] * len(linhas)
+    posicao_parcelas, posicao_mes = cabecalho.index('parcelas'), cabecalho.index('id_mes')
+    finais = []
+    for linha, ano in zip(linhas, anos):
+        parcelas = _inteiro(linha[posicao_parcelas]) or 1
+        mes = _inteiro(str(linha[posicao_mes]).strip()[:2])
+        final = ano + (mes - 1 + parcelas - 1) // 12 if ano is not None and mes is not None else None
+        finais.append(final if final is not None and final > ano else None)
+    return finais
+
+
+def linhas_dos_anos(cabecalho, linhas, anos):
+    """As `linhas` que têm algum mês em `anos` (as parceladas contam em todos os anos que cobrem)."""
+    anos = {int(ano) for ano in anos}
+    iniciais = anos_das_linhas(cabecalho, linhas)
+    finais = anos_finais_das_linhas(cabecalho, linhas, iniciais)
+    return [
+        linha for linha, inicial, final in zip(linhas, iniciais, finais)
+        if inicial in anos or (final is not None and any(inicial < ano <= final for ano in anos))
+    ]
+
+
+def _normalizar(linhas, tamanho):
+    # a API não devolve células vazias no fim da linha: completa para ficar retangular
+    return [list(linha[:tamanho]) + [''] * (tamanho - len(linha)) for linha in linhas]
+
+
+def montar_dataframe(cabecalho, linhas):
+    """Monta o DataFrame como o conn.read faria a partir dos valores crus da planilha."""
+    if not cabecalho:
+        return pd.DataFrame()
+    df = TextParser([cabecalho] + linhas, header=0).read()
+    df = df.dropna(how='all', axis=0)
+    sem_nome = [c for c in df.columns if str(c).startswith('Unnamed:') and df[c].isna().all()]
+    return df.drop(columns=sem_nome)
+
+
+class Espelho:
+    """Cópia local (SQLite) das planilhas, sincronizada de forma incremental.
+
+    Cada linha guarda os valores crus e um hash. A sincronização busca só as linhas depois
+    da última sincronizada, mais uma janela das últimas `janela` linhas para conferir os hashes;
+    se a janela ou o cabeçalho mudaram (edição ou exclusão), a planilha é baixada de novo inteira.
+    Edições mais antigas que a janela são pegas na sincronização completa feita a cada
+    `intervalo_completa` segundos.
+    Se o Sheets estiver fora do ar, a leitura continua a partir da cópia local.
+
+    As linhas ficam particionadas por `ano` (índice (nome, ano)), então a leitura de alguns anos
+    não passa pelas linhas dos outros, por maior que fique o histórico.
+    """
+
+    def __init__(self, caminho, abrir_planilha, intervalo=300, janela=50, intervalo_completa=24 * 3600):
+        self.caminho = caminho
+        # função nome -> gspread.Worksheet (None quando a cópia local é a própria fonte dos dados)
+        self.abrir_planilha = abrir_planilha
+        self.intervalo = intervalo
+        self.janela = janela
+        self.intervalo_completa = intervalo_completa
+        self._travas = {}
+        self._trava_travas = threading.Lock()
+        self._em_segundo_plano = set()
+        # funções (con, nome, cabecalho, linhas, completa) chamadas na mesma transação de cada gravação
+        self.ouvintes = []
+
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self.conectar() as con:
+            colunas = [coluna for _, coluna, *_ in con.execute('PRAGMA table_info(linhas)')]
+            sem_ano = bool(colunas) and 'ano' not in colunas
+            sem_ano_final = bool(colunas) and 'ano_final' not in colunas
+            if sem_ano:
+                # cópia de antes das partições por ano
+                con.execute('ALTER TABLE linhas ADD COLUMN ano INTEGER')
+            if sem_ano_final:
+                # cópia de antes das compras parceladas em uma linha só
+                con.execute('ALTER TABLE linhas ADD COLUMN ano_final INTEGER')
+            con.executescript(ESQUEMA)
+            if sem_ano or sem_ano_final:
+                self._preencher_anos(con)
+
+    @contextmanager
+    def conectar(self):
+        con = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            con.execute('PRAGMA journal_mode=WAL')
+            con.execute('PRAGMA synchronous=NORMAL')
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def _preencher_anos(self, con):
+        for (nome,) in con.execute('SELECT nome FROM sincronizacao').fetchall():
+            cabecalho, linhas = self.linhas(nome, con)
+            numeros = [n for (n,) in con.execute('SELECT linha FROM linhas WHERE nome = ? ORDER BY linha', (nome,))]
+            anos = anos_das_linhas(cabecalho, linhas)
+            con.executemany(
+                'UPDATE linhas SET ano = ?, ano_final = ? WHERE nome = ? AND linha = ?',
+                [(ano, final, nome, numero)
+                 for ano, final, numero in zip(anos, anos_finais_das_linhas(cabecalho, linhas, anos), numeros)],
+            )
+
+    def trava(self, nome):
+        """Trava de `nome`: enquanto ela está tomada, nenhuma sincronização de `nome` roda."""
+        with self._trava_travas:
+            return self._travas.setdefault(nome, threading.Lock())
+
+    def estado(self, nome):
+        """Devolve (cabecalho, linhas, sincronizado_em, completa_em) da última sincronização ou None."""
+        with self.conectar() as con:
+            registro = con.execute(
+                'SELECT cabecalho, linhas, sincronizado_em, completa_em FROM sincronizacao WHERE nome = ?',
+                (nome,),
+            ).fetchone()
+        if registro is None:
+            return None
+        return json.loads(registro[0]), registro[1], registro[2], registro[3]
+
+    def linhas(self, nome, con=None, anos=None):
+        """Devolve (cabecalho, linhas) com os valores crus guardados na cópia local.
+
+        Com `anos`, só as linhas dessas partições, na mesma ordem da planilha, mais as parceladas
+        de anos anteriores que ainda têm parcelas neles.
+        """
+        if con is None:
+            with self.conectar() as con:
+                return self.linhas(nome, con, anos)
+        registro = con.execute('SELECT cabecalho FROM sincronizacao WHERE nome = ?', (nome,)).fetchone()
+        if anos is None:
+            valores = con.execute('SELECT valores FROM linhas WHERE nome = ? ORDER BY linha', (nome,)).fetchall()
+        else:
+            anos = sorted({int(ano) for ano in anos})
+            # parcelada entra se tiver parcela em algum dos anos escolhidos (que podem não ser seguidos,
+            # como 2022 e 2024): a conferência é feita ano a ano, não com o intervalo entre o menor e o maior
+            parceladas = ' OR '.join(['(ano < ? AND ano_final >= ?)'] * len(anos)) or '0'
+            valores = con.execute(
+                'SELECT valores FROM linhas WHERE nome = ? AND (ano IN ({}) '
+                'OR (ano_final IS NOT NULL AND ({}))) ORDER BY linha'.format(','.join('?' * len(anos)), parceladas),
+                [nome] + anos + [valor for ano in anos for valor in (ano, ano)],
+            ).fetchall()
+        cabecalho = json.loads(registro[0]) if registro else []
+        return cabecalho, [json.loads(v) for (v,) in valores]
+
+    def conferir(self, nome):
+        """Garante que existe cópia de `nome` e devolve a versão dela.
+
+        Sem cópia, sincroniza na hora; com a cópia vencida, dispara a sincronização em segundo
+        plano e devolve a versão atual. A versão (linhas, última sincronização completa) só
+        muda quando entram linhas novas ou a planilha é baixada de novo.
+        """
+        estado = self.estado(nome)
+        if self.abrir_planilha is None:
+            # cópia local sem planilha remota (armazenamento sqlite): não há o que sincronizar
+            return (estado[1], estado[3]) if estado else (0, 0)
+        if estado is None:
+            self.sincronizar(nome)
+            estado = self.estado(nome)
+        elif time.time() - estado[2] > self.intervalo:
+            self.sincronizar_em_segundo_plano(nome)
+        return estado[1], estado[3]
+
+    def cabecalho(self, nome):
+        estado = self.estado(nome)
+        return estado[0] if estado else []
+
+    def anos(self, nome):
+        """Anos com linhas na cópia de `nome`, em ordem (inclusive os só com parcelas de compras anteriores)."""
+        self.conferir(nome)
+        with self.conectar() as con:
+            anos = {ano for (ano,) in con.execute(
+                'SELECT DISTINCT ano FROM linhas WHERE nome = ? AND ano IS NOT NULL', (nome,))}
+            for inicial, final in con.execute(
+                    'SELECT DISTINCT ano, ano_final FROM linhas WHERE nome = ? AND ano_final IS NOT NULL', (nome,)):
+                anos.update(range(inicial, final + 1))
+        return sorted(anos)
+
+    def ler(self, nome, anos=None):
+        """Lê a planilha da cópia local, sincronizando antes se ainda não houver cópia.
+
+        Com `anos`, lê só as partições desses anos.
+        """
+        self.conferir(nome)
+        return montar_dataframe(*self.linhas(nome, anos=anos))
+
+    def sincronizar_em_segundo_plano(self, nome):
+        with self._trava_travas:
+            if nome in self._em_segundo_plano:
+                return
+            self._em_segundo_plano.add(nome)
+
+        def _sincronizar():
+            try:
+                self.sincronizar(nome)
+            except Exception:
+                logger.warning('falha ao sincronizar %s, usando a cópia local', nome, exc_info=True)
+            finally:
+                with self._trava_travas:
+                    self._em_segundo_plano.discard(nome)
+
+        threading.Thread(target=_sincronizar, name=f'espelho-{nome}', daemon=True).start()
+
+    def sincronizar(self, nome, completa=False):
+        """Traz para a cópia local as linhas novas ou alteradas da planilha `nome`.
+
+        Devolve um dicionário com o tipo de sincronização e a quantidade de linhas baixadas.
+        """
+        with self.trava(nome):
+            inicio = time.perf_counter()
+            estado = self.estado(nome)
+            worksheet = self.abrir_planilha(nome)
+
+            if estado is None or completa or time.time() - estado[3] > self.intervalo_completa:
+                resultado = self._sincronizar_completa(nome, worksheet)
+            else:
+                resultado = self._sincronizar_incremental(nome, worksheet, estado[0], estado[1])
+
+            resultado['tempo'] = time.perf_counter() - inicio
+            logger.info('sincronização %s: %s', nome, resultado)
+            return resultado
+
+    def _buscar(self, worksheet, intervalos):
+        absolute_range_name = importar('gspread.utils').absolute_range_name
+        intervalos = [absolute_range_name(worksheet.title, intervalo) for intervalo in intervalos]
+        resposta = worksheet.spreadsheet.values_batch_get(intervalos, params=PARAMETROS_LEITURA)
+        contar_chamada('values_batch_get', resposta)
+        return [faixa.get('values', []) for faixa in resposta.get('valueRanges', [])]
+
+    def _sincronizar_completa(self, nome, worksheet):
+        (valores,) = self._buscar(worksheet, [f'1:{worksheet.row_count}'])
+        cabecalho = list(valores[0]) if valores else []
+        linhas = _normalizar(valores[1:], len(cabecalho))
+        self.substituir(nome, cabecalho, linhas)
+        return {'tipo': 'completa', 'linhas_baixadas': len(linhas)}
+
+    def _sincronizar_incremental(self, nome, worksheet, cabecalho, total):
+        # linha de dados 1 é a linha 2 da planilha (a 1 é o cabeçalho)
+        inicio_janela = max(1, total - self.janela + 1)
+        valores_cabecalho, valores = self._buscar(
+            worksheet, ['1:1', f'{inicio_janela + 1}:{max(worksheet.row_count, inicio_janela + 1)}']
+        )
+        cabecalho_atual = list(valores_cabecalho[0]) if valores_cabecalho else []
+        if cabecalho_atual != cabecalho:
+            return self._sincronizar_completa(nome, worksheet)
+
+        linhas = _normalizar(valores, len(cabecalho))
+        conferidas = total - inicio_janela + 1
+        if len(linhas) < conferidas:
+            # linhas foram apagadas
+            return self._sincronizar_completa(nome, worksheet)
+
+        with self.conectar() as con:
+            hashes = [h for (h,) in con.execute(
+                'SELECT hash FROM linhas WHERE nome = ? AND linha >= ? ORDER BY linha', (nome, inicio_janela)
+            )]
+        if hashes != [_hash_linha(linha) for linha in linhas[:conferidas]]:
+            return self._sincronizar_completa(nome, worksheet)
+
+        novas = linhas[conferidas:]
+        with self.conectar() as con:
+            self._gravar(con, nome, cabecalho, novas, primeira_linha=total + 1)
+        return {'tipo': 'incremental', 'linhas_baixadas': len(linhas), 'linhas_novas': len(novas)}
+
+    def substituir(self, nome, cabecalho, linhas):
+        """Troca todo o conteúdo guardado de `nome` (os agregados são reconstruídos)."""
+        linhas = _normalizar(linhas, len(cabecalho))
+        with self.conectar() as con:
+            con.execute('DELETE FROM linhas WHERE nome = ?', (nome,))
+            self._gravar(con, nome, cabecalho, linhas, primeira_linha=1, completa=True)
+
+    def acrescentar(self, nome, cabecalho, linhas):
+        """Grava `linhas` depois da última linha guardada de `nome`, na mesma transação dos ouvintes."""
+        linhas = _normalizar(linhas, len(cabecalho))
+        with self.conectar() as con:
+            total = con.execute('SELECT COUNT(*) FROM linhas WHERE nome = ?', (nome,)).fetchone()[0]
+            self._gravar(con, nome, cabecalho, linhas, primeira_linha=total + 1, completa=not total)
+
+    def _gravar(self, con, nome, cabecalho, linhas, primeira_linha, completa=False):
+        anos = anos_das_linhas(cabecalho, linhas)
+        con.executemany(
+            'INSERT OR REPLACE INTO linhas (nome, linha, hash, valores, ano, ano_final) VALUES (?, ?, ?, ?, ?, ?)',
+            [
+                (nome, primeira_linha + i, _hash_linha(linha), json.dumps(linha, ensure_ascii=False), ano, final)
+                for i, (linha, ano, final) in enumerate(
+                    zip(linhas, anos, anos_finais_das_linhas(cabecalho, linhas, anos)))
+            ],
+        )
+        total = con.execute('SELECT COUNT(*) FROM linhas WHERE nome = ?', (nome,)).fetchone()[0]
+        agora = time.time()
+        completa_em = agora if completa else con.execute(
+            'SELECT completa_em FROM sincronizacao WHERE nome = ?', (nome,)
+        ).fetchone()[0]
+        con.execute(
+            'INSERT OR REPLACE INTO sincronizacao (nome, cabecalho, linhas, sincronizado_em, completa_em) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (nome, json.dumps(cabecalho, ensure_ascii=False), total, agora, completa_em),
+        )
+        for ouvinte in self.ouvintes:
+            ouvinte(con, nome, cabecalho, linhas, completa)
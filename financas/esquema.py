@@ -0,0 +1,144 @@
+import pandas as pd
+
+
+# opções dos formulários: classificações de cada planilha e cartões da coluna credito_cartao (usadas
+# também pela importação de extratos e pelos dados sintéticos)
+CLASSIFICACOES = {
+    'debito': ['Necessidade', 'Lazer - Corinthians', 'Lazer - Outros', 'Lazer - Comida', 'Comida',
+               'Aplicativo de Transporte', 'Outros'],
+    'credito': ['Juros/Anuidade', 'Presente Pitica', 'Presentes - Família', 'Lazer', 'Roupas', 'Compras Minhas', 'Outros'],
+    'receita': ['Salário', 'Bônus', '13º', 'Adiantamento Férias', '1/3 Férias', 'Cartola', 'Apostas',
+                'Investimentos', 'Outros'],
+    'fixo': ['Casa', 'Fiel Torcedor', 'Cabelo', 'Internet - Celular', 'Academia', 'Passagem',
+             'Seguro - Celular', 'Streaming'],
+    'vr': ['Almoço no escritório', 'Saídas', 'Saídas - Pitica', 'Rua', 'Casa', 'Outros'],
+    'patrimonio': ['Saldo do mês', '13º', 'Renda extra', '1/3 Férias', 'Bônus', 'Emergência', 'Outros'],
+}
+CARTOES = ['Inter', 'Nubank', 'C6', 'Renner']
+
+# colunas de texto com poucos valores distintos, guardadas como categoria
+CATEGORIAS = {
+    'debito': ['classificacao', 'debito_compra_credito'],
+    'credito': ['classificacao', 'credito_cartao'],
+    'receita': ['classificacao'],
+    'fixo': ['classificacao', 'fixo_compra_credito'],
+    'investimento': ['investimento_tipo'],
+    'emprestimo': ['emprestimo_destinatario'],
+    'vr': ['classificacao'],
+    'patrimonio': ['direcionamento', 'classificacao'],
+    'orcamento': ['classificacao_orcamento'],
+}
+
+# colunas em reais guardadas como centavos inteiros
+VALORES = {
+    'orcamento': ['valor_orcamento'],
+}
+VALORES_PADRAO = ['valor']
+
+
+def id_mes_para_periodo(serie):
+    """'01_2025' -> 202501. Inteiro que ordena cronologicamente e serve de chave nos merges."""
+    texto = serie.astype('string').str.strip()
+    mes = pd.to_numeric(texto.str.slice(0, 2), errors='coerce')
+    ano = pd.to_numeric(texto.str.slice(3, 7), errors='coerce')
+    return (ano * 100 + mes).astype('Int64')
+
+
+def formatar_id_mes(periodo):
+    """202501 -> '01_2025' (para rótulos e format_func dos filtros)."""
+    if pd.isna(periodo):
+        return ''
+    periodo = int(periodo)
+    return f'{periodo % 100:02d}_{periodo // 100}'
+
+
+def id_mes_texto(serie):
+    """Versão vetorizada do `formatar_id_mes`."""
+    periodo = serie.astype('Int64')
+    texto = (periodo % 100).astype('string').str.zfill(2) + '_' + (periodo // 100).astype('string')
+    return texto.astype(object).where(periodo.notna(), None)
+
+
+def mes_corrido(periodo):
+    """aaaamm -> meses desde o ano zero, para somar meses com aritmética inteira (aceita arrays)."""
+    return (periodo // 100) * 12 + periodo % 100 - 1
+
+
+def periodo_do_mes_corrido(mes):
+    """Inverso de `mes_corrido`."""
+    return (mes // 12) * 100 + mes % 12 + 1
+
+
+def meses_do_ano(ano):
+    """['01_2025', ..., '12_2025']: os meses referência de `ano` oferecidos nos formulários."""
+    return [f'{mes:02d}_{ano}' for mes in range(1, 13)]
+
+
+def ano_do_id_mes(id_mes):
+    """'01_2025' -> 2025 (a coluna `ano` das linhas novas sai do mês referência)."""
+    return int(str(id_mes).strip()[3:7])
+
+
+def reais_para_centavos(serie):
+    return (pd.to_numeric(serie, errors='coerce') * 100).round().astype('Int64')
+
+
+def centavos_para_reais(serie):
+    return serie.astype('Float64').astype(float) / 100
+
+
+def colunas_de_valor(nome):
+    return VALORES.get(nome, VALORES_PADRAO)
+
+
+def aplicar_esquema(nome, df):
+    """Tipa a planilha `nome` uma única vez, na carga.
+
+    `id_mes` vira período inteiro (aaaamm), `ano` inteiro, os valores viram centavos
+    (Int64) e as colunas de `CATEGORIAS` viram categoria.
+    """
+    df = df.copy()
+    if 'id_mes' in df.columns:
+        df['id_mes'] = id_mes_para_periodo(df['id_mes'])
+    if 'ano' in df.columns:
+        df['ano'] = pd.to_numeric(df['ano'], errors='coerce').round().astype('Int64')
+    for coluna in colunas_de_valor(nome):
+        if coluna in df.columns:
+            df[coluna] = reais_para_centavos(df[coluna])
+    for coluna in CATEGORIAS.get(nome, []):
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype('category')
+    return df
+
+
+def juntar(nome, *dfs):
+    """Concatena partes já tipadas de `nome`, mantendo as colunas de `CATEGORIAS` como categoria."""
+    partes = [df for df in dfs if not df.empty]
+    if len(partes) < 2:
+        return partes[0] if partes else dfs[0]
+    df = pd.concat(partes, ignore_index=True)
+    for coluna in CATEGORIAS.get(nome, []):
+        if coluna in df.columns:
+            df[coluna] = df[coluna].astype('category')
+    return df
+
+
+def para_exibicao(nome, df):
+    """Volta `id_mes` para o texto '01_2025' e os centavos para reais, só para mostrar na tela."""
+    df = df.copy()
+    if 'id_mes' in df.columns:
+        df['id_mes'] = id_mes_texto(df['id_mes'])
+    for coluna in colunas_de_valor(nome):
+        if coluna in df.columns:
+            df[coluna] = centavos_para_reais(df[coluna])
+    return df
+
+
+def unificar_categorias(*series):
+    """Converte as séries para a mesma categoria, para o merge usar os códigos inteiros."""
+    categorias = pd.Index([])
+    for serie in series:
+        valores = serie.cat.categories if isinstance(serie.dtype, pd.CategoricalDtype) else serie.dropna().unique()
+        categorias = categorias.union(pd.Index(valores).astype(object))
+    tipo = pd.CategoricalDtype(categorias)
+    return [serie.astype(object).astype(tipo) for serie in series]
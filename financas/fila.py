@@ -0,0 +1,263 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from financas.espelho import linhas_dos_anos, montar_dataframe
+
+
+logger = logging.getLogger(__name__)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS fila_escrita (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome TEXT NOT NULL,
+    colunas TEXT NOT NULL,
+    valores TEXT NOT NULL,
+    criado_em REAL NOT NULL,
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    proxima_em REAL NOT NULL DEFAULT 0,
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS fila_por_planilha ON fila_escrita (estado, nome, id);
+"""
+
+
+def _status_http(erro):
+    resposta = getattr(erro, 'response', None)
+    return getattr(resposta, 'status_code', None)
+
+
+def _temporario(erro):
+    # sem status http é falha de rede (timeout, conexão caída): vale tentar de novo, como 429 e 5xx
+    status = _status_http(erro)
+    return status is None or status == 429 or status >= 500
+
+
+class LimiteTaxa:
+    """No máximo `por_minuto` chamadas em qualquer janela de `janela` segundos."""
+
+    def __init__(self, por_minuto, janela=60.0):
+        self.por_minuto = por_minuto
+        self.janela = janela
+        self._chamadas = deque()
+        self._trava = threading.Lock()
+
+    def aguardar(self):
+        """Bloqueia até a próxima chamada caber na cota e a registra."""
+        with self._trava:
+            agora = time.monotonic()
+            while self._chamadas and agora - self._chamadas[0] >= self.janela:
+                self._chamadas.popleft()
+            if len(self._chamadas) >= self.por_minuto:
+                time.sleep(self.janela - (agora - self._chamadas[0]))
+                self._chamadas.popleft()
+            self._chamadas.append(time.monotonic())
+
+
+class FilaEscrita:
+    """Fila durável das linhas a acrescentar nas planilhas, guardada no sqlite do espelho.
+
+    `enfileirar` só grava a linha localmente e volta na hora; uma thread envia as linhas pendentes
+    de cada planilha em lotes (uma chamada `enviar(nome, colunas, valores)` por lote), respeitando
+    `por_minuto` chamadas por minuto. Falhas temporárias (429, 5xx, rede) voltam para a fila com
+    espera exponencial; um 429 pausa os envios de todas as planilhas, já que a cota é da conta.
+    Depois de `tentativas_maximas`, ou em erro que não se resolve sozinho (permissão, planilha
+    inexistente), a linha fica como 'falhou' até ser reenviada ou descartada.
+    As linhas continuam na fila se o processo cair e são enviadas quando ele voltar.
+
+    Para as leituras enxergarem as próprias escritas, `pendentes` devolve as linhas ainda não
+    gravadas no espelho. Uma linha enviada fica como 'enviado' até a sincronização seguinte, que
+    a apaga da fila na mesma transação em que a grava no espelho: ela nunca some nem aparece em dobro.
+    """
+
+    def __init__(self, espelho, enviar, depois_de_enviar=None, lote=500, por_minuto=50,
+                 tentativas_maximas=8, espera_base=2.0, espera_maxima=300.0, iniciar=True):
+        self.espelho = espelho
+        self.enviar = enviar
+        # chamada com o nome da planilha depois de cada lote enviado (sincronizar o espelho)
+        self.depois_de_enviar = depois_de_enviar
+        self.lote = lote
+        self.limite = LimiteTaxa(por_minuto)
+        self.tentativas_maximas = tentativas_maximas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self._pausa_ate = 0.0
+        self._acordar = threading.Event()
+        self._trava = threading.Lock()
+        with espelho.conectar() as con:
+            con.executescript(ESQUEMA)
+        espelho.ouvintes.append(self._ao_gravar)
+        if iniciar:
+            threading.Thread(target=self._trabalhar, name='fila-escrita', daemon=True).start()
+
+    def enfileirar(self, nome, colunas, valores):
+        """Guarda as linhas `valores` (na ordem de `colunas`) para envio e acorda a thread."""
+        agora = time.time()
+        with self.espelho.conectar() as con:
+            con.executemany(
+                'INSERT INTO fila_escrita (nome, colunas, valores, criado_em) VALUES (?, ?, ?, ?)',
+                [(nome, json.dumps(list(colunas), ensure_ascii=False), json.dumps(linha, ensure_ascii=False), agora)
+                 for linha in valores],
+            )
+        self._acordar.set()
+
+    def versao(self, nome):
+        """Muda sempre que entram ou saem linhas ainda não gravadas de `nome`."""
+        with self.espelho.conectar() as con:
+            return tuple(con.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM fila_escrita WHERE nome = ? AND estado != 'falhou'",
+                (nome,),
+            ).fetchone())
+
+    def pendentes(self, nome, anos=None):
+        """DataFrame cru (como `Espelho.ler`) das linhas de `nome` que ainda não estão no espelho."""
+        with self.espelho.conectar() as con:
+            registros = con.execute(
+                "SELECT colunas, valores FROM fila_escrita WHERE nome = ? AND estado != 'falhou' ORDER BY id", (nome,)
+            ).fetchall()
+        partes, inicio = [], 0
+        # um DataFrame por sequência de linhas com as mesmas colunas
+        for i in range(1, len(registros) + 1):
+            if i == len(registros) or registros[i][0] != registros[inicio][0]:
+                colunas = json.loads(registros[inicio][0])
+                linhas = [json.loads(valores) for _, valores in registros[inicio:i]]
+                if anos is not None:
+                    linhas = linhas_dos_anos(colunas, linhas, anos)
+                if linhas:
+                    partes.append(montar_dataframe(colunas, linhas))
+                inicio = i
+        return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+    def _ao_gravar(self, con, nome, cabecalho, linhas, completa):
+        # a sincronização que trouxe as linhas enviadas para o espelho tira elas da fila
+        con.execute("DELETE FROM fila_escrita WHERE nome = ? AND estado = 'enviado'", (nome,))
+
+    def situacao(self):
+        """planilha -> {'pendente': n, 'falhou': n} ('pendente' inclui as enviadas à espera da sincronização)."""
+        with self.espelho.conectar() as con:
+            contagens = con.execute('SELECT nome, estado, COUNT(*) FROM fila_escrita GROUP BY nome, estado').fetchall()
+        situacao = {}
+        for nome, estado, quantidade in contagens:
+            estado = 'falhou' if estado == 'falhou' else 'pendente'
+            situacao.setdefault(nome, {'pendente': 0, 'falhou': 0})[estado] += quantidade
+        return situacao
+
+    def falhas(self):
+        """Linhas que desistiram de ser enviadas, com o último erro."""
+        with self.espelho.conectar() as con:
+            registros = con.execute(
+                "SELECT id, nome, colunas, valores, criado_em, tentativas, erro FROM fila_escrita "
+                "WHERE estado = 'falhou' ORDER BY id"
+            ).fetchall()
+        return pd.DataFrame(
+            [
+                (id_, nome, json.dumps(dict(zip(json.loads(colunas), json.loads(valores))), ensure_ascii=False),
+                 pd.Timestamp(criado_em, unit='s'), tentativas, erro)
+                for id_, nome, colunas, valores, criado_em, tentativas, erro in registros
+            ],
+            columns=['id', 'planilha', 'linha', 'criado_em', 'tentativas', 'erro'],
+        )
+
+    def reenviar(self, ids=None):
+        """Volta as linhas que falharam (todas ou só `ids`) para a fila."""
+        self._nas_falhas("UPDATE fila_escrita SET estado = 'pendente', tentativas = 0, proxima_em = 0", ids)
+        self._acordar.set()
+
+    def descartar(self, ids=None):
+        self._nas_falhas('DELETE FROM fila_escrita', ids)
+
+    def _nas_falhas(self, comando, ids):
+        sql, parametros = f"{comando} WHERE estado = 'falhou'", []
+        if ids is not None:
+            ids = [int(i) for i in ids]
+            sql += ' AND id IN ({})'.format(','.join('?' * len(ids)))
+            parametros = ids
+        with self.espelho.conectar() as con:
+            con.execute(sql, parametros)
+
+    def _trabalhar(self):
+        while True:
+            self._acordar.wait(timeout=self._espera())
+            self._acordar.clear()
+            try:
+                self.processar()
+            except Exception:
+                logger.exception('falha ao processar a fila de escrita')
+
+    def _espera(self):
+        with self.espelho.conectar() as con:
+            (proxima,) = con.execute("SELECT MIN(proxima_em) FROM fila_escrita WHERE estado = 'pendente'").fetchone()
+        if proxima is None:
+            return None
+        return min(max(max(proxima, self._pausa_ate) - time.time(), 0.05), self.espera_maxima)
+
+    def processar(self):
+        """Envia os lotes pendentes que já podem sair; devolve quantas linhas foram enviadas."""
+        with self._trava:
+            with self.espelho.conectar() as con:
+                nomes = [nome for (nome,) in con.execute(
+                    "SELECT DISTINCT nome FROM fila_escrita WHERE estado = 'pendente' ORDER BY nome")]
+            return sum(self._esvaziar(nome) for nome in nomes)
+
+    def _proximo_lote(self, nome):
+        with self.espelho.conectar() as con:
+            registros = con.execute(
+                "SELECT id, colunas, valores, tentativas, proxima_em FROM fila_escrita "
+                "WHERE nome = ? AND estado = 'pendente' ORDER BY id LIMIT ?",
+                (nome, self.lote),
+            ).fetchall()
+        # as linhas saem na ordem em que entraram: um lote só tem as da frente, com as mesmas colunas
+        for i, registro in enumerate(registros):
+            if registro[1] != registros[0][1]:
+                return registros[:i]
+        return registros
+
+    def _esvaziar(self, nome):
+        enviadas = 0
+        while True:
+            lote = self._proximo_lote(nome)
+            if not lote or max(lote[0][4], self._pausa_ate) > time.time():
+                return enviadas
+            ids = [registro[0] for registro in lote]
+            self.limite.aguardar()
+            # sem sincronização de `nome` no meio: uma que tivesse lido a planilha antes do envio
+            # apagaria da fila as linhas enviadas sem gravá-las
+            with self.espelho.trava(nome):
+                try:
+                    self.enviar(nome, json.loads(lote[0][1]), [json.loads(registro[2]) for registro in lote])
+                except Exception as erro:
+                    self._falhou(nome, ids, max(registro[3] for registro in lote) + 1, erro)
+                    return enviadas
+                with self.espelho.conectar() as con:
+                    con.execute("UPDATE fila_escrita SET estado = 'enviado' WHERE id IN ({})".format(
+                        ','.join('?' * len(ids))), ids)
+            enviadas += len(ids)
+            logger.info('fila de escrita: %s linhas enviadas para %s', len(ids), nome)
+            if self.depois_de_enviar is not None:
+                try:
+                    self.depois_de_enviar(nome)
+                except Exception:
+                    logger.warning('falha ao sincronizar %s depois do envio', nome, exc_info=True)
+
+    def _falhou(self, nome, ids, tentativas, erro):
+        if _temporario(erro) and tentativas < self.tentativas_maximas:
+            espera = min(self.espera_maxima, self.espera_base * 2 ** (tentativas - 1)) * random.uniform(0.5, 1.0)
+            estado, proxima_em = 'pendente', time.time() + espera
+            if _status_http(erro) == 429:
+                self._pausa_ate = proxima_em
+            logger.warning('envio para %s falhou (tentativa %s), nova tentativa em %.0fs: %s', nome, tentativas, espera, erro)
+        else:
+            estado, proxima_em = 'falhou', 0
+            logger.error('envio para %s falhou de vez depois de %s tentativas: %s', nome, tentativas, erro)
+        with self.espelho.conectar() as con:
+            con.execute(
+                'UPDATE fila_escrita SET tentativas = ?, proxima_em = ?, estado = ?, erro = ? '
+                'WHERE id IN ({})'.format(','.join('?' * len(ids))),
+                [tentativas, proxima_em, estado, str(erro)[:500]] + ids,
+            )
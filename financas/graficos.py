@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+
+from financas.inicio import importar
+from financas.instrumentacao import consulta_cache, falta_cache
+
+
+def grafico_barras(df, x, y, titulo, cores=('#c1e0e0',), color=None, category_orders=None,
+                   template='plotly_white', **layout):
+    """Gráfico de barras no padrão do painel: valores como texto nas barras, eixo y escondido e título centralizado.
+
+    `layout` vai para o `update_layout` (xaxis_title, yaxis_title, plot_bgcolor, showlegend...).
+    O plotly só é importado aqui, quando a primeira figura é montada (as do cache não passam por aqui).
+    """
+    px = importar('plotly.express')
+    figura = px.bar(
+        df,
+        x=x,
+        y=y,
+        text=y,
+        color=color,
+        template=template,
+        color_discrete_sequence=list(cores),
+        category_orders=category_orders,
+    )
+    figura.update_layout(
+        title={
+            'text': f'<b> {titulo} <b>',
+            'y': 0.9,
+            'x': 0.5,
+            'xanchor': 'center',
+            'yanchor': 'top'},
+        **layout,
+    )
+    figura.update_yaxes(visible=False, showticklabels=False)
+    return figura
+
+
+class CacheFiguras:
+    """Figuras prontas por chave (versão dos dados + filtros), com no máximo `maximo` guardadas.
+
+    Quando enche, sai a usada há mais tempo. As figuras são compartilhadas entre as sessões; o
+    `st.plotly_chart` só lê a figura (faz uma cópia com `to_dict`), então não há risco de uma
+    sessão alterar a da outra.
+    """
+
+    def __init__(self, maximo=64):
+        self.maximo = maximo
+        self._figuras = OrderedDict()
+        self._trava = threading.Lock()
+
+    def obter(self, chave, construir):
+        """Devolve a figura de `chave`, chamando `construir()` só quando ela não está guardada."""
+        consulta_cache('figura')
+        with self._trava:
+            if chave in self._figuras:
+                self._figuras.move_to_end(chave)
+                return self._figuras[chave]
+
+        falta_cache('figura')
+        figura = construir()
+        with self._trava:
+            self._figuras[chave] = figura
+            self._figuras.move_to_end(chave)
+            while len(self._figuras) > self.maximo:
+                self._figuras.popitem(last=False)
+        return figura
+
+    def limpar(self):
+        with self._trava:
+            self._figuras.clear()
+
+    def __len__(self):
+        return len(self._figuras)
@@ -0,0 +1,220 @@
+"""Importação de extratos e faturas (CSV e OFX) direto para as planilhas de débito, crédito e VR.
+
+O arquivo é lido em blocos de `tamanho_bloco` linhas: datas e valores em reais são convertidos
+de forma vetorizada e cada bloco vai de uma vez para o armazenamento (a fila de escrita junta
+tudo em poucas chamadas ao Sheets). Arquivos de qualquer tamanho não precisam caber na memória.
+"""
+import codecs
+import io
+import os
+import re
+import unicodedata
+
+import pandas as pd
+
+from financas.esquema import CARTOES
+
+# colunas de cada planilha, na ordem dos formulários
+COLUNAS = {
+    'debito': ['id_mes', 'data', 'classificacao', 'descricao', 'debito_compra_credito', 'valor', 'ano'],
+    'credito': ['id_mes', 'credito_cartao', 'descricao', 'classificacao', 'valor', 'ano'],
+    'vr': ['data', 'id_mes', 'descricao', 'local', 'classificacao', 'valor', 'ano'],
+}
+
+# nomes de coluna (sem acento, minúsculos) usados pelos bancos nos CSVs de extrato e fatura:
+# Inter (Data Lançamento;Histórico;Descrição;Valor / "Data","Lançamento","Categoria","Tipo","Valor"),
+# Nubank (Data,Valor,Identificador,Descrição / date,title,amount), C6 (Data de Compra;...;Descrição;...;Valor (em R$))
+NOMES_DATA = ['data', 'data lancamento', 'data de compra', 'data da compra', 'date']
+NOMES_DESCRICAO = ['descricao', 'title', 'lancamento', 'historico', 'estabelecimento', 'memo']
+NOMES_VALOR = ['valor (em r$)', 'valor', 'amount', 'valor (r$)']
+
+FORMATOS_DATA = ['%d/%m/%Y', '%Y-%m-%d', '%d/%m/%y', '%d-%m-%Y', '%Y%m%d']
+
+
+def _sem_acento(texto):
+    texto = unicodedata.normalize('NFKD', str(texto)).encode('ascii', 'ignore').decode('ascii')
+    return texto.strip().strip('"').strip().lower()
+
+
+def valores_brl(serie):
+    """'R$ -1.234,56', '(1.234,56)', '1234.56' -> float em reais, tudo de uma vez."""
+    texto = serie.astype('string').str.replace(r'R\$|\s', '', regex=True)
+    negativo = texto.str.startswith('(') & texto.str.endswith(')')
+    texto = texto.str.strip('()')
+    # o último separador é o decimal: '1.234,56' (padrão brasileiro) ou '1,234.56'
+    decimal_virgula = (texto.str.rfind(',') > texto.str.rfind('.')).fillna(False)
+    texto = texto.str.replace(',', '', regex=False).where(
+        ~decimal_virgula, texto.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+    valores = pd.to_numeric(texto, errors='coerce').astype(float)
+    return valores.where(~negativo.fillna(False), -valores)
+
+
+def datas_br(serie):
+    """Converte as datas do extrato com o formato (de `FORMATOS_DATA`) que reconhece mais linhas."""
+    texto = serie.astype('string').str.strip().str.slice(0, 10)
+    melhor = None
+    for formato in FORMATOS_DATA:
+        datas = pd.to_datetime(texto.str.slice(0, 8) if formato == '%Y%m%d' else texto, format=formato, errors='coerce')
+        if melhor is None or datas.notna().sum() > melhor.notna().sum():
+            melhor = datas
+        if melhor.notna().all():
+            break
+    return melhor
+
+
+def _encoding(amostra):
+    try:
+        codecs.getincrementaldecoder('utf-8-sig')().decode(amostra, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def _coluna(colunas, nomes):
+    normalizadas = {_sem_acento(c): c for c in colunas}
+    for nome in nomes:
+        if nome in normalizadas:
+            return normalizadas[nome]
+    return None
+
+
+def ler_csv(arquivo, tamanho_bloco=50_000):
+    """Blocos (data, descricao, valor) de um CSV de extrato ou fatura.
+
+    O separador, o encoding e a linha do cabeçalho (os extratos do Inter têm linhas de
+    apresentação antes dele) são descobertos pelas primeiras linhas do arquivo.
+    """
+    amostra = arquivo.read(64 * 1024)
+    arquivo.seek(0)
+    encoding = _encoding(amostra)
+    linhas = amostra.decode(encoding, errors='ignore').split('\n')
+    cabecalho = next(
+        (i for i, linha in enumerate(linhas)
+         if any(_sem_acento(c) in NOMES_DATA for c in re.split(r'[;,\t]', linha))
+         and any(_sem_acento(c) in NOMES_VALOR for c in re.split(r'[;,\t]', linha))),
+        None,
+    )
+    if cabecalho is None:
+        raise ValueError('não encontrei o cabeçalho do extrato (colunas de data e valor)')
+    separador = max(';,\t', key=linhas[cabecalho].count)
+
+    blocos = pd.read_csv(arquivo, sep=separador, skiprows=cabecalho, encoding=encoding, dtype=str,
+                         chunksize=tamanho_bloco, skip_blank_lines=True, on_bad_lines='skip')
+    for bloco in blocos:
+        data = _coluna(bloco.columns, NOMES_DATA)
+        descricao = _coluna(bloco.columns, NOMES_DESCRICAO)
+        valor = _coluna(bloco.columns, NOMES_VALOR)
+        yield pd.DataFrame({
+            'data': datas_br(bloco[data]),
+            'descricao': bloco[descricao].astype('string').str.strip() if descricao else pd.Series('', index=bloco.index),
+            'valor': valores_brl(bloco[valor]),
+        })
+
+
+def ler_ofx(arquivo, tamanho_bloco=50_000):
+    """Blocos (data, descricao, valor) das transações (<STMTTRN>) de um OFX, lido linha a linha."""
+    amostra = arquivo.read(64 * 1024)
+    arquivo.seek(0)
+    texto = io.TextIOWrapper(arquivo, encoding=_encoding(amostra), errors='replace', newline='')
+    campos = re.compile(r'<(DTPOSTED|TRNAMT|MEMO|NAME)>([^<\r\n]*)', re.IGNORECASE)
+    atual, registros = None, []
+    try:
+        # as tags do OFX 1.x (SGML) nem sempre fecham e podem vir todas na mesma linha
+        for linha in texto:
+            for pedaco in re.split(r'(?i)(?=<STMTTRN>)|(?<=</STMTTRN>)', linha):
+                if pedaco[:9].upper() == '<STMTTRN>':
+                    if atual:
+                        registros.append(atual)
+                    atual = {}
+                if atual is None:
+                    continue
+                for tag, valor in campos.findall(pedaco):
+                    atual.setdefault(tag.upper(), valor.strip())
+                if '</STMTTRN>' in pedaco.upper():
+                    registros.append(atual)
+                    atual = None
+            if len(registros) >= tamanho_bloco:
+                yield _bloco_ofx(registros)
+                registros = []
+        if atual:
+            registros.append(atual)
+        if registros:
+            yield _bloco_ofx(registros)
+    finally:
+        texto.detach()
+
+
+def _bloco_ofx(registros):
+    bloco = pd.DataFrame(registros, columns=['DTPOSTED', 'TRNAMT', 'MEMO', 'NAME'])
+    return pd.DataFrame({
+        'data': datas_br(bloco['DTPOSTED']),
+        'descricao': bloco['MEMO'].fillna(bloco['NAME']).fillna('').astype('string'),
+        'valor': valores_brl(bloco['TRNAMT']),
+    })
+
+
+def ler_extrato(arquivo, nome_arquivo, tamanho_bloco=50_000):
+    """Escolhe o leitor pela extensão de `nome_arquivo` (.ofx ou .csv)."""
+    extensao = os.path.splitext(nome_arquivo)[1].lower()
+    if extensao == '.ofx':
+        return ler_ofx(arquivo, tamanho_bloco)
+    if extensao in ('.csv', '.txt'):
+        return ler_csv(arquivo, tamanho_bloco)
+    raise ValueError(f'formato não suportado: {extensao or nome_arquivo} (use CSV ou OFX)')
+
+
+def para_ledger(bloco, destino, gastos_negativos, cartao=None, classificacao='Outros', classificar=None):
+    """Linhas da planilha `destino` a partir de um bloco (data, descricao, valor).
+
+    Só entram os gastos (valor negativo quando `gastos_negativos`, positivo caso contrário), com o
+    valor positivo como nos formulários; entradas, pagamentos de fatura e linhas sem data ficam de fora.
+    Com `classificar` (descrições -> classificações, NaN sem sugestão), o bloco inteiro é classificado
+    de uma vez e `classificacao` fica só para o que ele não reconhecer.
+    """
+    sinal = -1 if gastos_negativos else 1
+    valor = bloco['valor'] * sinal
+    bloco = bloco[bloco['data'].notna() & (valor > 0)]
+    valor = valor[bloco.index].round(2)
+    # um extrato tem poucas datas distintas: formata cada uma uma vez só
+    codigos, datas = pd.factorize(bloco['data'].dt.normalize())
+    descricoes = bloco['descricao'].fillna('').astype(str)
+    if classificar is not None:
+        classificacao = classificar(descricoes).fillna(classificacao)
+    linhas = pd.DataFrame({
+        'id_mes': datas.strftime('%m_%Y').to_numpy()[codigos],
+        'data': datas.strftime('%d/%m/%Y').to_numpy()[codigos],
+        'descricao': descricoes,
+        'classificacao': classificacao,
+        'valor': valor,
+        'ano': bloco['data'].dt.year,
+        'debito_compra_credito': 'Não',
+        'credito_cartao': cartao,
+        'local': '',
+    })
+    return linhas[COLUNAS[destino]].reset_index(drop=True)
+
+
+def importar(arquivo, nome_arquivo, destino, anexar, gastos_negativos, cartao=None, classificacao='Outros',
+             classificar=None, duplicadas=None, tamanho_bloco=50_000):
+    """Lê o extrato em blocos e manda cada bloco com `anexar(destino, linhas)`.
+
+    Com `duplicadas(destino, linhas)` (Série booleana), as linhas que já existem ficam de fora;
+    importar o mesmo extrato duas vezes não grava nada na segunda.
+    Devolve {'importadas': n, 'ignoradas': n, 'repetidas': n} (ignoradas: entradas, pagamentos e
+    linhas sem data ou valor).
+    """
+    if destino == 'credito' and cartao not in CARTOES:
+        raise ValueError(f'cartão desconhecido: {cartao!r}')
+    importadas = ignoradas = repetidas = 0
+    for bloco in ler_extrato(arquivo, nome_arquivo, tamanho_bloco):
+        linhas = para_ledger(bloco, destino, gastos_negativos, cartao=cartao, classificacao=classificacao,
+                             classificar=classificar)
+        ignoradas += len(bloco) - len(linhas)
+        if duplicadas is not None and not linhas.empty:
+            ja_existem = duplicadas(destino, linhas).to_numpy()
+            repetidas += int(ja_existem.sum())
+            linhas = linhas[~ja_existem].reset_index(drop=True)
+        if not linhas.empty:
+            anexar(destino, linhas)
+        importadas += len(linhas)
+    return {'importadas': importadas, 'ignoradas': ignoradas, 'repetidas': repetidas}
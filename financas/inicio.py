@@ -0,0 +1,99 @@
+"""Partida a frio: imports pesados só quando usados e o perfil de quanto custa abrir um processo novo.
+
+Com a variável de ambiente FINANCAS_PERFIL_INICIO=1 (por exemplo no deploy, para comparar partidas a
+frio antes e depois de uma mudança), o tempo do primeiro import de cada módulo e o da primeira
+renderização vão para o log como uma linha JSON (evento 'inicio'), e os imports tardios que vierem
+depois, um por linha (evento 'import_tardio'). Só usa a biblioteca padrão: é o primeiro import do
+script, para medir desde o pandas.
+"""
+import builtins
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+ATIVO = os.environ.get('FINANCAS_PERFIL_INICIO', '') == '1'
+
+# o primeiro rerun do processo importa este módulo: a primeira renderização conta daqui
+COMECO = time.perf_counter()
+
+# módulo -> segundos do primeiro import (com os imports que ele puxa)
+IMPORTS = {}
+
+_import_original = builtins.__import__
+# só o import mais de fora é medido, para os tempos não serem contados duas vezes; os módulos do
+# próprio app (financas.*) passam direto, para o tempo ir para a biblioteca que eles puxam
+_dentro = threading.local()
+_trava = threading.Lock()
+_perfil = None
+
+
+def _registrar(modulo, segundos):
+    with _trava:
+        IMPORTS[modulo] = IMPORTS.get(modulo, 0.0) + segundos
+        depois_do_inicio = _perfil is not None
+    if ATIVO and depois_do_inicio:
+        logger.info(json.dumps({'evento': 'import_tardio', 'modulo': modulo, 'segundos': round(segundos, 4)}))
+
+
+def _import_medido(nome, globals=None, locals=None, fromlist=(), level=0):
+    if level or nome in sys.modules or nome.startswith('financas') or getattr(_dentro, 'ativo', False):
+        return _import_original(nome, globals, locals, fromlist, level)
+    _dentro.ativo = True
+    inicio = time.perf_counter()
+    try:
+        return _import_original(nome, globals, locals, fromlist, level)
+    finally:
+        _dentro.ativo = False
+        _registrar(nome, time.perf_counter() - inicio)
+
+
+def instalar():
+    """No modo perfil, passa a medir todos os imports; chamado no topo do script (as outras vezes não fazem nada)."""
+    if ATIVO and builtins.__import__ is not _import_medido:
+        builtins.__import__ = _import_medido
+
+
+def importar(modulo):
+    """Import tardio de um módulo pesado (plotly, duckdb, gspread): só custa na primeira vez que é usado.
+
+    O tempo dessa primeira vez entra em `IMPORTS`, com ou sem o modo perfil.
+    """
+    if modulo not in sys.modules:
+        externo = not getattr(_dentro, 'ativo', False)
+        _dentro.ativo = True
+        inicio = time.perf_counter()
+        try:
+            importlib.import_module(modulo)
+        finally:
+            if externo:
+                _dentro.ativo = False
+                _registrar(modulo, time.perf_counter() - inicio)
+    return sys.modules[modulo]
+
+
+def primeira_renderizacao():
+    """Fecha o perfil no fim do primeiro rerun completo do processo e devolve o resumo (None fora do modo perfil).
+
+    {'primeira_renderizacao': s, 'tempo_imports': s, 'imports': {módulo: s}}, os imports do mais lento
+    para o mais rápido; é logado uma vez só.
+    """
+    global _perfil
+    if not ATIVO:
+        return None
+    with _trava:
+        if _perfil is None:
+            imports = sorted(IMPORTS.items(), key=lambda item: item[1], reverse=True)
+            _perfil = {
+                'primeira_renderizacao': round(time.perf_counter() - COMECO, 4),
+                'tempo_imports': round(sum(IMPORTS.values()), 4),
+                'imports': {modulo: round(segundos, 4) for modulo, segundos in imports},
+            }
+            logger.info(json.dumps({'evento': 'inicio', **_perfil}, ensure_ascii=False))
+    return _perfil
@@ -0,0 +1,182 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+
+logger = logging.getLogger(__name__)
+
+# chave do registro do rerun atual em st.session_state
+CHAVE = '_instrumentacao'
+
+
+class Registro:
+    """Tempos por seção, chamadas à API do Sheets (e bytes) e acertos/faltas de cache de um rerun.
+
+    `fragmento` é o nome do fragmento quando o rerun foi só dele (None no rerun completo do script).
+    """
+
+    def __init__(self, fragmento=None):
+        self.inicio = time.time()
+        self.fragmento = fragmento
+        self.secoes = {}
+        self.chamadas = Counter()
+        self.bytes = Counter()
+        self.consultas = Counter()
+        self.faltas = Counter()
+        # as leituras em paralelo e as sincronizações em segundo plano registram ao mesmo tempo
+        self._trava = threading.Lock()
+
+    def secao(self, nome, segundos):
+        with self._trava:
+            self.secoes[nome] = self.secoes.get(nome, 0.0) + segundos
+
+    def chamada(self, tipo, tamanho):
+        with self._trava:
+            self.chamadas[tipo] += 1
+            self.bytes[tipo] += tamanho
+
+    def cache(self, nome, falta=False):
+        with self._trava:
+            (self.faltas if falta else self.consultas)[nome] += 1
+
+    def como_dict(self):
+        with self._trava:
+            return {
+                'fragmento': self.fragmento,
+                'inicio': self.inicio,
+                'tempo_total': time.time() - self.inicio,
+                'secoes': {nome: round(segundos, 4) for nome, segundos in self.secoes.items()},
+                'chamadas_sheets': dict(self.chamadas),
+                'bytes_sheets': dict(self.bytes),
+                'cache': {
+                    nome: {'acertos': self.consultas[nome] - self.faltas[nome], 'faltas': self.faltas[nome]}
+                    for nome in sorted(self.consultas)
+                },
+            }
+
+
+# totais do processo (inclui as sincronizações em segundo plano, que não pertencem a um rerun)
+TOTAIS = Registro()
+
+
+def registro_atual():
+    """Registro do rerun em andamento, ou None fora de um script do streamlit."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return None
+    return st.session_state.get(CHAVE)
+
+
+def iniciar(fragmento=None):
+    """Começa um registro novo; chamado no topo do script, a cada rerun completo, e por `fragmento`."""
+    registro = Registro(fragmento)
+    st.session_state[CHAVE] = registro
+    return registro
+
+
+def fragmento(funcao=None, *, run_every=None):
+    """`st.fragment` que mede os próprios reruns.
+
+    No rerun completo o corpo conta no registro do script; quando só o fragmento roda (interação
+    dentro dele ou `run_every`), ele tem um registro próprio, emitido no fim como o do script.
+    Sem isso, os tempos e as chamadas desses reruns iam para o registro do último rerun completo.
+    """
+    def decorar(funcao):
+        @functools.wraps(funcao)
+        def corpo(*args, **kwargs):
+            ctx = get_script_run_ctx(suppress_warning=True)
+            if ctx is None or not ctx.fragment_ids_this_run:
+                return funcao(*args, **kwargs)
+            registro = iniciar(funcao.__name__)
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                finalizar(registro)
+        return st.fragment(corpo, run_every=run_every)
+    return decorar if funcao is None else decorar(funcao)
+
+
+@contextmanager
+def medir(secao):
+    """Soma o tempo de parede do bloco em `secao`. Serve também como decorador."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        segundos = time.perf_counter() - inicio
+        registro = registro_atual()
+        if registro is not None:
+            registro.secao(secao, segundos)
+        logger.debug('seção %s: %.3fs', secao, segundos)
+
+
+def contar_chamada(tipo, conteudo=None):
+    """Conta uma chamada à API do Sheets; `conteudo` (resposta ou corpo enviado) dá o tamanho em bytes."""
+    tamanho = len(json.dumps(conteudo, ensure_ascii=False, default=str).encode('utf-8')) if conteudo is not None else 0
+    TOTAIS.chamada(tipo, tamanho)
+    registro = registro_atual()
+    if registro is not None:
+        registro.chamada(tipo, tamanho)
+
+
+def _contar_cache(nome, falta):
+    TOTAIS.cache(nome, falta)
+    registro = registro_atual()
+    if registro is not None:
+        registro.cache(nome, falta)
+
+
+def consulta_cache(nome):
+    """Conta uma consulta a uma função cacheada; acertos = consultas - faltas."""
+    _contar_cache(nome, falta=False)
+
+
+def falta_cache(nome):
+    """Chamado dentro do corpo da função cacheada, que só roda quando o cache não tem o valor."""
+    _contar_cache(nome, falta=True)
+
+
+def finalizar(registro):
+    """Emite o registro do rerun como uma linha de log JSON e devolve o dicionário."""
+    dados = registro.como_dict()
+    logger.info(json.dumps({'evento': 'rerun', **dados}, ensure_ascii=False))
+    return dados
+
+
+def painel_debug(dados, inicio=None):
+    """Painel opcional (`?debug=1` na url ou `debug = true` nos secrets) com os números do rerun.
+
+    `inicio` é o perfil da partida a frio (`financas.inicio.primeira_renderizacao`), quando ligado.
+    """
+    with st.sidebar.expander('Desempenho', expanded=True):
+        st.metric('Tempo total', f"{dados['tempo_total']:.3f}s")
+        st.caption('Seções (s)')
+        st.dataframe(pd.Series(dados['secoes'], name='segundos').sort_values(ascending=False))
+        st.caption('Chamadas ao Sheets')
+        st.dataframe(pd.DataFrame({
+            'chamadas': pd.Series(dados['chamadas_sheets'], dtype='int64'),
+            'bytes': pd.Series(dados['bytes_sheets'], dtype='int64'),
+        }))
+        st.caption('Cache')
+        st.dataframe(pd.DataFrame(dados['cache']).T)
+        st.caption('Desde o início do processo')
+        st.json(TOTAIS.como_dict(), expanded=False)
+        if inicio is not None:
+            st.caption('Partida a frio (s)')
+            st.metric('Primeira renderização', f"{inicio['primeira_renderizacao']:.3f}s")
+            st.dataframe(pd.Series(inicio['imports'], name='segundos', dtype='float64').head(15))
+
+
+def debug_ativo():
+    try:
+        padrao = bool(st.secrets.get('debug', False))
+    except FileNotFoundError:
+        padrao = False
+    return st.query_params.get('debug', '1' if padrao else '0') == '1'
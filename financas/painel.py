@@ -0,0 +1,246 @@
+"""Peças do app compartilhadas pelas páginas (paginas/*.py): armazenamento, caches, índices e a tabela "Base".
+
+Tudo o que é do processo (armazenamento, caches, índices) é aberto com `st.cache_resource` na
+primeira página que pede, e não no import: uma página só paga pelo que usa. Cada página declara
+em `PLANILHAS` as planilhas que as suas seções leem inteiras e chama `carregar_pagina` com elas no
+topo, junto com as que só têm os agregados ou as linhas pendentes lidos.
+"""
+from datetime import date
+
+import pandas as pd
+import streamlit as st
+
+from financas.acumulados import SOMAS, SomasAcumuladas
+from financas.agregados import AgregadosMensais, com_pendentes
+from financas.armazenamento import abrir_armazenamento
+from financas.cache import CacheCompartilhado
+from financas.carregamento import carregar_ledgers
+from financas.classificacao import IndiceClassificacao
+from financas.consultas import ORDENS, MotorConsultas
+from financas.dre import matriz_dre
+from financas.duplicatas import IndiceDuplicatas
+from financas.esquema import aplicar_esquema, juntar, para_exibicao
+from financas.graficos import CacheFiguras
+from financas.instrumentacao import consulta_cache, falta_cache, medir
+from financas.parcelas import expandir, parcelas_a_vencer
+from financas.visao import montar_visao_mensal
+
+
+template_dash = "plotly_white"
+bg_color_dash = "rgba(0,0,0,0)"
+
+
+# onde ficam as planilhas: Google Sheets (padrão) ou só um sqlite local, pela seção [armazenamento] dos secrets
+# (tipo = "sqlite" roda offline, sem credenciais); as leituras vêm sempre da cópia local em sqlite
+# no modo Sheets há um cliente só por processo (conexões keep-alive, um token, requisições limitadas),
+# compartilhado por todas as sessões abertas do painel
+def credenciais_sheets():
+    return st.secrets["connections"]["gsheets"].to_dict()
+
+@st.cache_resource
+def abrir_armazenamento_configurado():
+    return abrir_armazenamento(st.secrets.get("armazenamento", {}), credenciais_sheets)
+
+armazenamento = abrir_armazenamento_configurado()
+
+# totais mensais mantidos no mesmo sqlite e atualizados a cada linha nova que entra no espelho
+# (abertos pela primeira página que mostra a visão mensal; ao abrir, refazem o que entrou no espelho antes)
+@st.cache_resource
+def abrir_agregados():
+    return AgregadosMensais(abrir_armazenamento_configurado().espelho)
+
+# figuras prontas por versão dos dados + filtros, compartilhadas entre as sessões: alternar entre visões
+# já vistas não refaz o px.bar
+@st.cache_resource
+def abrir_cache_figuras():
+    return CacheFiguras(maximo=64)
+
+figuras = abrir_cache_figuras()
+
+# cada seção lê só as planilhas de que precisa; o cache é por versão da cópia local,
+# então uma planilha só é relida do sqlite quando entram linhas novas nela
+# o esquema (id_mes inteiro, centavos, categorias) é aplicado uma vez aqui, na carga
+# com `anos`, só as partições desses anos saem do sqlite: o histórico dos outros anos não pesa na leitura
+# o cache é um só no processo (sessões simultâneas esperam a mesma carga) e os DataFrames são
+# compartilhados, sem cópia: as seções não alteram o que recebem
+@st.cache_resource
+def abrir_cache_planilhas():
+    return CacheCompartilhado('planilha', maximo=32)
+
+planilhas_em_cache = abrir_cache_planilhas()
+
+# compras parceladas ficam em uma linha só na planilha e viram uma linha por parcela aqui, na carga
+# as linhas que os formulários acabaram de mandar aparecem na hora: enquanto estão na fila de escrita,
+# são somadas à planilha em cache (só elas passam pelo esquema; a planilha gravada não é relida)
+def ler_planilha(nome, anos=None):
+    if anos is not None:
+        anos = tuple(sorted(int(ano) for ano in anos))
+    versao_gravada = armazenamento.versao_gravada(nome)
+    gravada = planilhas_em_cache.obter(
+        ('gravada', nome, anos), versao_gravada, lambda: aplicar_esquema(nome, expandir(armazenamento.ler(nome, anos), anos)))
+    versao_pendente = armazenamento.versao_pendente(nome)
+    if not versao_pendente or not versao_pendente[0]:
+        return gravada
+    return planilhas_em_cache.obter(
+        ('com_pendentes', nome, anos), (versao_gravada, versao_pendente),
+        lambda: juntar(nome, gravada, aplicar_esquema(nome, expandir(armazenamento.pendentes(nome, anos), anos))))
+
+# anos com dados, descobertos das partições (nada de lista de anos fixa no código)
+@st.cache_data(max_entries=32, show_spinner=False)
+def _anos_disponiveis(nome, versao):
+    return armazenamento.anos(nome)
+
+def anos_disponiveis(*nomes):
+    return sorted(set().union(*(_anos_disponiveis(nome, armazenamento.versao(nome)) for nome in nomes)))
+
+# filtros de ano começam no ano corrente (ou no mais recente com dados); o orçamento entra nas opções
+# para o ano novo aparecer antes do primeiro lançamento dele
+def anos_padrao(nome):
+    anos = anos_disponiveis(nome, 'orcamento')
+    if not anos:
+        return []
+    return [date.today().year if date.today().year in anos else anos[-1]]
+
+def filtro_anos(nome, key):
+    return st.multiselect('Filtre o ano:', anos_disponiveis(nome, 'orcamento'), default=anos_padrao(nome), key=key)
+
+# no rerun completo de uma página, o que as seções vão ler é preparado em paralelo antes delas: as
+# `planilhas` entram inteiras no cache (como explorar_base e a visão mensal as leem) e as de `sincronizar`
+# só têm a cópia local conferida (a visão mensal, as somas acumuladas e os filtros de ano usam os agregados,
+# as linhas pendentes e as partições delas, não a planilha); as outras nem saem do sqlite, e os reruns de
+# uma seção (fragment) não passam por aqui
+def carregar_pagina(planilhas, sincronizar=()):
+    def preparar(nome):
+        if nome in planilhas:
+            return ler_planilha(nome)
+        armazenamento.versao(nome)
+
+    with medir('carga das planilhas'):
+        carregar_ledgers(preparar, list(planilhas) + [nome for nome in sincronizar if nome not in planilhas])
+
+# classificação sugerida pela descrição, aprendida dos lançamentos já classificados (índice único do
+# processo, atualizado a cada linha nova que entra no espelho)
+@st.cache_resource
+def abrir_indice_classificacao():
+    return IndiceClassificacao(abrir_armazenamento_configurado().espelho)
+
+# lançamentos que já existem (gravados ou ainda na fila de escrita), pela chave
+# (mês, data, descrição, valor): o índice é um só no processo e atualizado a cada linha nova
+@st.cache_resource
+def abrir_indice_duplicatas():
+    return IndiceDuplicatas(abrir_armazenamento_configurado())
+
+# somas acumuladas por mês de patrimônio, empréstimos e investimentos (índice único do processo,
+# estendido a cada linha nova que entra no espelho): totais e "saldo até o mês" sem somar as planilhas
+@st.cache_resource
+def abrir_somas_acumuladas():
+    return SomasAcumuladas(abrir_armazenamento_configurado().espelho)
+
+# com as linhas ainda na fila somadas (a cópia do índice só é refeita quando alguma dessas planilhas muda)
+def somas_com_pendentes():
+    somas_acumuladas = abrir_somas_acumuladas()
+    if not any(versao and versao[0] for versao in map(armazenamento.versao_pendente, SOMAS)):
+        return somas_acumuladas
+    return planilhas_em_cache.obter(
+        ('somas_acumuladas',), versoes(*SOMAS),
+        lambda: somas_acumuladas.com_pendentes({nome: armazenamento.pendentes(nome) for nome in SOMAS}))
+
+
+# agrupados mensais e orçamento x realizado usados pelas páginas de "Visualização"
+# (recalculados só quando alguma das planilhas envolvidas muda de versão)
+PLANILHAS_VISAO_MENSAL = ['fixo', 'debito', 'credito', 'receita', 'patrimonio', 'orcamento']
+
+def versoes(*nomes):
+    return tuple(armazenamento.versao(nome) for nome in nomes)
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _visao_mensal(versoes_planilhas):
+    falta_cache('visao_mensal')
+    agregado_mensal = com_pendentes(abrir_agregados().ler(), {nome: armazenamento.pendentes(nome) for nome in PLANILHAS_VISAO_MENSAL})
+    return montar_visao_mensal(agregado_mensal, ler_planilha('orcamento'))
+
+@medir('visão mensal')
+def visao_mensal():
+    consulta_cache('visao_mensal')
+    return _visao_mensal(versoes(*PLANILHAS_VISAO_MENSAL))
+
+# matriz do DRE (linha x mês) de todos os meses, recalculada só quando os dados mudam
+@st.cache_data(max_entries=8, show_spinner=False)
+def _matriz_dre(versoes_planilhas, classes_receita):
+    falta_cache('matriz_dre')
+    visao = visao_mensal()
+    return matriz_dre(visao['receita_agrupado'], visao['fixo_agrupado'], visao['debito_agrupado'],
+                      visao['credito_agrupado'], visao['orcamento_mensal'], classes_receita=classes_receita)
+
+def matriz_dre_em_cache(classes_receita=None):
+    consulta_cache('matriz_dre')
+    return _matriz_dre(versoes(*PLANILHAS_VISAO_MENSAL), classes_receita)
+
+# parcelas a vencer por cartão nos próximos 12 meses, contadas das compras compactas (sem gerar as
+# parcelas); só entram as partições de crédito que ainda têm parcelas deste mês em diante
+@st.cache_data(max_entries=4, show_spinner=False)
+def _parcelas_a_vencer(versao, desde):
+    falta_cache('parcelas_a_vencer')
+    anos = [ano for ano in armazenamento.anos('credito') if ano >= desde // 100]
+    compras = [df for df in (armazenamento.ler('credito', anos), armazenamento.pendentes('credito', anos)) if not df.empty]
+    return parcelas_a_vencer(pd.concat(compras, ignore_index=True) if compras else pd.DataFrame(), desde)
+
+def parcelas_a_vencer_em_cache():
+    consulta_cache('parcelas_a_vencer')
+    return _parcelas_a_vencer(armazenamento.versao('credito'), date.today().year * 100 + date.today().month)
+
+# tabelas "Base": filtros, busca e ordenação viram uma consulta só no DuckDB (cópia das planilhas
+# em cache, refeita quando a versão muda), que devolve só as linhas mostradas
+@st.cache_resource
+def abrir_motor_consultas():
+    return MotorConsultas()
+
+def explorar_base(nome, campos, chave, filtros_fixos=None, anos=None):
+    """Popover de filtros + tabela paginada da planilha `nome`; `campos` é uma lista de (coluna, rótulo, format_func).
+
+    Filtros, busca, ordenação, colunas e página vão para a consulta no DuckDB: só a página
+    mostrada é serializada para o navegador, qualquer que seja o tamanho da planilha.
+    A planilha inteira é copiada uma vez por versão; `anos` vira um filtro de `ano` na consulta.
+    """
+    motor_consultas = abrir_motor_consultas()
+    motor_consultas.carregar(nome, armazenamento.versao(nome), ler_planilha(nome))
+    filtros = dict(filtros_fixos or {})
+    if anos is not None:
+        filtros['ano'] = sorted(int(ano) for ano in anos)
+    with st.popover('Filtros'):
+        # as opções de cada filtro consideram os filtros anteriores, como antes
+        for coluna, rotulo, formato in campos:
+            opcoes = motor_consultas.distintos(nome, coluna, filtros)
+            filtros[coluna] = st.multiselect(rotulo, opcoes, opcoes, key=f'{chave}-{coluna}', format_func=formato)
+        busca = st.text_input('Buscar na descrição', key=f'{chave}-busca')
+        ordem = st.selectbox('Ordenar por', list(ORDENS), key=f'{chave}-ordem')
+        todas_colunas = motor_consultas.colunas(nome)
+        colunas = st.multiselect('Colunas', todas_colunas, todas_colunas, key=f'{chave}-colunas')
+        tamanho = st.selectbox('Linhas por página', [50, 100, 500, 1000], index=1, key=f'{chave}-tamanho')
+
+    # filtro, busca, ordem ou tamanho novos voltam para a primeira página
+    chave_pagina = f'{chave}-pagina'
+    consulta = repr((filtros, busca, ordem, tamanho))
+    if st.session_state.get(f'{chave}-consulta') != consulta:
+        st.session_state[f'{chave}-consulta'] = consulta
+        st.session_state[chave_pagina] = 1
+    pagina = st.session_state.get(chave_pagina, 1)
+
+    with medir(f'consulta base {nome}'):
+        resultado = motor_consultas.consultar(nome, filtros, busca, ordem=ORDENS[ordem], limite=tamanho,
+                                              deslocamento=(pagina - 1) * tamanho, colunas_visiveis=colunas)
+        paginas = max(1, -(-resultado.total // tamanho))
+        if pagina > paginas:
+            # a planilha encolheu desde a última página vista
+            pagina = st.session_state[chave_pagina] = paginas
+            resultado = motor_consultas.consultar(nome, filtros, busca, ordem=ORDENS[ordem], limite=tamanho,
+                                                  deslocamento=(pagina - 1) * tamanho, colunas_visiveis=colunas)
+
+    st.dataframe(para_exibicao(nome, resultado.linhas))
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        st.number_input(f'Página (de {paginas})', min_value=1, max_value=paginas, step=1, key=chave_pagina)
+    with col2:
+        inicio = (pagina - 1) * tamanho
+        st.caption(f'linhas {inicio + 1 if resultado.total else 0}-{inicio + len(resultado.linhas)} de {resultado.total}'
+                   f' · total R$ {resultado.soma / 100:,.2f}')
@@ -0,0 +1,79 @@
+"""Compras parceladas guardadas em uma linha só (mês da primeira parcela, `parcelas`, valor da parcela, cartão).
+
+A planilha de crédito não cresce parcelas x compras: as parcelas só viram linhas por mês quando
+alguma leitura ou agregação pede (`expandir`, vetorizado), e o que ainda vai vencer em cada cartão
+sai direto das linhas compactas (`parcelas_a_vencer`), sem expandir nada. Linhas sem a coluna
+`parcelas` (ou com ela vazia) valem por um mês, como as linhas antigas, uma por parcela.
+"""
+import numpy as np
+import pandas as pd
+
+from financas.esquema import id_mes_para_periodo, id_mes_texto, mes_corrido, periodo_do_mes_corrido
+
+
+def quantidade_parcelas(df):
+    """Parcelas de cada linha (1 sem a coluna, vazia ou inválida)."""
+    if 'parcelas' not in df.columns:
+        return pd.Series(1, index=df.index, dtype='int64')
+    return pd.to_numeric(df['parcelas'], errors='coerce').fillna(1).clip(lower=1).astype('int64')
+
+
+def expandir(df, anos=None):
+    """Uma linha por mês de cada compra (cru, com `id_mes` '01_2025', como sai do espelho).
+
+    A parcela i (a partir de 0) vai para o mês inicial + i, com o `ano` desse mês; a coluna
+    `parcelas` sai, e o resultado tem as mesmas colunas das linhas antigas. Com `anos`, ficam só
+    as parcelas desses anos.
+    """
+    if df.empty or 'parcelas' not in df.columns:
+        return df
+    periodo = id_mes_para_periodo(df['id_mes'])
+    # sem mês referência não há como espalhar as parcelas: a linha fica como está
+    parcelas = quantidade_parcelas(df).where(periodo.notna(), 1).to_numpy()
+    origem = np.repeat(np.arange(len(df)), parcelas)
+    deslocamento = np.arange(len(origem)) - np.repeat(np.cumsum(parcelas) - parcelas, parcelas)
+
+    expandido = df.iloc[origem].drop(columns='parcelas').reset_index(drop=True)
+    inicio = periodo.to_numpy(dtype='float64', na_value=np.nan)[origem]
+    tem_mes = ~np.isnan(inicio)
+    meses = periodo_do_mes_corrido(mes_corrido(inicio[tem_mes].astype('int64')) + deslocamento[tem_mes])
+    # poucos meses distintos: cada um vira texto uma vez só
+    distintos, posicoes = np.unique(meses, return_inverse=True)
+    expandido.loc[tem_mes, 'id_mes'] = id_mes_texto(pd.Series(distintos)).to_numpy()[posicoes]
+    if 'ano' in expandido.columns:
+        expandido.loc[tem_mes, 'ano'] = meses // 100
+    if anos is not None:
+        ano = pd.to_numeric(expandido['ano'], errors='coerce') if 'ano' in expandido.columns \
+            else id_mes_para_periodo(expandido['id_mes']) // 100
+        expandido = expandido[ano.isin([int(a) for a in anos])].reset_index(drop=True)
+    return expandido
+
+
+def parcelas_a_vencer(df, desde, meses=12, coluna='credito_cartao'):
+    """Quanto cada `coluna` (cartão) tem de parcelas em cada mês, de `desde` (aaaamm) a `meses` à frente.
+
+    Conta direto das linhas compactas: cada compra soma o valor da parcela no mês inicial e tira
+    no mês seguinte à última, e a soma acumulada ao longo dos meses dá o total de cada mês
+    (O(compras + meses), sem gerar as parcelas). Devolve reais, linhas = cartões, colunas = id_mes ('01_2025').
+    """
+    colunas_meses = id_mes_texto(pd.Series(periodo_do_mes_corrido(mes_corrido(desde) + np.arange(meses)))).tolist()
+    if df.empty or coluna not in df.columns:
+        return pd.DataFrame(columns=colunas_meses, dtype='float64')
+    inicio = id_mes_para_periodo(df['id_mes'])
+    valor = pd.to_numeric(df['valor'], errors='coerce')
+    validas = (inicio.notna() & valor.notna()).to_numpy()
+    inicio = mes_corrido(inicio[validas].to_numpy(dtype='int64'))
+    fim = inicio + quantidade_parcelas(df)[validas].to_numpy()
+    valor = valor[validas].to_numpy(dtype='float64')
+    codigos, cartoes = pd.factorize(df.loc[validas, coluna].astype(str))
+
+    primeiro = mes_corrido(desde)
+    # só o pedaço de cada compra dentro da janela [desde, desde + meses)
+    entra = np.clip(inicio - primeiro, 0, meses)
+    sai = np.clip(fim - primeiro, 0, meses)
+    dentro = entra < sai
+    variacao = np.zeros((len(cartoes), meses + 1))
+    np.add.at(variacao, (codigos[dentro], entra[dentro]), valor[dentro])
+    np.add.at(variacao, (codigos[dentro], sai[dentro]), -valor[dentro])
+    total = np.cumsum(variacao, axis=1)[:, :meses].round(2)
+    return pd.DataFrame(total, index=pd.Index(cartoes, name=coluna), columns=colunas_meses).sort_index()
@@ -0,0 +1,231 @@
+"""Planilhas sintéticas com as colunas do app, para benchmarks e para rodar offline.
+
+Uso: python -m financas.sintetico --linhas 100000 --caminho .espelho/sintetico.sqlite
+e, nos secrets, [armazenamento] tipo = "sqlite", caminho = ".espelho/sintetico.sqlite".
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from financas.esquema import CARTOES, CLASSIFICACOES
+
+
+# mesmas opções dos formulários do app (as classificações e os cartões vêm de financas.esquema)
+DIRECIONAMENTOS = ['Patrimônio', 'Reserva Férias']
+COMPRA_CREDITO = ['Não', 'Sim, com pagamento', 'Sim, sem pagamento']
+
+# fatia das transações de cada planilha (o orçamento é gerado por mês, à parte)
+PROPORCOES = {
+    'debito': 0.40,
+    'credito': 0.30,
+    'vr': 0.15,
+    'fixo': 0.08,
+    'receita': 0.03,
+    'patrimonio': 0.02,
+    'investimento': 0.01,
+    'emprestimo': 0.01,
+}
+
+
+def _meses(anos):
+    return [(ano, mes) for ano in anos for mes in range(1, 13)]
+
+
+def _id_mes(ano, mes):
+    return pd.Series(mes).map('{:02d}'.format).to_numpy(dtype=object) + '_' + pd.Series(ano).astype(str).to_numpy(dtype=object)
+
+
+def _datas(rng, ano, mes):
+    dia = rng.integers(1, 29, len(ano))
+    return (pd.Series(dia).map('{:02d}'.format) + '/' + pd.Series(mes).map('{:02d}'.format) + '/'
+            + pd.Series(ano).astype(str)).to_numpy(dtype=object)
+
+
+def _valores(rng, n, media):
+    # valores com cauda longa, como gastos reais (muitos pequenos, poucos grandes)
+    return np.round(rng.lognormal(np.log(media), 0.8, n), 2)
+
+
+def gerar_ledgers(linhas, anos=range(2016, 2026), seed=0):
+    """Gera as planilhas do app com `linhas` transações no total, nas mesmas colunas das planilhas reais.
+
+    Os valores vêm como na leitura do Sheets: `id_mes` texto ('01_2025'), `valor` em reais.
+    Devolve um dicionário nome -> DataFrame, incluindo o `orcamento` de cada mês.
+    """
+    rng = np.random.default_rng(seed)
+    meses = np.array(_meses(list(anos)))
+
+    def sortear_meses(n):
+        escolhidos = meses[rng.integers(0, len(meses), n)]
+        # ordem cronológica, como uma planilha preenchida ao longo do tempo
+        escolhidos = escolhidos[np.lexsort((escolhidos[:, 1], escolhidos[:, 0]))]
+        return escolhidos[:, 0], escolhidos[:, 1]
+
+    def escolher(opcoes, n):
+        return np.asarray(opcoes, dtype=object)[rng.integers(0, len(opcoes), n)]
+
+    quantidades = {nome: max(1, int(linhas * fracao)) for nome, fracao in PROPORCOES.items()}
+    planilhas = {}
+
+    n = quantidades['debito']
+    ano, mes = sortear_meses(n)
+    planilhas['debito'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'data': _datas(rng, ano, mes),
+        'classificacao': escolher(CLASSIFICACOES['debito'], n),
+        'descricao': escolher(['Mercado', 'Uber', 'Padaria', 'Farmácia', 'Bar', 'Ingresso'], n),
+        'debito_compra_credito': escolher(COMPRA_CREDITO, n),
+        'valor': _valores(rng, n, 40),
+        'ano': ano,
+    })
+
+    n = quantidades['credito']
+    ano, mes = sortear_meses(n)
+    planilhas['credito'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'credito_cartao': escolher(CARTOES, n),
+        'descricao': escolher(['Loja', 'Presente', 'Roupa', 'Eletrônico', 'Anuidade'], n),
+        'classificacao': escolher(CLASSIFICACOES['credito'], n),
+        'valor': _valores(rng, n, 120),
+        'ano': ano,
+    })
+
+    n = quantidades['receita']
+    ano, mes = sortear_meses(n)
+    planilhas['receita'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'data': _datas(rng, ano, mes),
+        'classificacao': escolher(CLASSIFICACOES['receita'], n),
+        'descricao': escolher(['Empresa', 'Cartola', 'Rendimento'], n),
+        'valor': _valores(rng, n, 3000),
+        'ano': ano,
+    })
+
+    n = quantidades['fixo']
+    ano, mes = sortear_meses(n)
+    planilhas['fixo'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'data': _datas(rng, ano, mes),
+        'classificacao': escolher(CLASSIFICACOES['fixo'], n),
+        'valor': _valores(rng, n, 150),
+        'descricao': escolher(['Aluguel', 'Plano', 'Mensalidade'], n),
+        'fixo_compra_credito': escolher(['', 'Nubank', 'Inter'], n),
+        'ano': ano,
+    })
+
+    n = quantidades['investimento']
+    ano, mes = sortear_meses(n)
+    planilhas['investimento'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'descricao': escolher(['Aporte', 'Resgate'], n),
+        'investimento_tipo': escolher(['CDB', 'Tesouro', 'Ações', 'FII'], n),
+        'data': _datas(rng, ano, mes),
+        'valor': _valores(rng, n, 800),
+        'ano': ano,
+    })
+
+    n = quantidades['emprestimo']
+    ano, mes = sortear_meses(n)
+    planilhas['emprestimo'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'descricao': escolher(['Empréstimo', 'Pagamento'], n),
+        'emprestimo_destinatario': escolher(['Pai', 'Mãe', 'Irmão', 'Amigo'], n),
+        'data': _datas(rng, ano, mes),
+        'valor': _valores(rng, n, 300),
+        'ano': ano,
+    })
+
+    n = quantidades['vr']
+    ano, mes = sortear_meses(n)
+    planilhas['vr'] = pd.DataFrame({
+        'data': _datas(rng, ano, mes),
+        'id_mes': _id_mes(ano, mes),
+        'descricao': escolher(['Almoço', 'Lanche', 'Jantar'], n),
+        'local': escolher(['Restaurante', 'Lanchonete', 'Mercado'], n),
+        'classificacao': escolher(CLASSIFICACOES['vr'], n),
+        'valor': _valores(rng, n, 35),
+        'ano': ano,
+    })
+
+    n = quantidades['patrimonio']
+    ano, mes = sortear_meses(n)
+    planilhas['patrimonio'] = pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'valor': _valores(rng, n, 1000),
+        'direcionamento': escolher(DIRECIONAMENTOS, n),
+        'classificacao': escolher(CLASSIFICACOES['patrimonio'], n),
+        'descricao': escolher(['Sobra', 'Extra'], n),
+        'ano': ano,
+    })
+
+    planilhas['orcamento'] = gerar_orcamento(meses, rng)
+    return planilhas
+
+
+def gerar_orcamento(meses, rng):
+    """Uma linha de orçamento por mês para débito, crédito, sobra e cada receita e gasto fixo."""
+    classes = (['Débito', 'Crédito', 'Sobra', 'Renda', 'Juntar']
+               + CLASSIFICACOES['receita'] + CLASSIFICACOES['fixo'])
+    ano = np.repeat(meses[:, 0], len(classes))
+    mes = np.repeat(meses[:, 1], len(classes))
+    return pd.DataFrame({
+        'id_mes': _id_mes(ano, mes),
+        'classificacao_orcamento': np.tile(np.asarray(classes, dtype=object), len(meses)),
+        'valor_orcamento': _valores(rng, len(ano), 500),
+        'ano': ano,
+    })
+
+
+def para_valores(df):
+    """Converte um DataFrame na lista de linhas (com cabeçalho) que a API do Sheets devolveria."""
+    return [list(df.columns)] + df.astype(object).where(df.notna(), '').to_numpy().tolist()
+
+
+class PlanilhaFalsa:
+    """Planilha em memória com a parte da API do gspread usada pelo espelho e pela escrita."""
+
+    def __init__(self, valores, title='Página1'):
+        self.valores = [list(linha) for linha in valores]
+        self.title = title
+
+    @property
+    def spreadsheet(self):
+        return self
+
+    @property
+    def row_count(self):
+        return max(1000, len(self.valores))
+
+    def values_batch_get(self, ranges, params=None):
+        faixas = []
+        for intervalo in ranges:
+            inicio, fim = intervalo.split('!')[-1].split(':')
+            faixas.append({'values': self.valores[int(inicio) - 1:int(fim)]})
+        return {'valueRanges': faixas}
+
+    def append_rows(self, valores, **kwargs):
+        self.valores.extend(list(linha) for linha in valores)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--linhas', type=int, default=100_000)
+    parser.add_argument('--caminho', default='.espelho/sintetico.sqlite')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # importado aqui: o gerador em si não depende do armazenamento
+    from financas.agregados import AgregadosMensais
+    from financas.armazenamento import ArmazenamentoSQLite
+
+    armazenamento = ArmazenamentoSQLite(args.caminho)
+    AgregadosMensais(armazenamento.espelho)
+    for nome, df in gerar_ledgers(args.linhas, seed=args.seed).items():
+        valores = para_valores(df)
+        armazenamento.espelho.substituir(nome, valores[0], valores[1:])
+        print(f'{nome}: {len(df)} linhas')
+
+
+if __name__ == '__main__':
+    main()
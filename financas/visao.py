@@ -0,0 +1,50 @@
+import pandas as pd
+
+from financas.agregados import agrupado
+from financas.esquema import centavos_para_reais, id_mes_texto, unificar_categorias
+
+
+def montar_visao_mensal(agregado_mensal, orcamento):
+    """Agrupados mensais e orçamento x realizado usados pelas seções de "Status".
+
+    `agregado_mensal` vem de `AgregadosMensais.ler()` e `orcamento` é a planilha de orçamento
+    já tipada. Não depende do streamlit (é usado também pelos benchmarks).
+    """
+    # agrupando planilhas de gastos mensais (a partir dos agregados já materializados, um registro por mês e classificação)
+    fixo_agrupado = agrupado(agregado_mensal, 'fixo')
+    debito_agrupado = agrupado(agregado_mensal, 'debito', ['id_mes'])
+    debito_agrupado['classificacao'] = 'Débito'
+    credito_agrupado = agrupado(agregado_mensal, 'credito', ['id_mes'])
+    credito_agrupado_cartao = agrupado(agregado_mensal, 'credito_cartao').rename(columns={'classificacao': 'credito_cartao'})
+    credito_agrupado['classificacao'] = "Crédito"
+    receita_agrupado = agrupado(agregado_mensal, 'receita')
+    patrimonio_agrupado = agrupado(agregado_mensal, 'patrimonio')
+    resultado_mensal_agrupado = pd.concat([fixo_agrupado, debito_agrupado, credito_agrupado, receita_agrupado, patrimonio_agrupado])
+
+    # juntando o orçamento com o real gasto; o merge é por (id_mes inteiro, classificação categórica) e as contas são em centavos
+    orcamento_mensal = orcamento.copy()
+    orcamento_mensal_gastos = resultado_mensal_agrupado
+    orcamento_mensal['classificacao_orcamento'], orcamento_mensal_gastos['classificacao'] = unificar_categorias(
+        orcamento_mensal['classificacao_orcamento'], orcamento_mensal_gastos['classificacao'])
+    orcamento_unificado = pd.merge(orcamento_mensal, orcamento_mensal_gastos, how='outer',
+                                   left_on=['id_mes', 'classificacao_orcamento'], right_on=['id_mes', 'classificacao'])
+    orcamento_unificado['Saldo'] = (orcamento_unificado['valor_orcamento'] - orcamento_unificado['valor']).where(
+        ~orcamento_unificado['classificacao'].isin(['Renda', 'Juntar']),
+        orcamento_unificado['valor'] - orcamento_unificado['valor_orcamento'])
+
+    # só aqui os centavos voltam a reais e o id_mes ganha o rótulo '01_2025' dos gráficos
+    for coluna in ['valor', 'valor_orcamento', 'Saldo']:
+        orcamento_unificado[coluna] = centavos_para_reais(orcamento_unificado[coluna])
+    orcamento_unificado['mes'] = id_mes_texto(orcamento_unificado['id_mes'])
+
+    return {
+        'agregado_mensal': agregado_mensal,
+        'fixo_agrupado': fixo_agrupado,
+        'debito_agrupado': debito_agrupado,
+        'credito_agrupado': credito_agrupado,
+        'credito_agrupado_cartao': credito_agrupado_cartao,
+        'receita_agrupado': receita_agrupado,
+        'patrimonio_agrupado': patrimonio_agrupado,
+        'orcamento_mensal': orcamento_mensal,
+        'orcamento_unificado': orcamento_unificado,
+    }
@@ -0,0 +1,126 @@
+import pandas as pd
+import streamlit as st
+from financas.agregados import agrupado
+from financas.esquema import centavos_para_reais, formatar_id_mes, id_mes_texto
+from financas.graficos import grafico_barras
+from financas.instrumentacao import fragmento, medir
+from financas.painel import (
+    PLANILHAS_VISAO_MENSAL, bg_color_dash, carregar_pagina, explorar_base, figuras, filtro_anos,
+    parcelas_a_vencer_em_cache, template_dash, versoes, visao_mensal)
+
+
+# página "Crédito": orçamento x realizado, gastos por tipo, parcelas a vencer e a base de crédito
+# lidas inteiras: a base de crédito e o orçamento da visão mensal (os agregados e as linhas pendentes das
+# outras planilhas da visão também entram no cálculo e as parcelas a vencer)
+PLANILHAS = ['credito', 'orcamento']
+
+carregar_pagina(PLANILHAS, sincronizar=PLANILHAS_VISAO_MENSAL)
+
+
+@fragmento
+@medir('Status Crédito')
+def status_credito():
+    # dados usados por esta seção (lidos do cache, só o que ela precisa)
+    visao = visao_mensal()
+    orcamento_unificado = visao['orcamento_unificado']
+    agregado_mensal = visao['agregado_mensal']
+
+    #criacao dos mestricos
+
+    selecao_ano_credito = filtro_anos('credito', key='ano-credito')
+
+
+
+
+    credito_orcamento =  orcamento_unificado[orcamento_unificado['classificacao'] == 'Crédito']
+    credito_orcamento =  credito_orcamento[credito_orcamento['ano'].isin(selecao_ano_credito)]
+
+
+    credito_saldo_ano = credito_orcamento['Saldo'].sum()
+    st.metric(label="Saldo anual", value=f"{round(credito_saldo_ano,2)}") 
+
+    tipo_grafico = st.radio("Escolha a visualização", ['Saldo','valor'],key ="grafico_credito")
+
+
+    with medir('gráfico crédito mensal'):
+        graf_credito_mes = figuras.obter(
+            ('credito_mes', versoes(*PLANILHAS_VISAO_MENSAL), tuple(selecao_ano_credito), tipo_grafico),
+            lambda: grafico_barras(
+                credito_orcamento, 'mes', tipo_grafico, f"# GASTO MENSAL CRÉDITO {tipo_grafico}",
+                template=template_dash, showlegend=False, xaxis_title='Mês', yaxis_title='Saldo', plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_credito_mes, use_container_width=True)
+
+
+    #criação do segundo gráfico
+    credito_agrupado_class =  agrupado(agregado_mensal[agregado_mensal['ano'].isin(selecao_ano_credito)], 'credito')
+
+    cores = ["#fce7d2","#ffefa9","#f58f9a","#c0a1ae", "#bfd4ad","#000018","#578bc6"]
+
+    #transformando o valor de centavos para reais e o id_mes no rótulo '01_2025'
+
+    credito_agrupado_class['valor'] = centavos_para_reais(credito_agrupado_class['valor'])
+    credito_agrupado_class['id_mes'] = id_mes_texto(credito_agrupado_class['id_mes'])
+
+    #criando id_mes "total"
+    total_credito = credito_agrupado_class.groupby('classificacao')['valor'].sum().reset_index()
+    total_credito['id_mes'] = 'Total'
+    total_credito['Percentual'] = (total_credito['valor'] / total_credito['valor'].sum()) * 100
+    credito_agrupado_class = pd.concat([credito_agrupado_class, total_credito], ignore_index=True)
+
+    #criando coluna de gastos percentuais
+    credito_agrupado_class['Percentual'] = (credito_agrupado_class['valor'] / credito_agrupado_class.groupby('id_mes')['valor'].transform('sum')) * 100
+    credito_agrupado_class['Percentual'] = credito_agrupado_class['Percentual'].round(2)
+
+    radio_graf_credito_class = st.radio("Escolha a visualização", ['Percentual','valor'], key='radio_grafico_class_credito')
+
+    #se o radio for igual a valor o "total" não aparece porque desconsidguraa
+    #além disso se o valor for clicado aparece um metric com o gasto médio e filtro de classificação caso seja do interesse ter uma visão de gasto por classificação
+    if radio_graf_credito_class == 'valor':
+        credito_agrupado_class = credito_agrupado_class[credito_agrupado_class['id_mes'] != 'Total']
+        meses_totais =  agregado_mensal.loc[agregado_mensal['ledger'] == 'credito', 'id_mes'].nunique()
+
+
+        credito_agrupado_class_unico = credito_agrupado_class['classificacao'].unique()
+        selected_classes = st.multiselect('Filtre as classificações:',credito_agrupado_class_unico, list(credito_agrupado_class_unico))
+        credito_agrupado_class = credito_agrupado_class[credito_agrupado_class['classificacao'].isin(selected_classes)]
+        credito_agrupado_class_media = round(credito_agrupado_class['valor'].sum()/meses_totais,2)
+
+        st.metric(label="Média mensal", value=f"{round(credito_agrupado_class_media,2)}") 
+
+    else:
+        #se o radio for percentual apenas mostra o gráfico
+        credito_agrupado_class = credito_agrupado_class
+
+    ordem_classificacao_credito = ['Presente Pitica', 'Roupas', 'Compras Minhas', 'Outros','Presentes - Família','Juros/Anuidade','Faturas 2023']  # Exemplo de ordem que você pode ajustar
+    credito_agrupado_class['classificacao'] = pd.Categorical(credito_agrupado_class['classificacao'], categories=ordem_classificacao_credito, ordered=True)
+    credito_agrupado_class = credito_agrupado_class.sort_values(by=['id_mes', 'classificacao'])
+
+    with medir('gráfico crédito por tipo'):
+        graf_credito_class = figuras.obter(
+            ('credito_class', versoes(*PLANILHAS_VISAO_MENSAL), tuple(selecao_ano_credito), radio_graf_credito_class,
+             tuple(selected_classes) if radio_graf_credito_class == 'valor' else None),
+            lambda: grafico_barras(
+                credito_agrupado_class, 'id_mes', radio_graf_credito_class,
+                f"# GASTO CRÉDITO POR TIPO - {radio_graf_credito_class}",
+                cores=cores, color='classificacao', template=template_dash,
+                category_orders={'id_mes': credito_agrupado_class['id_mes'].unique(), 'classificacao': ordem_classificacao_credito},
+                xaxis_title='Mês', yaxis_title='valor', plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_credito_class, use_container_width=True)
+
+    st.title('Parcelas a vencer')
+    a_vencer = parcelas_a_vencer_em_cache()
+    st.metric(label="Total comprometido nos próximos 12 meses", value=f"{round(a_vencer.to_numpy().sum(), 2)}")
+    if not a_vencer.empty:
+        a_vencer.loc['Total'] = a_vencer.sum()
+        st.dataframe(a_vencer, use_container_width=True)
+
+    st.title('Base Crédito')
+
+    explorar_base('credito', [
+        ('id_mes', 'Selecione o mês', formatar_id_mes),
+        ('classificacao', 'Selecione a classificação', str),
+        ('credito_cartao', 'Selecione o cartão', str),
+    ], chave='base-credito', anos=selecao_ano_credito)
+
+st.header('Status Crédito')
+status_credito()
@@ -0,0 +1,129 @@
+import pandas as pd
+import streamlit as st
+from financas.agregados import agrupado
+from financas.esquema import centavos_para_reais, formatar_id_mes, id_mes_texto
+from financas.graficos import grafico_barras
+from financas.instrumentacao import fragmento, medir
+from financas.painel import (
+    PLANILHAS_VISAO_MENSAL, bg_color_dash, carregar_pagina, explorar_base, figuras, filtro_anos, template_dash,
+    versoes, visao_mensal)
+
+
+# página "Débito": orçamento x realizado, gastos por tipo e a base de débito
+# lidas inteiras: a base de débito e o orçamento da visão mensal (os agregados e as linhas pendentes das
+# outras planilhas da visão também entram no cálculo)
+PLANILHAS = ['debito', 'orcamento']
+
+carregar_pagina(PLANILHAS, sincronizar=PLANILHAS_VISAO_MENSAL)
+
+
+@fragmento
+@medir('Status Débito')
+def status_debito():
+    # dados usados por esta seção (lidos do cache, só o que ela precisa)
+    visao = visao_mensal()
+    orcamento_unificado = visao['orcamento_unificado']
+    agregado_mensal = visao['agregado_mensal']
+
+    #criacao dos mestricos
+
+    selecao_ano_debito = filtro_anos('debito', key='ano-debito')
+
+
+    debito_orcamento =  orcamento_unificado[orcamento_unificado['classificacao'] == 'Débito']
+    debito_orcamento =  debito_orcamento[debito_orcamento['ano'].isin(selecao_ano_debito)]
+
+
+    col1, col2, col3 =  st.columns(3)
+    with col1:
+        debito_saldo_atual  = debito_orcamento['Saldo'].iloc[-1]
+        st.metric(label="Saldo atual", value=f"{round(debito_saldo_atual,2)}") 
+    with col2: 
+        debito_saldo_ano = debito_orcamento['Saldo'].sum()
+        st.metric(label="Saldo anual", value=f"{round(debito_saldo_ano,2)}") 
+    with col3:
+        debito_media_mensal = debito_orcamento['valor'].mean()
+        st.metric(label="Média mensal", value=f"{round(debito_media_mensal,2)}") 
+
+
+    #primeiro gráfico que traz uma visão geral de gastos
+    tipo_grafico = st.radio("Escolha a visualização", ['Saldo','valor'])
+
+
+    with medir('gráfico débito mensal'):
+        graf_debito_mes = figuras.obter(
+            ('debito_mes', versoes(*PLANILHAS_VISAO_MENSAL), tuple(selecao_ano_debito), tipo_grafico),
+            lambda: grafico_barras(
+                debito_orcamento, 'mes', tipo_grafico, f"# GASTO MENSAL DÉBITO {tipo_grafico}",
+                template=template_dash, showlegend=False, xaxis_title='Mês', yaxis_title='Saldo', plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_debito_mes, use_container_width=True)
+
+    #criação do segundo gráfico
+    debito_agrupado_class =  agrupado(agregado_mensal[agregado_mensal['ano'].isin(selecao_ano_debito)], 'debito')
+
+    cores = ["#fce7d2","#ffefa9","#f58f9a","#c0a1ae", "#bfd4ad","#000018","#578bc6"]
+
+    #transformando o valor de centavos para reais e o id_mes no rótulo '01_2025'
+
+    debito_agrupado_class['valor'] = centavos_para_reais(debito_agrupado_class['valor'])
+    debito_agrupado_class['id_mes'] = id_mes_texto(debito_agrupado_class['id_mes'])
+
+    #criando id_mes "total"
+    total_debito = debito_agrupado_class.groupby('classificacao')['valor'].sum().reset_index()
+    total_debito['id_mes'] = 'Total'
+    total_debito['Percentual'] = (total_debito['valor'] / total_debito['valor'].sum()) * 100
+    debito_agrupado_class = pd.concat([debito_agrupado_class, total_debito], ignore_index=True)
+
+    #criando coluna de gastos percentuais
+    debito_agrupado_class['Percentual'] = (debito_agrupado_class['valor'] / debito_agrupado_class.groupby('id_mes')['valor'].transform('sum')) * 100
+    debito_agrupado_class['Percentual'] = debito_agrupado_class['Percentual'].round(2)
+
+    #radio para filtrar tipo de visualização
+
+    radio_graf_debito_class = st.radio("Escolha a visualização", ['Percentual','valor',])
+
+    #se o radio for igual a valor o "total" não aparece porque desconsidguraa
+    #além disso se o valor for clicado aparece um metric com o gasto médio e filtro de classificação caso seja do interesse ter uma visão de gasto por classificação
+    if radio_graf_debito_class == 'valor':
+        debito_agrupado_class = debito_agrupado_class[debito_agrupado_class['id_mes'] != 'Total']
+        meses_totais =  agregado_mensal.loc[agregado_mensal['ledger'] == 'debito', 'id_mes'].nunique()
+
+
+        debito_agrupado_class_unico = debito_agrupado_class['classificacao'].unique()
+        selected_classes = st.multiselect('Filtre as classificações:',debito_agrupado_class_unico, list(debito_agrupado_class_unico))
+        debito_agrupado_class = debito_agrupado_class[debito_agrupado_class['classificacao'].isin(selected_classes)]
+        debito_agrupado_class_media = round(debito_agrupado_class['valor'].sum()/meses_totais,2)
+
+        st.metric(label="Média mensal", value=f"{round(debito_agrupado_class_media,2)}") 
+
+    else:
+        #se o radio for percentual apenas mostra o gráfico
+        debito_agrupado_class = debito_agrupado_class
+
+    #ajustando a ordem
+    ordem_classificacao = ['Necessidade', 'Aplicativo de Transporte', 'Comida', 'Lazer - Comida','Lazer - Corinthians','Lazer - Outros','Outros']  # Exemplo de ordem que você pode ajustar
+    debito_agrupado_class['classificacao'] = pd.Categorical(debito_agrupado_class['classificacao'], categories=ordem_classificacao, ordered=True)
+    debito_agrupado_class = debito_agrupado_class.sort_values(by=['id_mes', 'classificacao'])
+
+    with medir('gráfico débito por tipo'):
+        graf_debito_class = figuras.obter(
+            ('debito_class', versoes(*PLANILHAS_VISAO_MENSAL), tuple(selecao_ano_debito), radio_graf_debito_class,
+             tuple(selected_classes) if radio_graf_debito_class == 'valor' else None),
+            lambda: grafico_barras(
+                debito_agrupado_class, 'id_mes', radio_graf_debito_class,
+                f"# GASTO DÉBITO POR TIPO - {radio_graf_debito_class}",
+                cores=cores, color='classificacao', template=template_dash,
+                category_orders={'id_mes': debito_agrupado_class['id_mes'].unique(), 'classificacao': ordem_classificacao},
+                xaxis_title='Mês', yaxis_title='valor', plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_debito_class, use_container_width=True)
+
+
+    st.title('Base Débito')
+
+    explorar_base('debito', [
+        ('id_mes', 'Selecione o mês', formatar_id_mes),
+        ('classificacao', 'Selecione a classificação', str),
+    ], chave='base-debito', anos=selecao_ano_debito)
+
+st.header('Status Débito')
+status_debito()
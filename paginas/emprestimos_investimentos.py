@@ -0,0 +1,62 @@
+import pandas as pd
+import streamlit as st
+from financas.esquema import centavos_para_reais
+from financas.graficos import grafico_barras
+from financas.instrumentacao import fragmento, medir
+from financas.painel import (
+    SOMAS, bg_color_dash, carregar_pagina, explorar_base, figuras, somas_com_pendentes, template_dash, versoes)
+
+
+# página "Empréstimos e investimentos": totais por pessoa e as bases das duas planilhas
+# as duas bases são lidas inteiras; os totais vêm das somas acumuladas
+PLANILHAS = ['emprestimo', 'investimento']
+
+carregar_pagina(PLANILHAS, sincronizar=SOMAS)
+
+
+@fragmento
+@medir('Status Emprestimos')
+def status_emprestimos():
+    # totais por pessoa das somas acumuladas, sem reler a planilha
+    somas = somas_com_pendentes()
+
+
+
+    destinatarios = [d for d in somas.chaves('emprestimo') if d != 'Pai']
+    valor_total_emprestado = round((somas.saldo('emprestimo') - somas.saldo('emprestimo', 'Pai')) / 100,2) 
+    st.metric(label="Valor total emprestado", value=valor_total_emprestado)
+    emprestimo_agrupado_destinatario = pd.DataFrame({
+        'emprestimo_destinatario': destinatarios, 'valor': [somas.saldo('emprestimo', d) for d in destinatarios]})
+    emprestimo_agrupado_destinatario = emprestimo_agrupado_destinatario[emprestimo_agrupado_destinatario['valor'] != 0]
+    emprestimo_agrupado_destinatario['valor'] = centavos_para_reais(emprestimo_agrupado_destinatario['valor'])
+
+
+    with medir('gráfico empréstimos'):
+        graf_emprestimo = figuras.obter(
+            ('emprestimo', versoes('emprestimo')),
+            lambda: grafico_barras(
+                emprestimo_agrupado_destinatario, 'emprestimo_destinatario', 'valor', "# VALOR EMPRESTADO POR PESSOA",
+                template=template_dash, showlegend=False, xaxis_title='Pessoa', yaxis_title='Valor total',
+                plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_emprestimo, use_container_width=True)
+
+
+    # a tabela segue sem o 'Pai', como o total acima
+    explorar_base('emprestimo', [
+        ('emprestimo_destinatario', 'Selecione a pessoa', str),
+    ], chave='base-emprestimo', filtros_fixos={'emprestimo_destinatario': destinatarios})
+
+st.header('Status Emprestimos')
+status_emprestimos()
+
+
+@fragmento
+@medir('Status Investimentos')
+def status_investimentos():
+    # tabela paginada, consultada no DuckDB
+    explorar_base('investimento', [
+        ('investimento_tipo', 'Selecione o tipo', str),
+    ], chave='base-investimento')
+
+st.header('Status Investimentos')
+status_investimentos()
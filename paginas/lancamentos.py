@@ -0,0 +1,486 @@
+import pandas as pd
+import streamlit as st
+from datetime import date
+from financas.esquema import CARTOES, CLASSIFICACOES, ano_do_id_mes, meses_do_ano
+from financas.importacao import importar
+from financas.instrumentacao import fragmento
+from financas.painel import abrir_indice_classificacao, abrir_indice_duplicatas, armazenamento
+
+
+# página "Adicionar dados": os formulários só escrevem na fila de escrita, então nenhuma planilha
+# é lida para abrir a página e ela não chama carregar_pagina (os índices de classificação e de
+# repetidos abrem no primeiro uso, e a planilha usada por eles ou pelo envio é sincronizada ali se
+# ainda não tiver cópia local)
+
+# meses oferecidos nos formulários: os do ano passado e os deste ano, já no mês atual
+MESES_REFERENCIA = meses_do_ano(date.today().year - 1) + meses_do_ano(date.today().year)
+MES_ATUAL = 12 + date.today().month - 1
+
+# planilhas que aceitam importação de extrato, com o nome mostrado na tela
+IMPORTACAO_DESTINOS = {'debito': 'Débito', 'credito': 'Crédito', 'vr': 'VR'}
+
+# classificação sugerida pela descrição (sem descrição não há sugestão, e o índice nem é aberto)
+def sugerir(nome, descricao):
+    if not descricao or not descricao.strip():
+        return None
+    return abrir_indice_classificacao().sugerir(nome, descricao)
+
+def indice_sugerido(nome, sugestao):
+    opcoes = CLASSIFICACOES[nome]
+    return opcoes.index(sugestao) if sugestao in opcoes else 0
+
+# clique duplo no "Adicionar" (ou o mesmo gasto lançado de novo) não grava em dobro: o lançamento
+# repetido espera a confirmação que `confirmar_repetidos` mostra embaixo do formulário
+def anexar_sem_repetir(nome, df):
+    if abrir_indice_duplicatas().duplicadas(nome, df).any():
+        st.session_state[f'repetidos-{nome}'] = df
+    else:
+        armazenamento.anexar(nome, df)
+        acompanhar_fila()
+
+def confirmar_repetidos(nome):
+    chave = f'repetidos-{nome}'
+    if chave not in st.session_state:
+        return
+    st.warning('Esse lançamento já existe (mesmo mês, data, descrição e valor) e não foi adicionado de novo.')
+    coluna_sim, coluna_nao = st.columns(2)
+    if coluna_sim.button('Adicionar mesmo assim', key=f'{chave}-sim'):
+        armazenamento.anexar(nome, st.session_state.pop(chave))
+        acompanhar_fila()
+        st.rerun(scope='fragment')
+    coluna_nao.button('Cancelar', key=f'{chave}-nao', on_click=st.session_state.pop, args=(chave, None))
+
+
+# os formulários só colocam as linhas na fila de escrita; o envio para o Sheets é feito em lotes,
+# em segundo plano, e aqui aparece o que ainda falta enviar ou o que falhou
+# o status só confere sozinho (a cada 3s) enquanto há lançamentos esperando envio: com a fila vazia o
+# fragmento fica parado, e a página roda de novo inteira quando isso muda (linhas novas ou fila esvaziada)
+def _pendentes_na_fila():
+    fila = armazenamento.fila
+    if fila is None:
+        return {}
+    return {nome: estados['pendente'] for nome, estados in fila.situacao().items() if estados['pendente']}
+
+fila_acompanhada = bool(_pendentes_na_fila())
+
+def acompanhar_fila():
+    if armazenamento.fila is not None and not fila_acompanhada:
+        st.rerun(scope='app')
+
+@fragmento(run_every=3 if fila_acompanhada else None)
+def fila_de_envio():
+    fila = armazenamento.fila
+    if fila is None:
+        return
+    pendentes = _pendentes_na_fila()
+    if bool(pendentes) != fila_acompanhada:
+        # a fila esvaziou (ou voltou a ter linhas, como no "Tentar enviar de novo"): liga ou desliga o run_every
+        st.rerun(scope='app')
+    if pendentes:
+        st.info(f'{sum(pendentes.values())} lançamento(s) aguardando envio para o Google Sheets: '
+                + ', '.join(f'{nome} ({quantidade})' for nome, quantidade in pendentes.items()))
+    falhas = fila.falhas()
+    if not falhas.empty:
+        st.error(f'{len(falhas)} lançamento(s) não foram enviados para o Google Sheets.')
+        with st.expander('Ver lançamentos com falha'):
+            st.dataframe(falhas, hide_index=True)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button('Tentar enviar de novo', key='fila-reenviar', on_click=fila.reenviar, args=(list(falhas['id']),))
+            with col2:
+                st.button('Descartar', key='fila-descartar', on_click=fila.descartar, args=(list(falhas['id']),))
+
+fila_de_envio()
+
+@fragmento
+def form_debito():
+    st.title('Débito')
+
+    #adicionando dados relativos a aba de débito: incluem a data, a classificação, o valor, a descrição
+    novos_debitos = []
+
+    # a descrição fica fora do formulário para a classificação já vir sugerida pelo histórico
+    debito_descricao = st.text_input('Insirir Descrição', key="inserir-descricao-debito")
+    debito_sugestao = sugerir('debito', debito_descricao)
+
+    with st.form('form débito'):
+        # Campos para inserir as informações do débito
+        debito_mes_ref = st.selectbox('Selecione o mês referência:', 
+                                    MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_debito')
+
+        debito_data = st.text_input('Insirir Data', key="inserir-data-debito")
+
+        debito_classificacao = st.selectbox('Selecione o tipo:', CLASSIFICACOES['debito'],
+                                        index=indice_sugerido('debito', debito_sugestao), key=f'class-debito-{debito_sugestao}')
+
+        debito_valor = st.text_input('Insirir Valor', key="inserir-valor-debito")
+        debito_compracredito = st.selectbox('Selecione o tipo:', 
+                                        ['Não', 'Sim, com pagamento', 'Sim, sem pagamento'], key='compra-credito-debito')
+
+        # Verificação de valor (caso esteja vazio, coloca 1.0 como padrão)
+        if debito_valor == "":
+            debito_valor = 1.0
+        else:
+            debito_valor = float(debito_valor)
+
+        # Definindo data padrão caso o campo esteja vazio
+        if debito_data == "":
+            debito_data = "08/02/2000"
+
+        # Botão de envio do formulário
+        submit_button = st.form_submit_button("Adicionar Débito")
+
+        if submit_button:
+
+
+            # Adiciona o novo débito à lista de débitos
+            novo_debito = [debito_mes_ref, debito_data, debito_classificacao, debito_descricao, debito_compracredito, debito_valor, ano_do_id_mes(debito_mes_ref)]
+            novos_debitos.append(novo_debito)
+
+            novos_debitos_df = pd.DataFrame(novos_debitos, columns=["id_mes", "data", "classificacao", "descricao", "debito_compra_credito", "valor",'ano'])
+            anexar_sem_repetir('debito', novos_debitos_df)
+
+    confirmar_repetidos('debito')
+
+with st.expander('Débito'):
+    form_debito()
+
+@fragmento
+def form_credito():
+
+    st.title('Crédito')
+
+    credito_parcelas =  st.number_input('Inserir Parcelas', value=1, min_value=1, step=1)
+    meses_disponiveis = MESES_REFERENCIA
+    credito_mes_parcela1 = st.selectbox('Selecione o mês inicial',  meses_disponiveis, index=MES_ATUAL) 
+    credito_valor = st.text_input('Insirir Valor Crédito', key = 'insirir-valor-credito')
+    credito_descrição =  st.text_input('Insirir Descrição', key = 'insirir-descricao-credito')
+    credito_sugestao = sugerir('credito', credito_descrição)
+    credito_classificacao = st.selectbox('Selecione o tipo:', CLASSIFICACOES['credito'], index=indice_sugerido('credito', credito_sugestao), key=f'class-credito-{credito_sugestao}')
+    credito_cartao = st.selectbox('Selecione o cartão:', CARTOES, key='cartao-credito')
+
+
+    if credito_valor == "":
+        credito_valor = 100.0
+    else:
+        credito_valor = credito_valor
+
+    credito_valor = float(credito_valor)
+
+    valor_parcela = round(credito_valor / credito_parcelas, 2)
+
+
+
+    novos_creditos = []  # Inicializa a lista antes de usá-la
+
+    # Exibir formulário no Streamlit
+    with st.form('form credito'):
+        if st.form_submit_button('Adicionar Gasto Crédito'):
+            # uma linha só por compra (mês da 1ª parcela, quantidade, valor da parcela): as parcelas
+            # viram meses na leitura e nos agregados (financas.parcelas)
+            novo_credito = [credito_mes_parcela1, credito_cartao, credito_descrição, credito_classificacao, valor_parcela, ano_do_id_mes(credito_mes_parcela1), int(credito_parcelas)]
+            novos_creditos.append(novo_credito)
+            novos_creditos_df = pd.DataFrame(novos_creditos, columns=['id_mes', 'credito_cartao','descricao','classificacao','valor','ano','parcelas'])
+
+            anexar_sem_repetir('credito', novos_creditos_df)
+
+    confirmar_repetidos('credito')
+
+with st.expander('Crédito'):
+    form_credito()
+
+@fragmento
+def form_receita():
+    st.title("Receita")
+    novos_receitas = []
+    with st.form('form receita'):
+        receita_data = st.text_input('Insirir Data',key = 'insirir-data-receita ')
+        receita_id_mes = st.selectbox('Selecione o mês referência:', MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_receita')
+        if receita_data  == "":
+            receita_data = "08/02/2000"
+        else:
+            receita_data = receita_data    
+
+
+        receita_descrição =  st.text_input('Insirir Descrição', key = 'insirir-descricao-receita')
+        receita_classificacao = st.selectbox('Selecione o tipo:', CLASSIFICACOES['receita'], key='class-receita')
+
+        receita_valor = st.text_input('Insirir Valor', key = 'insirir-valor-receita')
+
+        if receita_valor == "":
+            receita_valor = 1.0
+        else:
+            receita_valor = receita_valor
+
+        receita_valor = float(receita_valor)
+
+
+
+        submit_button = st.form_submit_button("Adicionar Receita")
+
+        if submit_button:
+            novo_receita = [receita_id_mes, receita_data,  receita_classificacao, receita_descrição, receita_valor, ano_do_id_mes(receita_id_mes)]
+            novos_receitas.append(novo_receita)
+            novos_receitas_df = pd.DataFrame(novos_receitas, columns=['id_mes', 'data','classificacao','descricao','valor','ano'])
+
+
+
+            anexar_sem_repetir('receita', novos_receitas_df)
+
+    confirmar_repetidos('receita')
+
+with st.expander("Receita"): 
+    form_receita()
+
+@fragmento
+def form_fixos():
+    st.title('Fixos')
+    novos_fixos = []
+    with st.form('form fixo'):
+        fixos_mes_ref = st.selectbox('Selecione o mês referência:', MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_fixos')
+
+        fixos_data = st.text_input('Insirir Data', key = "inserir-data-fixos")
+        fixos_descrição =  st.text_input('Insirir Descrição', key = "inserir-descricao-fixos")
+
+        fixos_classificacao = st.selectbox('Selecione o tipo:', CLASSIFICACOES['fixo'], key='class-fixos')
+        fixos_valor = st.text_input('Insirir Valor', key = "inserir-valor-fixos")
+
+        if fixos_valor == "":
+            fixos_valor = 1.0
+        else:
+            fixos_valor = fixos_valor
+
+        fixos_valor = float(fixos_valor)
+
+        if fixos_data  == "":
+            fixos_data = "08/02/2000"
+        else:
+            fixos_data = fixos_data    
+
+        fixos_algumcredito =  st.selectbox('Gasto em algum crédito?:', ['', 'Nubank','Inter' ], key='class-algumcredito_fixos')
+
+
+        submit_button = st.form_submit_button("Adicionar Fixo")
+
+        if submit_button:
+            novo_fixo= [fixos_mes_ref, fixos_data,fixos_classificacao, fixos_valor , fixos_descrição ,fixos_algumcredito, ano_do_id_mes(fixos_mes_ref)]
+            novos_fixos.append(novo_fixo)
+            novos_fixos_df = pd.DataFrame(novos_fixos, columns=['id_mes', 'data','classificacao','valor','descricao','fixo_compra_credito','ano'])
+
+            anexar_sem_repetir('fixo', novos_fixos_df)
+
+    confirmar_repetidos('fixo')
+
+with st.expander('Fixos'):
+    form_fixos()
+
+@fragmento
+def form_patrimonio():
+    novos_patrimonios = []
+
+    with st.form('form patrimonio'):
+        patrimonio_mes_ref = st.selectbox('Selecione o mês referência:', MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_patrimonio')
+
+        patrimonio_valor = st.text_input('Insirir Valor', key = "inserir-valor-patrimonio")
+
+        if patrimonio_valor == "":
+            patrimonio_valor = 1.0
+        else:
+            patrimonio_valor = patrimonio_valor
+
+        patrimonio_valor = float(patrimonio_valor)
+        patrimonio_direcionamento = st.selectbox('Selecione o direcionamento:', ['Patrimônio', 'Reserva Férias'], key='direcionamento-patrimonio')
+        patrimonio_classificacao = st.selectbox('Selecione a classificacação:', CLASSIFICACOES['patrimonio'], key='class-patrimonio')
+        patrimonio_descricao =  st.text_input('Insirir Descrição', key = "inserir-descricao-patrimonio")
+
+        submit_button = st.form_submit_button("Adicionar Patrimônio")
+
+        if submit_button:
+            novo_patrimonio= [patrimonio_mes_ref, patrimonio_valor,patrimonio_direcionamento, patrimonio_classificacao , patrimonio_descricao, ano_do_id_mes(patrimonio_mes_ref)]
+
+            novos_patrimonios.append(novo_patrimonio)
+            novos_patrimonios_df = pd.DataFrame(novos_patrimonios, columns=['id_mes', 'valor','direcionamento','classificacao','descricao','ano'])
+
+            anexar_sem_repetir('patrimonio', novos_patrimonios_df)
+
+    confirmar_repetidos('patrimonio')
+
+with st.expander('Patrimônio'):
+    form_patrimonio()
+
+@fragmento
+def form_investimentos():
+    st.title('Investimentos')
+
+    novos_investimentos = []
+    with st.form('form investimentos'):
+
+        investimentos_mes_ref = st.selectbox('Selecione o mês referência:', MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_investimentos')
+
+        investimentos_descrição =  st.text_input('Insirir Descrição', key = "inserir-descricao-investimentos")
+        investimentos_tipo =  st.text_input('Insirir Tipo Investimentos', key = "inserir-tipo-investimentos")
+        investimentos_data = st.text_input('Insirir Data', key = "inserir-data-investimentos")
+        investimentos_valor = st.text_input('Insirir Valor', key = "inserir-valor-investimentos")
+
+        if investimentos_valor == "":
+            investimentos_valor = 1.0
+        else:
+            investimentos_valor = investimentos_valor
+
+        investimentos_valor = float(investimentos_valor)
+
+        if investimentos_data  == "":
+            investimentos_data = "08/02/2000"
+        else:
+            investimentos_data = investimentos_data  
+
+
+        submit_button = st.form_submit_button("Adicionar Investimento")
+
+        if submit_button:
+            novos_investimento= [investimentos_mes_ref, investimentos_descrição,investimentos_tipo, investimentos_data, investimentos_valor, ano_do_id_mes(investimentos_mes_ref)]
+            novos_investimentos.append(novos_investimento)
+            novos_investimentos_df = pd.DataFrame(novos_investimentos, columns=['id_mes', 'descricao','investimento_tipo','data','valor','ano'])
+
+            anexar_sem_repetir('investimento', novos_investimentos_df)
+
+    confirmar_repetidos('investimento')
+
+with st.expander('Investimentos'):
+    form_investimentos()
+
+
+@fragmento
+def form_emprestimos():
+    st.title('Empréstimos')
+    novos_emprestimos = []
+    with st.form('form emprestimos'):
+        emprestimos_mes_ref = st.selectbox('Selecione o mês referência:', MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_emprestimos')
+
+        emprestimos_descrição =  st.text_input('Insirir Descrição', key = "inserir-descricao-emprestimos")
+        emprestimos_destinatario =  st.text_input('Insirir Destinatário', key = "inserir-destinatario-emprestimos")
+
+        emprestimos_data = st.text_input('Insirir Data', key = "inserir-data-emprestimos")
+        emprestimos_valor = st.text_input('Insirir Valor', key = "inserir-valor-emprestimos")
+
+        if emprestimos_valor == "":
+            emprestimos_valor = 1.0
+        else:
+            emprestimos_valor = emprestimos_valor
+
+        emprestimos_valor = float(emprestimos_valor)
+
+        if emprestimos_data  == "":
+            emprestimos_data = "08/02/2000"
+        else:
+            emprestimos_data = emprestimos_data
+
+
+        submit_button = st.form_submit_button("Adicionar Fixo")
+
+        if submit_button:
+            novo_emprestimo= [emprestimos_mes_ref, emprestimos_descrição,emprestimos_destinatario, emprestimos_data, emprestimos_valor, ano_do_id_mes(emprestimos_mes_ref)]
+            novos_emprestimos.append(novo_emprestimo)
+            novos_emprestimos_df = pd.DataFrame(novos_emprestimos, columns=['id_mes', 'descricao','emprestimo_destinatario','data','valor','ano'])
+
+            anexar_sem_repetir('emprestimo', novos_emprestimos_df)
+
+    confirmar_repetidos('emprestimo')
+
+with st.expander('Empréstimos'):
+    form_emprestimos()
+
+
+
+
+@fragmento
+def form_vr():
+        st.title('VR')
+        novos_vrs = []
+        # descrição fora do formulário, como no débito, para sugerir a classificação
+        vr_descrição =  st.text_input('Insirir Descrição', key = 'insirir-descricao-vr')
+        vr_sugestao = sugerir('vr', vr_descrição)
+        with st.form('form vr'):
+            #adicionando dados relativos a aba de débito: incluem a data, a classificação, o valor, a descrição
+
+            #a partir do calculo de data conseguimos ter o mes e jogamos lá
+            vr_mes_ref = st.selectbox('Selecione o mês referência:', MESES_REFERENCIA, index=MES_ATUAL, key='class-mesref_vr')
+
+            vr_data = st.text_input('Insirir Data',key = 'insirir-data-vr')
+            vr_local =  st.text_input('Insirir Local', key = 'insirir-local-vr')
+            vr_classificacao = st.selectbox('Selecione o tipo:', CLASSIFICACOES['vr'], index=indice_sugerido('vr', vr_sugestao), key=f'class-vr-{vr_sugestao}')
+            vr_valor = st.text_input('Insirir Valor', key = 'insirir-valor-vr')
+
+            if vr_valor == "":
+                vr_valor = 1.0
+            else:
+                vr_valor = vr_valor
+
+            vr_valor = float(vr_valor)
+
+            if vr_data  == "":
+                vr_data = "08/02/2000"
+            else:
+                vr_data = vr_data    
+
+
+
+            submit_button = st.form_submit_button("Adicionar VR")
+
+            if submit_button:
+                novo_vr = [ vr_data, vr_mes_ref, vr_descrição,vr_local,  vr_classificacao, vr_valor, ano_do_id_mes(vr_mes_ref)]
+                novos_vrs.append(novo_vr)
+                novos_vrs_df = pd.DataFrame(novos_vrs, columns=['data', 'id_mes', 'descricao','local','classificacao','valor','ano'])
+
+                anexar_sem_repetir('vr', novos_vrs_df)
+
+        confirmar_repetidos('vr')
+
+with st.expander('VR'):
+    form_vr()
+
+@fragmento
+def form_importar_extrato():
+    st.title('Importar extrato')
+    st.caption('Lê o CSV ou OFX do banco em blocos e manda só os gastos para a planilha escolhida.')
+
+    extrato = st.file_uploader('Arquivo do extrato ou da fatura', type=['csv', 'ofx', 'txt'], key='arquivo-extrato')
+    extrato_destino = st.selectbox('Importar para:', list(IMPORTACAO_DESTINOS), format_func=IMPORTACAO_DESTINOS.get, key='destino-extrato')
+    extrato_cartao = None
+    if extrato_destino == 'credito':
+        extrato_cartao = st.selectbox('Selecione o cartão:', CARTOES, key='cartao-extrato')
+    extrato_classificacao = st.selectbox('Classificação dos lançamentos:', CLASSIFICACOES[extrato_destino],
+                                         index=len(CLASSIFICACOES[extrato_destino]) - 1, key=f'class-extrato-{extrato_destino}')
+    extrato_sem_repetidos = st.checkbox('Pular lançamentos que já existem', value=True, key='pular-repetidos-extrato')
+    extrato_pelo_historico = st.checkbox('Classificar pelo histórico (a classificação acima fica para o que não for reconhecido)',
+                                         value=True, key='historico-extrato')
+    # extrato de conta traz os gastos negativos; a fatura em CSV costuma trazer positivos
+    fatura_csv = extrato_destino == 'credito' and extrato is not None and not extrato.name.lower().endswith('.ofx')
+    extrato_negativos = st.checkbox('Gastos vêm com valor negativo', value=not fatura_csv,
+                                    key=f'negativos-extrato-{extrato_destino}-{fatura_csv}')
+
+    if st.button('Importar', key='importar-extrato', disabled=extrato is None):
+        try:
+            classificar = None
+            if extrato_pelo_historico:
+                classificar = lambda descricoes: abrir_indice_classificacao().classificar(extrato_destino, descricoes)
+            resultado = importar(extrato, extrato.name, extrato_destino, armazenamento.anexar, extrato_negativos,
+                                 cartao=extrato_cartao, classificacao=extrato_classificacao, classificar=classificar,
+                                 duplicadas=abrir_indice_duplicatas().duplicadas if extrato_sem_repetidos else None)
+        except ValueError as erro:
+            st.error(f'Não foi possível importar {extrato.name}: {erro}')
+        else:
+            # o resumo fica guardado com o arquivo: a página pode rodar de novo inteira para o status da fila
+            st.session_state['resultado-extrato'] = (extrato.file_id, (
+                f"{resultado['importadas']} lançamentos importados para {IMPORTACAO_DESTINOS[extrato_destino]} "
+                f"({resultado['ignoradas']} ignorados: entradas, pagamentos ou linhas sem data/valor; "
+                f"{resultado['repetidas']} já existiam)."))
+            if resultado['importadas']:
+                acompanhar_fila()
+
+    arquivo_importado, resumo = st.session_state.get('resultado-extrato', (None, None))
+    if extrato is not None and extrato.file_id == arquivo_importado:
+        st.success(resumo)
+
+with st.expander('Importar extrato'):
+    form_importar_extrato()
@@ -0,0 +1,142 @@
+import pandas as pd
+import streamlit as st
+from financas.dre import comparativo_mensal, dre_dos_meses
+from financas.esquema import centavos_para_reais, formatar_id_mes
+from financas.instrumentacao import fragmento, medir
+from financas.painel import PLANILHAS_VISAO_MENSAL, carregar_pagina, matriz_dre_em_cache, visao_mensal
+
+
+# página "Mês atual": DRE dos meses escolhidos, dos agregados mensais (só o orçamento é lido da planilha)
+PLANILHAS = ['orcamento']
+
+carregar_pagina(PLANILHAS, sincronizar=PLANILHAS_VISAO_MENSAL)
+
+
+@fragmento
+@medir('Status Mês atual')
+def status_mes_atual():
+    # dados usados por esta seção (lidos do cache, só o que ela precisa)
+    visao = visao_mensal()
+    orcamento_unificado = visao['orcamento_unificado']
+
+
+
+
+    orcamento_unificado_debito = orcamento_unificado[orcamento_unificado['classificacao'] == "Débito"]
+    orcamento_unificado_debito = orcamento_unificado_debito.sort_values(by='id_mes')
+
+
+    meses = orcamento_unificado_debito['id_mes'].unique().tolist()
+
+    selecione_mes = st.multiselect('Filtre o mês:', meses, default=[meses[-1]], format_func=formatar_id_mes)
+
+
+
+
+
+    visualizacao_renda = st.radio("Escolha a visualização de renda", ['Apenas salário','Todos'])
+
+    if visualizacao_renda == "Apenas salário":
+        filtragem_salario = ['Salário','Adiantamento Férias']
+    else:
+        filtragem_salario = None
+
+    # DRE de todos os meses calculado uma vez (matriz linha x mês, em cache); cada seleção só soma colunas
+    matriz = matriz_dre_em_cache(filtragem_salario)
+    modo_dre = st.radio('Modo do DRE', ['Meses selecionados', 'Comparativo mensal'], horizontal=True)
+
+    if modo_dre == 'Meses selecionados':
+        dre = dre_dos_meses(matriz, selecione_mes)
+        for coluna in ['real', 'orcado', 'diferenca']:
+            dre[coluna] = centavos_para_reais(dre[coluna])
+        colunas_dre = ['Real (R$)', 'Orçado (R$)', 'Diferença (R$)']
+        valores_dre = dre[['real', 'orcado', 'diferenca']].to_numpy()
+        exportar = dre.drop(columns='destaque').rename(columns=dict(zip(['real', 'orcado', 'diferenca'], colunas_dre)))
+    else:
+        anos_dre = sorted({mes // 100 for mes in meses}, reverse=True)
+        col1, col2 = st.columns(2)
+        with col1:
+            ano_dre = st.selectbox('Ano', anos_dre, key='dre-ano')
+        with col2:
+            medida_dre = st.selectbox('Valor', ['real', 'orcado', 'diferenca'], key='dre-medida',
+                                      format_func={'real': 'Real', 'orcado': 'Orçado', 'diferenca': 'Diferença'}.get)
+        meses_ano = [mes for mes in meses if mes // 100 == ano_dre]
+        tabela = comparativo_mensal(matriz, meses_ano, medida_dre) / 100
+        dre = pd.DataFrame({'descricao': tabela.index, 'destaque': tabela.index.str.startswith('=')})
+        colunas_dre = [formatar_id_mes(mes) for mes in meses_ano] + ['Total']
+        valores_dre = tabela.to_numpy()
+        exportar = tabela.set_axis(colunas_dre, axis=1).rename_axis('descricao').reset_index()
+
+    # HTML e CSS personalizados
+    html_template = """
+    <style>
+        .dre-container {{
+            max-height: 600px;
+            overflow-y: auto;
+            border: 1px solid #444;
+            padding: 10px;
+            background-color: #1e1e1e;
+            color: #f5f5f5;
+        }}
+        .dre-table {{
+            font-family: Arial, sans-serif;
+            width: 100%;
+            border-collapse: collapse;
+        }}
+        .dre-table th, .dre-table td {{
+            text-align: left;
+            padding: 10px;
+            border: 1px solid #444;
+        }}
+        .dre-table th {{
+            background-color: #333;
+            color: #f5f5f5;
+            font-size: 1.1rem;
+        }}
+        .dre-highlight {{
+            font-weight: bold;
+            background-color: #292929;
+            color: #f5f5f5;
+        }}
+        .dre-indent {{
+            padding-left: 20px;
+        }}
+    </style>
+
+    <div class="dre-container">
+        <table class="dre-table">
+            <thead>
+                <tr>
+                    <th>Descrição</th>
+                    {cabecalho}
+                </tr>
+            </thead>
+            <tbody>
+                {rows}
+            </tbody>
+        </table>
+    </div>
+    """
+
+    # Gerar linhas da tabela de uma vez (uma string por linha, juntadas no fim)
+    def linha_html(descricao, destaque, valores):
+        celulas = ''.join(f'<td>{valor:,.2f}</td>' for valor in valores)
+        if destaque:  # Destacar totais
+            return f'<tr class="dre-highlight"><td>{descricao}</td>{celulas}</tr>'
+        if descricao.startswith("    "):  # Recuar subtotais
+            return f'<tr><td class="dre-indent">{descricao.strip()}</td>{celulas}</tr>'
+        return f'<tr><td>{descricao}</td>{celulas}</tr>'
+
+    rows = '\n'.join(
+        linha_html(descricao, destaque, valores)
+        for descricao, destaque, valores in zip(dre['descricao'], dre['destaque'], valores_dre)
+    )
+    cabecalho = ''.join(f'<th>{coluna}</th>' for coluna in colunas_dre)
+
+    # Renderizar o HTML no Streamlit
+    st.html(html_template.format(cabecalho=cabecalho, rows=rows))
+    st.download_button('Exportar CSV', exportar.to_csv(index=False).encode('utf-8'),
+                       file_name='dre.csv', mime='text/csv', key='dre-exportar')
+
+st.header('Status Mês atual')
+status_mes_atual()
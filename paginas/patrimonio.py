@@ -0,0 +1,108 @@
+import pandas as pd
+import streamlit as st
+from financas.esquema import centavos_para_reais, formatar_id_mes, id_mes_texto
+from financas.graficos import grafico_barras
+from financas.instrumentacao import fragmento, medir
+from financas.painel import (
+    SOMAS, bg_color_dash, carregar_pagina, explorar_base, figuras, filtro_anos, somas_com_pendentes, template_dash,
+    versoes)
+
+
+# página "Patrimônio": totais e acumulado pelas somas acumuladas, e a base de patrimônio
+# só a base de patrimônio é lida inteira; os totais vêm das somas acumuladas das três planilhas de saldo
+# e o filtro de ano inclui os anos do orçamento
+PLANILHAS = ['patrimonio']
+
+carregar_pagina(PLANILHAS, sincronizar=[*SOMAS, 'orcamento'])
+
+
+@fragmento
+@medir('Status Patrimônio')
+def status_patrimonio():
+    # totais das somas acumuladas (o saldo do último mês), sem reler as planilhas
+    somas = somas_com_pendentes()
+
+
+    # contas em centavos, convertidas para reais só na hora de mostrar
+    total_patrimonio_sem_reservas = somas.saldo('patrimonio', 'Patrimônio')
+
+
+    total_emprestimo = somas.saldo('emprestimo')
+    total_investimento = somas.saldo('investimento')
+    valor_em_maos = total_patrimonio_sem_reservas - total_emprestimo - total_investimento
+    direcionamentos = [d for d in somas.chaves('patrimonio') if d != 'Patrimônio']
+    patrimonio_agrupado = pd.DataFrame({
+        'direcionamento': direcionamentos + ['Valor em mãos', 'Empréstimo', 'Investimento'],
+        'valor': [somas.saldo('patrimonio', d) for d in direcionamentos] + [valor_em_maos, total_emprestimo, total_investimento]})
+    patrimonio_agrupado['percentual'] = (patrimonio_agrupado['valor'] / total_patrimonio_sem_reservas * 100).round(2)
+    patrimonio_agrupado['valor'] = centavos_para_reais(patrimonio_agrupado['valor'])
+
+
+    col1,col2 = st.columns(2)
+    with col1:
+        patrimonio_total  = somas.saldo('patrimonio') / 100
+        st.metric(label="Patrimônio total", value=patrimonio_total) 
+    with col2:
+        patrimonio_total_sem_reservas  = total_patrimonio_sem_reservas / 100
+        st.metric(label="Patrimônio total - Sem reservas", value=patrimonio_total_sem_reservas) 
+
+
+
+
+    tipo_visualizacao_patrimonio1 = st.radio("Selecione a visualização:", ["valor","percentual"])
+
+    with medir('gráfico patrimônio por direcionamento'):
+        graf_patrimonio_quebrado = figuras.obter(
+            ('patrimonio_quebrado', versoes('patrimonio', 'emprestimo', 'investimento'), tipo_visualizacao_patrimonio1),
+            lambda: grafico_barras(
+                patrimonio_agrupado, 'direcionamento', tipo_visualizacao_patrimonio1,
+                f"Distribuição patrimônio - {tipo_visualizacao_patrimonio1}",
+                template=template_dash, showlegend=False, xaxis_title='Mês',
+                yaxis_title=tipo_visualizacao_patrimonio1, plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_patrimonio_quebrado, use_container_width=True)
+
+    selecao_ano_patrimonio = filtro_anos('patrimonio', key='ano-patrimonio')
+
+    patrimonio_agrupado_mes = somas.mensal('patrimonio', 'Patrimônio', anos=selecao_ano_patrimonio)
+
+    tipo_visualizacao_patrimonio2 = st.radio("Selecione a visualização:", ["Acumulado","Arrecadado por mês"])
+    # acumulado desde o primeiro mês dos anos escolhidos, direto das somas acumuladas
+    patrimonio_agrupado_mes = pd.DataFrame({
+        'id_mes': id_mes_texto(patrimonio_agrupado_mes['id_mes']),
+        'valor': centavos_para_reais(
+            patrimonio_agrupado_mes['acumulado' if tipo_visualizacao_patrimonio2 == "Acumulado" else 'valor']),
+    })
+
+    # Criar o gráfico
+    with medir('gráfico patrimônio'):
+        graf_patrimonio = figuras.obter(
+            ('patrimonio', versoes('patrimonio'), tuple(selecao_ano_patrimonio), tipo_visualizacao_patrimonio2),
+            lambda: grafico_barras(
+                patrimonio_agrupado_mes, 'id_mes', 'valor',
+                '# PATRIMÔNIO ACUMULADO' if tipo_visualizacao_patrimonio2 == 'Acumulado' else '# ARRECADADO POR MÊS',
+                template=template_dash, showlegend=False, xaxis_title='Mês',
+                yaxis_title='Patrimônio total' if tipo_visualizacao_patrimonio2 == "Acumulado" else 'Arrecadado por mês',
+                plot_bgcolor=bg_color_dash))
+        st.plotly_chart(graf_patrimonio, use_container_width=True)
+
+    # quanto foi guardado entre dois meses quaisquer: duas consultas nas somas acumuladas
+    meses_patrimonio = somas.meses('patrimonio', 'Patrimônio')
+    if len(meses_patrimonio) > 1:
+        mes_de, mes_ate = st.select_slider(
+            'Período', options=meses_patrimonio, value=(meses_patrimonio[0], meses_patrimonio[-1]),
+            format_func=formatar_id_mes, key='periodo-patrimonio')
+        col1, col2 = st.columns(2)
+        col1.metric(label="Guardado no período", value=somas.entre('patrimonio', mes_de, mes_ate, 'Patrimônio') / 100)
+        col2.metric(label=f"Patrimônio em {formatar_id_mes(mes_ate)} - Sem reservas",
+                    value=somas.saldo('patrimonio', 'Patrimônio', mes_ate) / 100)
+
+
+    explorar_base('patrimonio', [
+        ('ano', 'Selecione o ano', str),
+        ('id_mes', 'Selecione o mês', formatar_id_mes),
+        ('direcionamento', 'Selecione o direcionamento', str),
+        ('classificacao', 'Selecione a classificação', str),
+    ], chave='base-patrimonio')
+
+st.header('Status Patrimônio')
+status_patrimonio()